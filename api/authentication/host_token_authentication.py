@@ -0,0 +1,46 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+from django.utils.translation import gettext_lazy
+
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+
+from utility.misc.tokens_cache import tokens_cache
+
+
+class HostTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication loading the user and its host in a single query,
+    so the host is available as `request.user.host`
+    """
+    def authenticate_credentials(self, key):
+        if (token := tokens_cache.get(key=key)) is None:
+            model = self.get_model()
+            try:
+                token = model.objects.select_related('user__host').get(
+                    key=key)
+            except model.DoesNotExist:
+                raise AuthenticationFailed(gettext_lazy('Invalid token.'))
+            if not token.user.is_active:
+                raise AuthenticationFailed(
+                    gettext_lazy('User inactive or deleted.'))
+            tokens_cache.set(key=key, token=token)
+        return token.user, token
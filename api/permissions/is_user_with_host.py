@@ -20,13 +20,12 @@
 
 from rest_framework.permissions import IsAuthenticated
 
-from remotes.models import Host
-
 
 class IsUserWithHost(IsAuthenticated):
     """
     Authentication for users with host only
     """
     def has_permission(self, request, view):
-        host = Host.objects_enabled.filter(user_id=request.user.pk).first()
-        return bool(host)
+        # The host is loaded with the user by HostTokenAuthentication
+        host = getattr(request.user, 'host', None)
+        return bool(host and host.is_active)
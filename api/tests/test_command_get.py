@@ -0,0 +1,160 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import datetime
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from encryption.rsa_key import RsaKey
+
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from remotes.models import (Command,
+                            CommandsGroup,
+                            Host,
+                            HostsGroup,
+                            Setting,
+                            Variable,
+                            VariableValue)
+
+from utility.misc.commands_cache import commands_cache
+
+
+class CommandGetTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        key = RsaKey()
+        key.create_new_key(size=2048)
+        user = get_user_model().objects.create(username='host')
+        cls.token = Token.objects.create(user=user)
+        host = Host.objects.create(uuid=uuid.uuid4(),
+                                   pubkey=key.get_public_key_content(),
+                                   user=user)
+        hosts_group = HostsGroup.objects.create(name='hosts')
+        hosts_group.hosts.add(host)
+        now = timezone.now()
+        group = CommandsGroup.objects.create(
+            hosts=hosts_group,
+            name='commands',
+            order=1,
+            after=now - datetime.timedelta(days=1),
+            before=now + datetime.timedelta(days=1))
+        # Command with a single setting and variable
+        cls.command = cls.create_command(group=group,
+                                         host=host,
+                                         name='single',
+                                         count=1)
+        # Command with many settings and variables
+        cls.command_many = cls.create_command(group=group,
+                                              host=host,
+                                              name='many',
+                                              count=10)
+
+    @staticmethod
+    def create_command(group: CommandsGroup,
+                       host: Host,
+                       name: str,
+                       count: int) -> Command:
+        """
+        Create a command with `count` settings and variables
+
+        :param group: CommandsGroup object for the command
+        :param host: Host object for the variables values
+        :param name: command name
+        :param count: number of settings and variables
+        :return: new Command object
+        """
+        command = Command.objects.create(group=group,
+                                         name=name,
+                                         command='__RESULT__ = 1')
+        for index in range(count):
+            command.settings.add(Setting.objects.create(
+                name=f'{name}-setting-{index}',
+                value=str(index)))
+            variable = Variable.objects.create(name=f'{name}-var-{index}')
+            VariableValue.objects.create(host=host,
+                                         variable=variable,
+                                         value=str(index))
+            command.variables.add(variable)
+        return command
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        # Warm up the caches not related to the commands
+        self.get_command(command=self.command)
+        self.invalidate()
+
+    def tearDown(self):
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """
+        Remove the test commands from the commands cache
+
+        :return: None
+        """
+        for command in (self.command, self.command_many):
+            commands_cache.invalidate(command_id=command.pk)
+
+    def get_command(self, command: Command) -> int:
+        """
+        Get a command using the API
+
+        :param command: Command object to get
+        :return: number of executed queries
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('api.v1.command.get',
+                                               kwargs={'pk': command.pk}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['id'], command.pk)
+        return len(queries)
+
+    def test_cache_miss(self):
+        """
+        The commands missing from the commands cache are loaded using the
+        same number of queries regardless of their settings and variables
+        """
+        queries = self.get_command(command=self.command)
+        self.assertEqual(self.get_command(command=self.command_many),
+                         queries)
+
+    def test_cache_hit(self):
+        """
+        The cached commands are loaded using the same number of queries
+        regardless of their settings and variables, without loading their
+        settings and variables
+        """
+        queries_miss = self.get_command(command=self.command)
+        self.get_command(command=self.command_many)
+        queries = self.get_command(command=self.command)
+        self.assertEqual(self.get_command(command=self.command_many),
+                         queries)
+        # The settings and the variables are not loaded again
+        self.assertEqual(queries, queries_miss - 2)
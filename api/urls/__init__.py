@@ -20,6 +20,7 @@
 
 from django.urls import include, path
 
+from api.views.statistics import StatisticsView
 from api.views.status import StatusView
 
 
@@ -28,6 +29,10 @@ urlpatterns = [
     path(route='status/',
          view=StatusView.as_view(),
          name='api.status'),
+    # Statistics page
+    path(route='statistics/',
+         view=StatisticsView.as_view(),
+         name='api.statistics'),
     # Version 1
     path(route='v1/',
          view=include('api.urls.v1'),
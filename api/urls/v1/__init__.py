@@ -20,11 +20,16 @@
 
 from django.urls import path
 
+from api.views.v1.commands.batch import CommandsBatchView
 from api.views.v1.commands.get import CommandGetView
 from api.views.v1.commands.list import CommandsListView
 from api.views.v1.commands.post import CommandPostView
+from api.views.v1.commands.post_batch import CommandsPostBatchView
+from api.views.v1.commands.post_chunk import CommandPostChunkView
+from api.views.v1.commands.wait import CommandsWaitView
 from api.views.v1.discover import DiscoverView
 from api.views.v1.host.register import HostRegisterView
+from api.views.v1.host.session import HostSessionView
 from api.views.v1.host.verify import HostVerifyView
 from api.views.v1.host.status import HostStatusView
 
@@ -47,15 +52,34 @@ urlpatterns = [
                '<int:pk>/',
          view=CommandPostView.as_view(),
          name='api.v1.command.post'),
+    path(route='commands/post/chunk/',
+         view=CommandPostChunkView.as_view(),
+         name='api.v1.command.post.chunk.generic'),
+    path(route='commands/post/chunk/'
+               '<int:pk>/',
+         view=CommandPostChunkView.as_view(),
+         name='api.v1.command.post.chunk'),
+    path(route='commands/post/batch/',
+         view=CommandsPostBatchView.as_view(),
+         name='api.v1.commands.post.batch'),
     path(route='commands/list/',
          view=CommandsListView.as_view(),
          name='api.v1.commands.list'),
+    path(route='commands/batch/',
+         view=CommandsBatchView.as_view(),
+         name='api.v1.commands.batch'),
+    path(route='commands/wait/',
+         view=CommandsWaitView.as_view(),
+         name='api.v1.commands.wait'),
     path(route='host/register/',
          view=HostRegisterView.as_view(),
          name='api.v1.host.register'),
     path(route='host/verify/',
          view=HostVerifyView.as_view(),
          name='api.v1.host.verify'),
+    path(route='host/session/',
+         view=HostSessionView.as_view(),
+         name='api.v1.host.session'),
     path(route='host/status/',
          view=HostStatusView.as_view(),
          name='api.v1.host.status'),
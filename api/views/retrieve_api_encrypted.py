@@ -22,8 +22,12 @@ from rest_framework.generics import RetrieveAPIView
 
 from api.views.save_request_mixin import SaveRequestMixin
 
+from remotes.constants import COMPRESSION_HEADER, SESSION_HEADER
 from remotes.models import Host
 
+from utility.misc.compression import negotiate_compression
+from utility.misc.sessions_cache import sessions_cache
+
 
 class RetrieveAPIEncryptedView(RetrieveAPIView, SaveRequestMixin):
     """
@@ -32,11 +36,25 @@ class RetrieveAPIEncryptedView(RetrieveAPIView, SaveRequestMixin):
     """
     encrypted_fields = []
 
+    def get_host(self) -> Host:
+        """
+        Get the host for the current user
+
+        :return: Host object
+        """
+        return self.request.user.host
+
     def get(self, request, *args, **kwargs):
         # Save request
         self.save_request(request, args, kwargs)
         results = super().get(request, *args, **kwargs)
         # Get host for the current user
-        host = Host.objects.get(user_id=self.request.user.pk)
-        host.encrypt_data(data=results.data, fields=self.encrypted_fields)
+        host = self.get_host()
+        host.encrypt_data(data=results.data,
+                          fields=self.encrypted_fields,
+                          session=sessions_cache.get(
+                              host=host,
+                              session=request.headers.get(SESSION_HEADER)),
+                          compression=negotiate_compression(
+                              request.headers.get(COMPRESSION_HEADER)))
         return results
@@ -21,11 +21,14 @@
 import datetime
 import json
 
+from django.conf import settings
+
 from remotes.constants import (APILOG_ENABLE_LOGGING,
                                APILOG_FILTER_USERS,
                                APILOG_INCLUDE_ARGS)
 from remotes.models.api_log import ApiLog
 
+from utility.misc.api_log_writer import api_log_writer
 from utility.misc.get_setting_value import get_setting_value
 
 
@@ -39,13 +42,13 @@ class SaveRequestMixin(object):
                                         default_value='').split(',')
         log_is_filtered = request.user.username in log_filters
         if log_enabled and not log_is_filtered:
-            ApiLog.objects.create(
+            record = ApiLog(
                 date=datetime.date.today(),
                 time=datetime.datetime.now().replace(microsecond=0),
                 message_level=0,
                 method=request.method,
                 path=request.path,
-                raw_uri=request.get_raw_uri(),
+                raw_uri=request.build_absolute_uri(),
                 url_name=request.resolver_match.url_name,
                 func_name=request.resolver_match.func.__name__,
                 remote_addr=request.META.get('REMOTE_ADDR', ''),
@@ -57,6 +60,11 @@ class SaveRequestMixin(object):
                 args=self.json_prettify(args) if log_arguments else '',
                 kwargs=self.json_prettify(kwargs) if log_arguments else '',
                 extra='')
+            if getattr(settings, 'API_LOGS_WRITER_ASYNC', True):
+                # Enqueue the record to be saved in the background
+                api_log_writer.write(record=record)
+            else:
+                record.save()
 
     def json_prettify(self, arguments):
         """Format the arguments in JSON formatted style"""
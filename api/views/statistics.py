@@ -0,0 +1,67 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+from rest_framework import status
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.authentication import HostTokenAuthentication
+from api.views.save_request_mixin import SaveRequestMixin
+
+from remotes.constants import (API_LOG_WRITER,
+                               COMMANDS_CACHE,
+                               COMMANDS_NOTIFIER,
+                               PUBLIC_KEYS_CACHE,
+                               SESSIONS_CACHE,
+                               SETTINGS_CACHE,
+                               STATUS_FIELD,
+                               STATUS_OK,
+                               TOKENS_CACHE)
+
+from utility.misc.api_log_writer import api_log_writer
+from utility.misc.commands_cache import commands_cache
+from utility.misc.commands_notifier import commands_notifier
+from utility.misc.public_keys_cache import public_keys_cache
+from utility.misc.sessions_cache import sessions_cache
+from utility.misc.settings_cache import settings_cache
+from utility.misc.tokens_cache import tokens_cache
+
+
+class StatisticsView(APIView, SaveRequestMixin):
+    authentication_classes = (SessionAuthentication,
+                              HostTokenAuthentication)
+    permission_classes = (IsAdminUser, )
+
+    # noinspection PyMethodMayBeStatic
+    def get(self, request, *args, **kwargs):
+        # Save request
+        self.save_request(request, args, kwargs)
+        return Response(
+            data={STATUS_FIELD: STATUS_OK,
+                  API_LOG_WRITER: api_log_writer.get_statistics(),
+                  SETTINGS_CACHE: settings_cache.get_statistics(),
+                  TOKENS_CACHE: tokens_cache.get_statistics(),
+                  PUBLIC_KEYS_CACHE: public_keys_cache.get_statistics(),
+                  SESSIONS_CACHE: sessions_cache.get_statistics(),
+                  COMMANDS_NOTIFIER: commands_notifier.get_statistics(),
+                  COMMANDS_CACHE: commands_cache.get_statistics()},
+            status=status.HTTP_200_OK)
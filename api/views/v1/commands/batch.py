@@ -0,0 +1,100 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.permissions import IsUserWithHost
+from api.views.save_request_mixin import SaveRequestMixin
+from api.views.v1.commands.get import CommandGetSerializer, CommandGetView
+
+from remotes.constants import (COMPRESSION_HEADER,
+                               GROUP_FIELD,
+                               OUTPUT_VARIABLES_FIELD,
+                               RESULTS_FIELD,
+                               SEQUENTIAL_FIELD,
+                               SESSION_HEADER,
+                               STATUS_FIELD,
+                               STATUS_OK)
+from remotes.models import Command, PendingCommand
+
+from utility.misc.compression import negotiate_compression
+from utility.misc.sessions_cache import sessions_cache
+
+
+class CommandsBatchView(APIView, SaveRequestMixin):
+    permission_classes = (IsUserWithHost, )
+    encrypted_fields = CommandGetView.encrypted_fields
+
+    def get(self, request, *args, **kwargs):
+        """
+        Get every pending command encrypted using a single symmetric key
+        """
+        # Save request
+        self.save_request(request, args, kwargs)
+        now = timezone.now()
+        # Get all the pending commands for the current user host
+        host = self.request.user.host
+        pending = PendingCommand.objects.filter(
+            host=host,
+            after__lt=now,
+            before__gt=now).order_by('group_order', 'command_order')
+        pending = list(pending.values_list('command_id',
+                                           'group_id',
+                                           'group__is_sequential'))
+        commands = Command.objects.prefetch_related(
+            'settings',
+            'variables',
+            'commandvariable_set__variable').in_bulk(
+                [item[0] for item in pending])
+        pending = [item for item in pending if item[0] in commands]
+        serializer = CommandGetSerializer(
+            instance=[commands[item[0]] for item in pending],
+            many=True,
+            context={'request': request,
+                     'host': host})
+        results = serializer.data
+        for item, (command_id, group_id, sequential) in zip(results, pending):
+            item[GROUP_FIELD] = group_id
+            item[SEQUENTIAL_FIELD] = sequential
+            # Add the variables order to save the results, so the later
+            # commands can use them without requesting them again
+            item[OUTPUT_VARIABLES_FIELD] = {
+                variable.variable.name: variable.order
+                for variable
+                in sorted(commands[command_id].commandvariable_set.all(),
+                          key=lambda command_variable: command_variable.order)}
+        data = {STATUS_FIELD: STATUS_OK,
+                RESULTS_FIELD: results}
+        if results:
+            # Encrypt every command using the same symmetric key
+            data.update(host.encrypt_data_list(
+                items=results,
+                fields=self.encrypted_fields,
+                session=sessions_cache.get(
+                    host=host,
+                    session=request.headers.get(SESSION_HEADER)),
+                compression=negotiate_compression(
+                    request.headers.get(COMPRESSION_HEADER))))
+        return Response(data=data,
+                        status=status.HTTP_200_OK)
@@ -23,7 +23,9 @@ from rest_framework.serializers import ModelSerializer, SerializerMethodField
 from api.permissions import IsUserWithHost
 from api.views.retrieve_api_encrypted import RetrieveAPIEncryptedView
 
-from remotes.models import Command, Host, VariableValue
+from remotes.models import Command, VariableValue
+
+from utility.misc.commands_cache import commands_cache
 
 
 class CommandGetSerializer(ModelSerializer):
@@ -37,24 +39,52 @@ class CommandGetSerializer(ModelSerializer):
         model = Command
         fields = ['id', 'name', 'settings', 'variables', 'command', 'timeout']
 
+    def to_representation(self, instance):
+        """
+        Serialize the command using the cached data for every host, adding
+        the variables values for the current host
+        """
+        data = commands_cache.get(command_id=instance.pk,
+                                  modified=instance.modified)
+        if data is None:
+            data = super().to_representation(instance)
+            commands_cache.set(command_id=instance.pk,
+                               modified=instance.modified,
+                               data=data)
+        # Copy the cached data before adding the host values
+        data = dict(data)
+        # Get the variable values for the host (None if not set)
+        variables_values = self.get_variables_values()
+        data['variables'] = {name: variables_values.get(variable_id)
+                             for variable_id, name in data['variables']}
+        return data
+
     # noinspection PyMethodMayBeStatic
     def get_settings(self, instance):
         return {item.name: item.value
                 for item in instance.settings.all()}
 
+    # noinspection PyMethodMayBeStatic
     def get_variables(self, instance):
-        # Initialize variable values to None
-        variables = instance.variables.all()
-        result = {item.name: None
-                  for item in variables}
-        # Find host matching with the user
-        host = Host.objects.get(user=self.context['request'].user)
-        # Update variable values
-        variables_values = VariableValue.objects.filter(host=host,
-                                                        variable__in=variables)
-        for item in variables_values:
-            result[item.variable.name] = item.value
-        return result
+        # The values are added for each host in to_representation
+        return [(item.pk, item.name)
+                for item in instance.variables.all()]
+
+    def get_variables_values(self) -> dict:
+        """
+        Get the variables values for the host in the context, loaded once
+        and shared by every command serialized with the same context
+
+        :return: dictionary with the values for each variable ID
+        """
+        if 'variables_values' not in self.context:
+            # Find host matching with the user if not in the context
+            host = (self.context.get('host') or
+                    self.context['request'].user.host)
+            self.context['variables_values'] = dict(
+                VariableValue.objects.filter(host=host).values_list(
+                    'variable_id', 'value'))
+        return self.context['variables_values']
 
 
 class CommandGetView(RetrieveAPIEncryptedView):
@@ -65,11 +95,18 @@ class CommandGetView(RetrieveAPIEncryptedView):
 
     def get_queryset(self):
         # Find host matching with the user
-        host = Host.objects.get(user_id=self.request.user.pk)
+        host = self.get_host()
         # Find the commands group item
         queryset = self.model.objects_enabled.filter(
             pk=self.kwargs['pk'],
             group__is_active=True,
             group__hosts__hosts=host.pk,
             group__hosts__is_active=True)
+        # The settings and the variables are loaded only for the commands
+        # missing from the commands cache
         return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['host'] = self.get_host()
+        return context
@@ -18,7 +18,10 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 ##
 
+import math
+
 from django.utils import timezone
+from django.utils.http import parse_etags, quote_etag
 
 from rest_framework import status
 from rest_framework.response import Response
@@ -30,39 +33,84 @@ from api.views.save_request_mixin import SaveRequestMixin
 from remotes.constants import (COMMAND_FIELD,
                                GROUP_FIELD,
                                RESULTS_FIELD,
+                               SEQUENTIAL_FIELD,
                                STATUS_FIELD,
                                STATUS_OK)
-from remotes.models import CommandsGroup, CommandsOutput, Host
+from remotes.models import HostCommandsVersion, PendingCommand
 
 
 class CommandsListView(ListAPIView, SaveRequestMixin):
     permission_classes = (IsUserWithHost, )
 
     def get(self, request, *args, **kwargs):
+        """
+        List the pending commands for the current host
+
+        The ETag contains the host commands version and the time of the next
+        command becoming ready or expired, so the requests with a matching
+        If-None-Match header are answered with 304 before the listing
+        """
         # Save request
         self.save_request(request, args, kwargs)
-        results = []
         now = timezone.now()
-        # Get all the already executed commands to exclude
-        excluded = CommandsOutput.objects.filter(host__user_id=request.user.pk)
-        # Get all the hosts group for the current user host
-        hosts_group = Host.objects_enabled.filter(
-            user_id=request.user.pk).first().hostsgroup_set.filter(
-            is_active=True)
-        # Get all the commands group for the hosts groups
-        groups = CommandsGroup.objects_enabled.filter(hosts__in=hosts_group,
-                                                      after__lt=now,
-                                                      before__gt=now)
-        for group in groups.order_by('order'):
-            # Check each group and exclude items already processed
-            items = group.command_set.exclude(
-                id__in=excluded.values_list('command')).exclude(
-                is_active=False)
-            for command in items.order_by('order'):
-                # Get each command in the group
-                results.append({GROUP_FIELD: group.pk,
-                                COMMAND_FIELD: command.pk})
+        # Get the commands version before the pending commands, creating it
+        # for the hosts without any previous change
+        host = request.user.host
+        version = HostCommandsVersion.objects.get_or_create(
+            host_id=host.pk)[0].version
+        if self.is_not_modified(request=request,
+                                version=version,
+                                timestamp=now.timestamp()):
+            return Response(status=status.HTTP_304_NOT_MODIFIED,
+                            headers={'ETag': request.headers['If-None-Match']})
+        # Get all the pending commands for the current user host, including
+        # the later commands to get the time of the next change
+        items = PendingCommand.objects.filter(
+            host=host,
+            before__gt=now).order_by('group_order', 'command_order')
+        results = []
+        expiration = None
+        for group_id, command_id, sequential, after, before in (
+                items.values_list('group_id',
+                                  'command_id',
+                                  'group__is_sequential',
+                                  'after',
+                                  'before')):
+            if after < now:
+                results.append({GROUP_FIELD: group_id,
+                                COMMAND_FIELD: command_id,
+                                SEQUENTIAL_FIELD: sequential})
+                change = before
+            else:
+                change = after
+            if expiration is None or change < expiration:
+                expiration = change
+        expiration = (math.floor(expiration.timestamp())
+                      if expiration is not None
+                      else 0)
         return Response(
             data={STATUS_FIELD: STATUS_OK,
                   RESULTS_FIELD: results},
-            status=status.HTTP_200_OK)
+            status=status.HTTP_200_OK,
+            headers={'ETag': quote_etag(f'{version}-{expiration}')})
+
+    # noinspection PyMethodMayBeStatic
+    def is_not_modified(self,
+                        request,
+                        version: int,
+                        timestamp: float) -> bool:
+        """
+        Check if an ETag in the If-None-Match header is still valid
+
+        :param request: request with the If-None-Match header
+        :param version: current commands version for the host
+        :param timestamp: current timestamp
+        :return: True if the commands list was not modified
+        """
+        for etag in parse_etags(request.headers.get('If-None-Match', '')):
+            etag_version, _, expiration = etag.strip('"').partition('-')
+            if (etag_version == str(version) and
+                    expiration.isdigit() and
+                    (int(expiration) == 0 or timestamp < int(expiration))):
+                return True
+        return False
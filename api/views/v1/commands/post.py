@@ -19,12 +19,16 @@
 ##
 
 import json
+import typing
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Subquery
 
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.serializers import (CharField,
                                         IntegerField,
-                                        PrimaryKeyRelatedField,
                                         Serializer)
 
 from rest_framework.views import APIView
@@ -34,16 +38,56 @@ from api.views.save_request_mixin import SaveRequestMixin
 
 from encryption.fernet_encrypt import FernetEncrypt
 
-from remotes.constants import (ID_FIELD,
+from remotes.constants import (COMMANDS_OUTPUT_MAX_SIZE,
+                               COMPRESSION_FIELD,
+                               ID_FIELD,
+                               MESSAGE_FIELD,
                                RESULTS_FIELD,
                                STATUS_FIELD,
                                STATUS_OK,
-                               STATUS_ERROR)
+                               STATUS_ERROR,
+                               UPLOAD_FIELD)
 from remotes.models import (Command,
                             CommandsOutput,
-                            Host,
+                            CommandsOutputUpload,
                             VariableValue)
 
+from utility.misc.compression import (DECOMPRESSION_MAX_SIZE,
+                                      SizeLimitError,
+                                      decompress,
+                                      get_compressions)
+from utility.misc.get_setting_value import get_setting_value
+
+
+def decrypt_output(decryptor: FernetEncrypt,
+                   text: str,
+                   compression: typing.Optional[str],
+                   max_size: int = 0) -> str:
+    """
+    Decrypt an output text, decompressing it if it was compressed before
+    the encryption
+
+    :param decryptor: FernetEncrypt object with the symmetric key
+    :param text: encrypted text to decrypt
+    :param compression: compression algorithm name or None
+    :param max_size: maximum text size in characters (0 for no limits)
+    :return: decrypted text
+    """
+    if compression:
+        # Each character takes up to 4 bytes in UTF-8, the compressed data
+        # is refused before decompressing it all
+        data = decompress(data=decryptor.decrypt_bytes(text=text),
+                          compression=compression,
+                          max_size=(max_size * 4
+                                    if max_size
+                                    else DECOMPRESSION_MAX_SIZE))
+        results = data.decode('utf-8')
+    else:
+        results = decryptor.decrypt(text=text)
+    if max_size and len(results) > max_size:
+        raise SizeLimitError(f'Text larger than {max_size} characters')
+    return results
+
 
 # noinspection PyAbstractClass
 class CommandPostSerializer(Serializer):
@@ -51,13 +95,14 @@ class CommandPostSerializer(Serializer):
     Serializer for CommandPostView
     """
     id = IntegerField(required=True)
-    host = PrimaryKeyRelatedField(queryset=Host.objects.all(),
-                                  required=True,
-                                  many=False)
     output = CharField(required=True,
                        allow_blank=True)
     result = CharField(required=True,
                        allow_blank=True)
+    diagnostics = CharField(required=False,
+                            allow_blank=True)
+    exit_status = IntegerField(required=False,
+                               allow_null=True)
 
     def create(self, data) -> CommandsOutput:
         """
@@ -69,7 +114,11 @@ class CommandPostSerializer(Serializer):
         results = CommandsOutput.objects.create(command_id=data['id'],
                                                 host=data['host'],
                                                 output=data['output'],
-                                                result=data['result'])
+                                                result=data['result'],
+                                                diagnostics=data.get(
+                                                    'diagnostics'),
+                                                exit_status=data.get(
+                                                    'exit_status'))
         return results
 
 
@@ -83,7 +132,7 @@ class CommandPostView(APIView, SaveRequestMixin):
         # Save request
         self.save_request(request, args, kwargs)
         # Find host matching with the user
-        host = Host.objects.get(user_id=self.request.user.pk)
+        host = self.request.user.host
         # Find the CommandGroupItem and check if it's in the same host group
         command = Command.objects.filter(pk=kwargs['pk'],
                                          group__hosts__hosts=host.pk).first()
@@ -91,18 +140,75 @@ class CommandPostView(APIView, SaveRequestMixin):
             serializer = CommandPostSerializer(data=request.data.copy())
             # Add ID to the data from the querystring
             serializer.initial_data['id'] = kwargs['pk']
-            serializer.initial_data['host'] = host.pk
             # Decrypt data using the host UUID
             decryptor = FernetEncrypt()
             decryptor.load_key_from_uuid(host.uuid)
-            serializer.initial_data['output'] = decryptor.decrypt(
-                text=request.data['output'])
-            serializer.initial_data['result'] = decryptor.decrypt(
-                text=request.data['result'])
+            compression = request.data.get(COMPRESSION_FIELD)
+            if compression not in (None, *get_compressions()):
+                # Unsupported compression algorithm
+                results = {COMPRESSION_FIELD: ['Unsupported compression'],
+                           STATUS_FIELD: STATUS_ERROR}
+                return Response(data=results,
+                                status=status.HTTP_400_BAD_REQUEST)
+            upload = None
+            if upload_uuid := request.data.get(UPLOAD_FIELD):
+                # The output was already received in chunks
+                try:
+                    upload = CommandsOutputUpload.objects.defer(
+                        'output').get(uuid=upload_uuid,
+                                      host=host,
+                                      command=command)
+                except (CommandsOutputUpload.DoesNotExist, ValidationError):
+                    results = {UPLOAD_FIELD: ['Invalid upload'],
+                               STATUS_FIELD: STATUS_ERROR}
+                    return Response(data=results,
+                                    status=status.HTTP_400_BAD_REQUEST)
+                serializer.initial_data['output'] = ''
+            max_size = int(get_setting_value(name=COMMANDS_OUTPUT_MAX_SIZE,
+                                             default_value='0'))
+            try:
+                if not upload:
+                    serializer.initial_data['output'] = decrypt_output(
+                        decryptor=decryptor,
+                        text=request.data['output'],
+                        compression=compression,
+                        max_size=max_size)
+                serializer.initial_data['result'] = decrypt_output(
+                    decryptor=decryptor,
+                    text=request.data['result'],
+                    compression=compression,
+                    max_size=max_size)
+                if 'diagnostics' in request.data:
+                    serializer.initial_data['diagnostics'] = decrypt_output(
+                        decryptor=decryptor,
+                        text=request.data['diagnostics'],
+                        compression=compression,
+                        max_size=max_size)
+            except SizeLimitError:
+                # The output must be sent in chunks to be truncated
+                results = {STATUS_FIELD: STATUS_ERROR,
+                           MESSAGE_FIELD: 'Output too large'}
+                return Response(
+                    data=results,
+                    status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+            except ValueError:
+                # Invalid compressed data
+                results = {COMPRESSION_FIELD: ['Invalid compressed data'],
+                           STATUS_FIELD: STATUS_ERROR}
+                return Response(data=results,
+                                status=status.HTTP_400_BAD_REQUEST)
             # Process the data
             if serializer.is_valid():
-                # Save data creating a new CommandOutput object
-                command_output = serializer.save()
+                with transaction.atomic():
+                    # Save data creating a new CommandOutput object
+                    command_output = serializer.save(host=host)
+                    if upload:
+                        # Move the received chunks inside the database
+                        CommandsOutput.objects.filter(
+                            pk=command_output.pk).update(output=Subquery(
+                                CommandsOutputUpload.objects.filter(
+                                    pk=upload.pk).values('output')[:1]))
+                        upload.delete()
                 # Save the output result into VariableValue objects
                 command_output_result = json.loads(s=command_output.result)
                 command = command_output.command
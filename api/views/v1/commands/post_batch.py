@@ -0,0 +1,244 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import json
+import typing
+
+from cryptography.fernet import InvalidToken
+
+from django.db import transaction
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.serializers import (CharField,
+                                        ChoiceField,
+                                        IntegerField,
+                                        Serializer)
+from rest_framework.views import APIView
+
+from api.permissions import IsUserWithHost
+from api.views.save_request_mixin import SaveRequestMixin
+from api.views.v1.commands.post import decrypt_output
+
+from encryption.fernet_encrypt import FernetEncrypt
+
+from remotes.constants import (COMMANDS_OUTPUT_MAX_SIZE,
+                               ID_FIELD,
+                               MESSAGE_FIELD,
+                               RESULTS_FIELD,
+                               STATUS_FIELD,
+                               STATUS_OK,
+                               STATUS_ERROR)
+from remotes.models import (Command,
+                            CommandsOutput,
+                            CommandVariable,
+                            VariableValue)
+
+from utility.misc.compression import SizeLimitError, get_compressions
+from utility.misc.get_setting_value import get_setting_value
+from utility.misc.remove_pending_commands import remove_pending_commands
+from utility.misc.save_last_executions import save_last_executions
+
+
+# noinspection PyAbstractClass
+class CommandsPostBatchSerializer(Serializer):
+    """
+    Serializer for each item in CommandsPostBatchView
+    """
+    id = IntegerField(required=True)
+    output = CharField(required=True,
+                       allow_blank=True)
+    result = CharField(required=True,
+                       allow_blank=True)
+    diagnostics = CharField(required=False,
+                            allow_blank=True)
+    exit_status = IntegerField(required=False,
+                               allow_null=True)
+    compression = ChoiceField(choices=get_compressions(),
+                              required=False)
+
+    def decrypt(self, value: str, compression: typing.Optional[str]) -> str:
+        """
+        Decrypt the value using the decryptor in the context
+
+        :param value: encrypted value
+        :param compression: compression algorithm name or None
+        :return: decrypted value
+        """
+        try:
+            return decrypt_output(decryptor=self.context['decryptor'],
+                                  text=value,
+                                  compression=compression,
+                                  max_size=self.context['max_size'])
+        except SizeLimitError:
+            # Let the caller refuse the item
+            raise
+        except InvalidToken:
+            raise ValidationError('Invalid encrypted data')
+        except ValueError:
+            raise ValidationError('Invalid compressed data')
+
+    def to_internal_value(self, data) -> dict:
+        """
+        Decrypt the values before their validation, so they are trimmed
+        like the values received by CommandPostView
+
+        :param data: item data with the encrypted values
+        :return: validated data with the decrypted values
+        """
+        too_large = False
+        if isinstance(data, dict) and data.get('compression') in (
+                None, *get_compressions()):
+            # The output and the result may be compressed before the
+            # encryption
+            data = data.copy()
+            errors = {}
+            for field in ('output', 'result', 'diagnostics'):
+                if isinstance(data.get(field), str):
+                    try:
+                        data[field] = self.decrypt(
+                            value=data[field],
+                            compression=data.get('compression'))
+                    except SizeLimitError:
+                        # The too large values are refused individually
+                        too_large = True
+                        data[field] = ''
+                    except ValidationError as error:
+                        errors[field] = error.detail
+            if errors:
+                raise ValidationError(errors)
+        attrs = super().to_internal_value(data)
+        attrs.pop('compression', None)
+        attrs['too_large'] = too_large
+        return attrs
+
+    def validate(self, attrs: dict) -> dict:
+        if attrs['too_large']:
+            # The refused items are not saved
+            return attrs
+        try:
+            json.loads(s=attrs['result'])
+        except ValueError:
+            raise ValidationError('Invalid JSON data')
+        return attrs
+
+
+class CommandsPostBatchView(APIView, SaveRequestMixin):
+    permission_classes = (IsUserWithHost, )
+
+    def post(self, request, *args, **kwargs):
+        """
+        Create new objects for every command output in the batch
+        """
+        # Save request
+        self.save_request(request, args, kwargs)
+        # Find host matching with the user
+        host = self.request.user.host
+        # Decrypt and validate every output using the host UUID
+        decryptor = FernetEncrypt()
+        decryptor.load_key_from_uuid(host.uuid)
+        serializer = CommandsPostBatchSerializer(
+            data=request.data.get(RESULTS_FIELD),
+            many=True,
+            context={'decryptor': decryptor,
+                     'max_size': int(get_setting_value(
+                         name=COMMANDS_OUTPUT_MAX_SIZE,
+                         default_value='0'))})
+        if not serializer.is_valid():
+            # Show errors
+            return Response(data={STATUS_FIELD: STATUS_ERROR,
+                                  RESULTS_FIELD: serializer.errors},
+                            status=status.HTTP_400_BAD_REQUEST)
+        items = serializer.validated_data
+        commands_ids = {item['id'] for item in items}
+        # Check if every command is in the same host group
+        if commands_ids.difference(Command.objects.filter(
+                pk__in=commands_ids,
+                group__hosts__hosts=host.pk).values_list('pk', flat=True)):
+            # Unauthorized host
+            results = {STATUS_FIELD: STATUS_ERROR}
+            return Response(data=results,
+                            status=status.HTTP_403_FORBIDDEN)
+        # The outputs larger than the maximum size are refused, while the
+        # other outputs are still saved
+        results = [{ID_FIELD: item['id'],
+                    STATUS_FIELD: STATUS_ERROR,
+                    MESSAGE_FIELD: 'Output too large'}
+                   if item['too_large']
+                   else {ID_FIELD: item['id'],
+                         STATUS_FIELD: STATUS_OK}
+                   for item in items]
+        items = [item for item in items if not item['too_large']]
+        commands_ids = {item['id'] for item in items}
+        # Find the output variables for every command
+        commands_variables = {}
+        for command_id, variable_id, order in (
+                CommandVariable.objects.filter(
+                    command_id__in=commands_ids).order_by(
+                    'order').values_list('command_id', 'variable_id',
+                                         'order')):
+            commands_variables.setdefault(command_id, []).append(
+                (variable_id, order))
+        # Assign the items in the results to the variables matching
+        # the variable order, so the variable with the order 0 will
+        # get the first value in the results list
+        values = {}
+        for item in items:
+            result = json.loads(s=item['result'])
+            for variable_id, order in commands_variables.get(item['id'], []):
+                values[variable_id] = (result[order]
+                                       if len(result) > order
+                                       else '')
+        with transaction.atomic():
+            # Save data creating the new CommandOutput objects
+            outputs = CommandsOutput.objects.bulk_create(
+                [CommandsOutput(command_id=item['id'],
+                                host=host,
+                                output=item['output'],
+                                result=item['result'],
+                                diagnostics=item.get('diagnostics'),
+                                exit_status=item.get('exit_status'))
+                 for item in items])
+            # Bulk create doesn't send any signal
+            save_last_executions(outputs=outputs)
+            remove_pending_commands(host=host,
+                                    commands=commands_ids)
+            # Update the existing VariableValue objects
+            now = timezone.now()
+            variables_values = list(VariableValue.objects.filter(
+                host=host,
+                variable_id__in=values))
+            for variable_value in variables_values:
+                variable_value.value = values.pop(variable_value.variable_id)
+                variable_value.timestamp = now
+            VariableValue.objects.bulk_update(objs=variables_values,
+                                              fields=('value', 'timestamp'))
+            # Create the missing VariableValue objects
+            VariableValue.objects.bulk_create(
+                [VariableValue(host=host,
+                               variable_id=variable_id,
+                               value=value)
+                 for variable_id, value in values.items()])
+        # Show results
+        return Response(data={STATUS_FIELD: STATUS_OK,
+                              RESULTS_FIELD: results},
+                        status=status.HTTP_201_CREATED)
@@ -0,0 +1,150 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import datetime
+import uuid
+
+from cryptography.fernet import InvalidToken
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Value
+from django.db.models.functions import Concat
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.permissions import IsUserWithHost
+from api.views.save_request_mixin import SaveRequestMixin
+from api.views.v1.commands.post import decrypt_output
+
+from encryption.fernet_encrypt import FernetEncrypt
+
+from remotes.constants import (COMMANDS_OUTPUT_MAX_SIZE,
+                               COMPRESSION_FIELD,
+                               ID_FIELD,
+                               MESSAGE_FIELD,
+                               RESULTS_FIELD,
+                               SIZE_FIELD,
+                               STATUS_FIELD,
+                               STATUS_OK,
+                               STATUS_ERROR,
+                               UPLOAD_FIELD)
+from remotes.models import Command, CommandsOutputUpload
+
+from utility.misc.compression import SizeLimitError, get_compressions
+from utility.misc.get_setting_value import get_setting_value
+
+
+# Uploads older than this are considered abandoned
+UPLOAD_LIFETIME = datetime.timedelta(days=1)
+
+
+class CommandPostChunkView(APIView, SaveRequestMixin):
+    permission_classes = (IsUserWithHost, )
+
+    def post(self, request, *args, **kwargs):
+        """
+        Append a chunk to a command output upload
+
+        The first chunk creates a new upload, the following chunks must
+        include its `UPLOAD_FIELD` value. The upload is completed posting
+        the command result with the same `UPLOAD_FIELD` to CommandPostView.
+        """
+        # Save request
+        self.save_request(request, args, kwargs)
+        # Find host matching with the user
+        host = self.request.user.host
+        # Find the command and check if it's in the same host group
+        if not Command.objects.filter(pk=kwargs['pk'],
+                                      group__hosts__hosts=host.pk).exists():
+            # Unauthorized host
+            results = {STATUS_FIELD: STATUS_ERROR}
+            return Response(data=results,
+                            status=status.HTTP_403_FORBIDDEN)
+        compression = request.data.get(COMPRESSION_FIELD)
+        if compression not in (None, *get_compressions()):
+            # Unsupported compression algorithm
+            results = {COMPRESSION_FIELD: ['Unsupported compression'],
+                       STATUS_FIELD: STATUS_ERROR}
+            return Response(data=results,
+                            status=status.HTTP_400_BAD_REQUEST)
+        # Decrypt data using the host UUID
+        decryptor = FernetEncrypt()
+        decryptor.load_key_from_uuid(host.uuid)
+        max_size = int(get_setting_value(name=COMMANDS_OUTPUT_MAX_SIZE,
+                                         default_value='0'))
+        try:
+            chunk = decrypt_output(decryptor=decryptor,
+                                   text=request.data.get('output', ''),
+                                   compression=compression,
+                                   max_size=max_size)
+        except SizeLimitError:
+            # The chunk alone is larger than the maximum size
+            chunk = None
+        except (InvalidToken, ValueError):
+            # Invalid encrypted or compressed data
+            results = {'output': ['Invalid encrypted data'],
+                       STATUS_FIELD: STATUS_ERROR}
+            return Response(data=results,
+                            status=status.HTTP_400_BAD_REQUEST)
+        # The output is never loaded, the chunks are appended by the database
+        queryset = CommandsOutputUpload.objects.defer('output')
+        if upload_uuid := request.data.get(UPLOAD_FIELD):
+            # Find the existing upload
+            try:
+                upload = queryset.get(uuid=upload_uuid,
+                                      host=host,
+                                      command_id=kwargs['pk'])
+            except (CommandsOutputUpload.DoesNotExist, ValidationError):
+                results = {UPLOAD_FIELD: ['Invalid upload'],
+                           STATUS_FIELD: STATUS_ERROR}
+                return Response(data=results,
+                                status=status.HTTP_400_BAD_REQUEST)
+        else:
+            # Remove the abandoned uploads for the host
+            queryset.filter(
+                host=host,
+                creation__lt=timezone.now() - UPLOAD_LIFETIME).delete()
+            # Create a new upload
+            upload = CommandsOutputUpload.objects.create(
+                host=host,
+                command_id=kwargs['pk'],
+                uuid=uuid.uuid4())
+        results = {ID_FIELD: upload.command_id,
+                   UPLOAD_FIELD: str(upload.uuid),
+                   SIZE_FIELD: upload.size}
+        if chunk is None or (max_size and
+                             upload.size + len(chunk) > max_size):
+            # Refuse any data beyond the maximum size, the upload can still
+            # be completed with the already received data
+            return Response(data={STATUS_FIELD: STATUS_ERROR,
+                                  MESSAGE_FIELD: 'Output too large',
+                                  RESULTS_FIELD: results},
+                            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        # Append the chunk to the upload
+        queryset.filter(pk=upload.pk).update(
+            output=Concat(F('output'), Value(chunk)),
+            size=F('size') + len(chunk))
+        results[SIZE_FIELD] += len(chunk)
+        return Response(data={STATUS_FIELD: STATUS_OK,
+                              RESULTS_FIELD: results},
+                        status=status.HTTP_201_CREATED)
@@ -0,0 +1,85 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import time
+
+from django.db.models import Min
+from django.utils import timezone
+
+from api.views.v1.commands.list import CommandsListView
+
+from remotes.constants import (COMMANDS_WAIT_TIMEOUT,
+                               EXCLUDE_FIELD,
+                               TIMEOUT_FIELD)
+from remotes.models import PendingCommand
+
+from utility.misc.commands_notifier import commands_notifier
+from utility.misc.get_setting_value import get_setting_value
+
+
+class CommandsWaitView(CommandsListView):
+
+    def get(self, request, *args, **kwargs):
+        """
+        Await a pending command for the current host, up to the requested
+        timeout, and then list the pending commands
+
+        The commands excluded by the client (like the commands it's already
+        processing) are ignored while awaiting.
+        """
+        host = request.user.host
+        try:
+            timeout = float(request.query_params.get(TIMEOUT_FIELD, 0))
+        except ValueError:
+            timeout = 0
+        exclude = request.query_params.get(EXCLUDE_FIELD, '')
+        try:
+            exclude = [int(item) for item in exclude.split(',') if item]
+        except ValueError:
+            exclude = []
+        timeout = min(timeout,
+                      float(get_setting_value(name=COMMANDS_WAIT_TIMEOUT,
+                                              default_value='0')))
+        deadline = time.monotonic() + timeout
+        event = commands_notifier.subscribe(host=host.pk)
+        try:
+            while (remaining := deadline - time.monotonic()) > 0:
+                # Reset the event before checking the pending commands, so
+                # the commands created during the check are not missed
+                event.clear()
+                now = timezone.now()
+                after = PendingCommand.objects.filter(
+                    host=host,
+                    before__gt=now).exclude(
+                        command__in=exclude).aggregate(
+                            after=Min('after'))['after']
+                if after is not None and after < now:
+                    # A pending command is ready to be executed
+                    break
+                # Await the notifications, the next command becoming ready
+                # or the next check for the other processes changes
+                delay = min(remaining, commands_notifier.check_interval)
+                if after is not None:
+                    delay = min(delay, (after - now).total_seconds())
+                event.wait(timeout=delay)
+        finally:
+            commands_notifier.unsubscribe(host=host.pk,
+                                          event=event)
+        return super().get(request, *args, **kwargs)
@@ -29,11 +29,21 @@ from api.views.save_request_mixin import SaveRequestMixin
 
 from remotes.client.actions import (ACTION_COMMAND_GET,
                                     ACTION_COMMAND_POST,
+                                    ACTION_COMMAND_POST_CHUNK,
+                                    ACTION_COMMANDS_BATCH,
                                     ACTION_COMMANDS_LIST,
+                                    ACTION_COMMANDS_POST_BATCH,
+                                    ACTION_COMMANDS_WAIT,
                                     ACTION_HOST_REGISTER,
+                                    ACTION_HOST_SESSION,
                                     ACTION_HOST_STATUS,
                                     ACTION_HOST_VERIFY)
-from remotes.constants import ENDPOINTS_FIELD, STATUS_FIELD, STATUS_OK
+from remotes.constants import (COMPRESSION_FIELD,
+                               ENDPOINTS_FIELD,
+                               STATUS_FIELD,
+                               STATUS_OK)
+
+from utility.misc.compression import get_compressions
 
 
 class DiscoverView(APIView, SaveRequestMixin):
@@ -46,12 +56,19 @@ class DiscoverView(APIView, SaveRequestMixin):
         endpoints = {
             ACTION_COMMAND_GET: reverse('api.v1.command.get.generic'),
             ACTION_COMMAND_POST: reverse('api.v1.command.post.generic'),
+            ACTION_COMMAND_POST_CHUNK: reverse(
+                'api.v1.command.post.chunk.generic'),
+            ACTION_COMMANDS_BATCH: reverse('api.v1.commands.batch'),
             ACTION_COMMANDS_LIST: reverse('api.v1.commands.list'),
+            ACTION_COMMANDS_POST_BATCH: reverse('api.v1.commands.post.batch'),
+            ACTION_COMMANDS_WAIT: reverse('api.v1.commands.wait'),
             ACTION_HOST_REGISTER: reverse('api.v1.host.register'),
+            ACTION_HOST_SESSION: reverse('api.v1.host.session'),
             ACTION_HOST_STATUS: reverse('api.v1.host.status'),
             ACTION_HOST_VERIFY: reverse('api.v1.host.verify')
         }
         return Response(
             data={STATUS_FIELD: STATUS_OK,
-                  ENDPOINTS_FIELD: endpoints},
+                  ENDPOINTS_FIELD: endpoints,
+                  COMPRESSION_FIELD: get_compressions()},
             status=status.HTTP_200_OK)
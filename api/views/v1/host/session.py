@@ -0,0 +1,87 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import datetime
+import uuid
+
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.permissions import IsUserWithHost
+from api.views.save_request_mixin import SaveRequestMixin
+
+from encryption.fernet_encrypt import FernetEncrypt
+
+from remotes.constants import (ENCRYPTION_KEY_FIELD,
+                               HOST_SESSION_LIFETIME,
+                               HOST_SESSION_MAX_MESSAGES,
+                               LIFETIME_FIELD,
+                               MAX_MESSAGES_FIELD,
+                               MESSAGE_FIELD,
+                               SESSION_FIELD,
+                               STATUS_FIELD,
+                               STATUS_ERROR,
+                               STATUS_OK)
+from remotes.models import HostSession
+
+from utility.misc.get_setting_value import get_setting_value
+
+
+class HostSessionView(APIView, SaveRequestMixin):
+    permission_classes = (IsUserWithHost, )
+
+    def post(self, request, *args, **kwargs):
+        """
+        Create a new session with a symmetric key for the host
+        """
+        # Save request
+        self.save_request(request, args, kwargs)
+        lifetime = int(get_setting_value(name=HOST_SESSION_LIFETIME,
+                                         default_value='0'))
+        if not lifetime:
+            return Response(data={STATUS_FIELD: STATUS_ERROR,
+                                  MESSAGE_FIELD: 'Sessions disabled'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        host = self.request.user.host
+        now = timezone.now()
+        # Remove the expired sessions for the host
+        HostSession.objects.filter(host=host,
+                                   expiration__lte=now).delete()
+        # Create a new symmetric key for the session
+        encryptor = FernetEncrypt()
+        encryptor.create_new_key()
+        session = HostSession.objects.create(
+            host=host,
+            uuid=uuid.uuid4(),
+            key=encryptor.get_key().decode('utf-8'),
+            expiration=now + datetime.timedelta(seconds=lifetime))
+        return Response(
+            data={STATUS_FIELD: STATUS_OK,
+                  SESSION_FIELD: str(session.uuid),
+                  LIFETIME_FIELD: lifetime,
+                  MAX_MESSAGES_FIELD: int(get_setting_value(
+                      name=HOST_SESSION_MAX_MESSAGES,
+                      default_value='0')),
+                  ENCRYPTION_KEY_FIELD: host.encrypt_key(
+                      encryptor=encryptor)},
+            status=status.HTTP_201_CREATED)
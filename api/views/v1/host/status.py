@@ -33,7 +33,6 @@ from remotes.constants import (HOSTS_GROUPS,
                                STATUS_OK,
                                USER_ID_FIELD,
                                USER_NAME_FIELD)
-from remotes.models import Host
 
 
 class HostStatusView(APIView, SaveRequestMixin):
@@ -46,7 +45,7 @@ class HostStatusView(APIView, SaveRequestMixin):
         # Save request
         self.save_request(request, args, kwargs)
         # Find host matching with the user
-        host = Host.objects.get(user_id=self.request.user.pk)
+        host = self.request.user.host
         hosts_groups = host.hostsgroup_set.all()
         return Response(
             data={STATUS_FIELD: STATUS_OK,
@@ -28,8 +28,6 @@ from rest_framework.views import APIView
 from api.permissions import CanUserRegisterHosts
 from api.views.save_request_mixin import SaveRequestMixin
 
-from encryption.rsa_key import RsaKey
-
 from remotes.constants import (ENCRYPTED_FIELD,
                                HOSTS_GROUP_AUTO_ADD,
                                MESSAGE_FIELD,
@@ -40,6 +38,7 @@ from remotes.constants import (ENCRYPTED_FIELD,
 from remotes.models import Host, HostsGroup
 
 from utility.misc.get_setting_value import get_setting_value
+from utility.misc.public_keys_cache import public_keys_cache
 
 
 class HostVerifyView(APIView, SaveRequestMixin):
@@ -70,8 +69,8 @@ class HostVerifyView(APIView, SaveRequestMixin):
                             status=status.HTTP_400_BAD_REQUEST)
         if host := Host.objects.filter(uuid=host_uuid).first():
             # Check status
-            key = RsaKey()
-            key.load_public_key(data=host.pubkey)
+            key = public_keys_cache.get(host_id=host.pk,
+                                        pubkey=host.pubkey)
             if not key.verify(data=message_encrypted,
                               text=STATUS_OK,
                               use_base64=True):
@@ -19,6 +19,7 @@
 ##
 
 import base64
+import typing
 from uuid import UUID
 
 from cryptography.fernet import Fernet
@@ -27,13 +28,14 @@ from cryptography.fernet import Fernet
 class FernetEncrypt(object):
     def __init__(self):
         self._key = None
+        self._fernet = None
 
     def create_new_key(self):
         """
         Generate new encryption key
         :return: None
         """
-        self._key = Fernet.generate_key()
+        self.load_key(key=Fernet.generate_key())
 
     def get_key(self) -> bytes:
         """
@@ -48,6 +50,8 @@ class FernetEncrypt(object):
         :return: None
         """
         self._key = key
+        # Build the cipher once for every encryption with the same key
+        self._fernet = Fernet(key)
 
     def load_key_from_file(self, filename: str):
         """
@@ -85,7 +89,7 @@ class FernetEncrypt(object):
         :param text: text to be encrypted
         :return: resulting encrypted text
         """
-        return Fernet(self._key).encrypt(
+        return self._fernet.encrypt(
             data=text.encode('utf-8')).decode('utf-8')
 
     def decrypt(self, text: str) -> str:
@@ -95,5 +99,61 @@ class FernetEncrypt(object):
         :param text: encrypted text to decrypt
         :return: resulting plain text
         """
-        return Fernet(self._key).decrypt(
+        return self._fernet.decrypt(
             token=text.encode('utf-8')).decode('utf-8')
+
+    def encrypt_bytes(self, data: bytes) -> str:
+        """
+        Encrypt the input data using the key
+
+        :param data: binary data to be encrypted
+        :return: resulting encrypted text
+        """
+        return self._fernet.encrypt(data=data).decode('utf-8')
+
+    def decrypt_bytes(self, text: str) -> bytes:
+        """
+        Decrypt the input text using the key
+
+        :param text: encrypted text to decrypt
+        :return: resulting binary data
+        """
+        return self._fernet.decrypt(token=text.encode('utf-8'))
+
+    def encrypt_many(self,
+                     items: typing.Union[list, dict]
+                     ) -> typing.Union[list, dict]:
+        """
+        Encrypt every value in a list or in a dictionary using the key
+        The None values are left unencrypted
+
+        :param items: list or dictionary with the texts to be encrypted
+        :return: list or dictionary with the resulting encrypted texts
+        """
+        encrypt = self._fernet.encrypt
+        if isinstance(items, dict):
+            return {key: encrypt(data=value.encode('utf-8')).decode('utf-8')
+                    if value is not None else None
+                    for key, value in items.items()}
+        return [encrypt(data=value.encode('utf-8')).decode('utf-8')
+                if value is not None else None
+                for value in items]
+
+    def decrypt_many(self,
+                     items: typing.Union[list, dict]
+                     ) -> typing.Union[list, dict]:
+        """
+        Decrypt every value in a list or in a dictionary using the key
+        The None values are left unchanged
+
+        :param items: list or dictionary with the encrypted texts
+        :return: list or dictionary with the resulting plain texts
+        """
+        decrypt = self._fernet.decrypt
+        if isinstance(items, dict):
+            return {key: decrypt(token=value.encode('utf-8')).decode('utf-8')
+                    if value is not None else None
+                    for key, value in items.items()}
+        return [decrypt(token=value.encode('utf-8')).decode('utf-8')
+                if value is not None else None
+                for value in items]
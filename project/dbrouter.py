@@ -18,6 +18,9 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 ##
 
+from utility.misc.api_logs_databases import api_logs_databases
+
+
 class DBRouter(object):
     """
     A router to control all database operations on models in the
@@ -28,7 +31,7 @@ class DBRouter(object):
         Attempts to read remote models go to remote database.
         """
         if model._meta.model_name == 'apilog':
-            return 'api_logs'
+            return api_logs_databases.get_database(model=model)
         return None
 
     def db_for_write(self, model, **hints):
@@ -36,7 +39,10 @@ class DBRouter(object):
         Attempts to write remote models go to the remote database.
         """
         if model._meta.model_name == 'apilog':
-            return 'api_logs'
+            # The saved logs go to the database for their own date
+            return api_logs_databases.get_database(
+                model=model,
+                date=getattr(hints.get('instance'), 'date', None))
         return None
 
     def allow_relation(self, obj1, obj2, **hints):
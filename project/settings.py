@@ -104,6 +104,52 @@ DATABASES = {
 
 DATABASE_ROUTERS = ['project.dbrouter.DBRouter']
 
+# Api logs writer
+# The Api logs are saved in a background thread every BATCH_SIZE records
+# or after FLUSH_INTERVAL milliseconds, keeping up to QUEUE_SIZE records.
+# When the queue is full the records are dropped (POLICY = 'drop') or the
+# request waits up to BLOCK_TIMEOUT milliseconds (POLICY = 'block')
+API_LOGS_WRITER_ASYNC = True
+API_LOGS_WRITER_BATCH_SIZE = 100
+API_LOGS_WRITER_FLUSH_INTERVAL = 500
+API_LOGS_WRITER_QUEUE_SIZE = 10000
+API_LOGS_WRITER_POLICY = 'drop'
+API_LOGS_WRITER_BLOCK_TIMEOUT = 100
+
+# Api logs rotation
+# The Api logs can be saved in a SQLite database file for each day
+# (ROTATION = 'day') or for each month (ROTATION = 'month'), placed next to
+# the api_logs database file (None to use only the api_logs database)
+API_LOGS_ROTATION = None
+
+# Settings cache
+# The Setting values are cached in each process and they are reloaded after
+# any change. When multiple processes are used set the SETTINGS_CACHE_TTL
+# to reload them after some seconds (0 to never expire)
+SETTINGS_CACHE_TTL = 0
+
+# Tokens cache
+# The authentication tokens with their users and hosts are cached in each
+# process for API_TOKENS_CACHE_TTL seconds and they are reloaded after any
+# change (0 to disable the cache)
+API_TOKENS_CACHE_TTL = 0
+
+# Public keys cache
+# The parsed hosts public keys are cached in each process, keeping at most
+# PUBLIC_KEYS_CACHE_SIZE keys (0 to disable the cache)
+PUBLIC_KEYS_CACHE_SIZE = 1000
+
+# Commands cache
+# The serialized commands are cached in each process, keeping at most
+# COMMANDS_CACHE_SIZE commands (0 to disable the cache)
+COMMANDS_CACHE_SIZE = 1000
+
+# Commands notifier
+# The requests awaiting the pending commands are woken up by the same
+# process, the pending commands created by the other processes are checked
+# every COMMANDS_NOTIFIER_CHECK_INTERVAL seconds
+COMMANDS_NOTIFIER_CHECK_INTERVAL = 5
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -155,6 +201,6 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Django Rest Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'api.authentication.HostTokenAuthentication',
     ],
 }
@@ -28,8 +28,13 @@ from .models import (ApiLog, ApiLogAdmin,
                      CommandVariable, CommandVariableAdmin,
                      CommandsGroup, CommandsGroupAdmin,
                      CommandsOutput, CommandsOutputAdmin,
+                     CommandsOutputUpload, CommandsOutputUploadAdmin,
                      Host, HostAdmin,
+                     HostCommandsVersion, HostCommandsVersionAdmin,
+                     HostSession, HostSessionAdmin,
                      HostsGroup, HostsGroupAdmin,
+                     LastExecution, LastExecutionAdmin,
+                     PendingCommand, PendingCommandAdmin,
                      Setting, SettingAdmin,
                      Variable, VariableAdmin,
                      VariableValue, VariableValueAdmin)
@@ -43,8 +48,13 @@ admin.site.register(Command, CommandAdmin)
 admin.site.register(CommandVariable, CommandVariableAdmin)
 admin.site.register(CommandsGroup, CommandsGroupAdmin)
 admin.site.register(CommandsOutput, CommandsOutputAdmin)
+admin.site.register(CommandsOutputUpload, CommandsOutputUploadAdmin)
 admin.site.register(Host, HostAdmin)
+admin.site.register(HostCommandsVersion, HostCommandsVersionAdmin)
+admin.site.register(HostSession, HostSessionAdmin)
 admin.site.register(HostsGroup, HostsGroupAdmin)
+admin.site.register(LastExecution, LastExecutionAdmin)
+admin.site.register(PendingCommand, PendingCommandAdmin)
 admin.site.register(Setting, SettingAdmin)
 admin.site.register(Variable, VariableAdmin)
 admin.site.register(VariableValue, VariableValueAdmin)
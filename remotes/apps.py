@@ -25,3 +25,7 @@ from django.utils.translation import pgettext_lazy
 class RemotesConfig(AppConfig):
     name = 'remotes'
     verbose_name = pgettext_lazy('RemotesConfig', 'Remotes')
+
+    def ready(self):
+        # Connect the signals receivers
+        from remotes import signals                               # noqa: F401
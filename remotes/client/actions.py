@@ -20,12 +20,17 @@
 
 ACTION_COMMAND_GET = 'command_get'
 ACTION_COMMAND_POST = 'command_post'
+ACTION_COMMAND_POST_CHUNK = 'command_post_chunk'
+ACTION_COMMANDS_BATCH = 'commands_batch'
 ACTION_COMMANDS_LIST = 'commands_list'
 ACTION_COMMANDS_MONITOR = 'commands_monitor'
+ACTION_COMMANDS_POST_BATCH = 'commands_post_batch'
 ACTION_COMMANDS_PROCESS = 'commands_process'
+ACTION_COMMANDS_WAIT = 'commands_wait'
 ACTION_DISCOVER = 'discover'
 ACTION_GENERATE_KEYS = 'generate_keys'
 ACTION_HOST_REGISTER = 'host_register'
+ACTION_HOST_SESSION = 'host_session'
 ACTION_HOST_STATUS = 'host_status'
 ACTION_HOST_VERIFY = 'host_verify'
 ACTION_NEW_HOST = 'new_host'
@@ -18,44 +18,145 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 ##
 
+import json
+import threading
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 class Api(object):
-    def __init__(self, url: str):
-        self.url = url
+    def __init__(self,
+                 pool_size: int = 10,
+                 retries: int = 3,
+                 backoff: float = 0.5,
+                 timeout: float = 30):
+        """
+        Persistent HTTP transport shared by every request
+
+        Each thread uses its own session, as the requests sessions are not
+        thread safe, while the ETag responses are shared under a lock.
+
+        :param pool_size: number of kept-alive connections for each host
+        :param retries: number of retries for connection errors and for
+                        the idempotent requests
+        :param backoff: backoff factor in seconds between the retries
+        :param timeout: timeout in seconds for each request
+        """
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.retries = retries
+        self.backoff = backoff
+        # Responses with an ETag for the conditional requests, by URL
+        self.responses = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._sessions = []
+
+    @property
+    def session(self) -> requests.Session:
+        """
+        Get the session for the current thread, creating it if needed
+
+        :return: requests Session object
+        """
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            adapter = HTTPAdapter(
+                pool_connections=self.pool_size,
+                pool_maxsize=self.pool_size,
+                max_retries=Retry(total=self.retries,
+                                  backoff_factor=self.backoff,
+                                  status_forcelist=(502, 503, 504),
+                                  raise_on_status=False))
+            session = requests.Session()
+            session.mount(prefix='http://', adapter=adapter)
+            session.mount(prefix='https://', adapter=adapter)
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
 
     def request(self,
                 method: str,
+                url: str,
                 headers: dict = None,
-                data: dict = None):
+                data: dict = None,
+                timeout: float = None,
+                conditional: bool = False):
         """
         Process a request using the requested method
 
         :param method: REST method to execute
+        :param url: URL to request
         :param headers: HTTP headers to include
         :param data: JSON data to send in the request
+        :param timeout: timeout in seconds to use instead of the default
+        :param conditional: send the ETag of the previous response and
+                            reuse its data if not modified
         :return: JSON data in response
         """
-        req = requests.request(method=method,
-                               url=self.url,
-                               headers=headers,
-                               json=data)
+        if conditional:
+            with self._lock:
+                previous = self.responses.get(url)
+        else:
+            previous = None
+        if previous:
+            headers = {**(headers or {}),
+                       'If-None-Match': previous[0]}
+        req = self.session.request(method=method,
+                                   url=url,
+                                   headers=headers,
+                                   json=data,
+                                   timeout=(self.timeout
+                                            if timeout is None
+                                            else timeout))
+        if previous and req.status_code == requests.codes.not_modified:
+            return json.loads(previous[1])
+        if conditional:
+            with self._lock:
+                if 'ETag' in req.headers and req.ok:
+                    self.responses[url] = (req.headers['ETag'],
+                                           req.content)
+                else:
+                    self.responses.pop(url, None)
         return req.json()
 
-    def get(self, headers: dict = None):
+    def get(self,
+            url: str,
+            headers: dict = None,
+            timeout: float = None,
+            conditional: bool = False):
         """
         Process a GET request
         :return: JSON data in response
         """
         return self.request(method='GET',
-                            headers=headers)
+                            url=url,
+                            headers=headers,
+                            timeout=timeout,
+                            conditional=conditional)
 
-    def post(self, headers: dict = None, data: dict = None):
+    def post(self, url: str, headers: dict = None, data: dict = None):
         """
         Process a POST request
         :return: JSON data in response
         """
         return self.request(method='POST',
+                            url=url,
                             headers=headers,
                             data=data)
+
+    def close(self) -> None:
+        """
+        Close every kept-alive connection for every thread
+
+        :return: None
+        """
+        with self._lock:
+            sessions = self._sessions
+            self._sessions = []
+        for session in sessions:
+            session.close()
+        self._local = threading.local()
@@ -0,0 +1,146 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import asyncio
+import json
+
+try:
+    # Try to use the optional aiohttp module
+    import aiohttp
+except ImportError:
+    # Module not found, the asyncio runtime won't be available
+    aiohttp = None
+
+
+class AsyncApi(object):
+    def __init__(self,
+                 pool_size: int = 10,
+                 retries: int = 3,
+                 backoff: float = 0.5,
+                 timeout: float = 30):
+        """
+        Persistent asynchronous HTTP transport shared by every request
+
+        It must be created from a running event loop.
+
+        :param pool_size: number of kept-alive connections for each host
+        :param retries: number of retries for connection errors and for
+                        the idempotent requests
+        :param backoff: backoff factor in seconds between the retries
+        :param timeout: timeout in seconds for each request
+        """
+        self.retries = retries
+        self.backoff = backoff
+        # Responses with an ETag for the conditional requests, by URL
+        self.responses = {}
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit_per_host=pool_size),
+            timeout=aiohttp.ClientTimeout(total=timeout))
+
+    async def request(self,
+                      method: str,
+                      url: str,
+                      headers: dict = None,
+                      data: dict = None,
+                      timeout: float = None,
+                      conditional: bool = False):
+        """
+        Process a request using the requested method
+
+        :param method: REST method to execute
+        :param url: URL to request
+        :param headers: HTTP headers to include
+        :param data: JSON data to send in the request
+        :param timeout: timeout in seconds to use instead of the default
+        :param conditional: send the ETag of the previous response and
+                            reuse its data if not modified
+        :return: JSON data in response
+        """
+        previous = self.responses.get(url) if conditional else None
+        if previous:
+            headers = {**(headers or {}),
+                       'If-None-Match': previous[0]}
+        timeout = (self.session.timeout
+                   if timeout is None
+                   else aiohttp.ClientTimeout(total=timeout))
+        retry = 0
+        while True:
+            try:
+                async with self.session.request(method=method,
+                                                url=url,
+                                                headers=headers,
+                                                json=data,
+                                                timeout=timeout) as response:
+                    if not (retry < self.retries and
+                            method == 'GET' and
+                            response.status in (502, 503, 504)):
+                        if previous and response.status == 304:
+                            return json.loads(previous[1])
+                        if not conditional:
+                            return await response.json(content_type=None)
+                        content = await response.read()
+                        if 'ETag' in response.headers and response.ok:
+                            self.responses[url] = (response.headers['ETag'],
+                                                   content)
+                        else:
+                            self.responses.pop(url, None)
+                        return json.loads(content)
+            except aiohttp.ClientConnectionError as error:
+                # Only the connection errors can be retried for the
+                # requests which are not idempotent
+                if (retry >= self.retries or
+                        (method != 'GET' and
+                         not isinstance(error, aiohttp.ClientConnectorError))):
+                    raise
+            retry += 1
+            await asyncio.sleep(self.backoff * 2 ** (retry - 1))
+
+    async def get(self,
+                  url: str,
+                  headers: dict = None,
+                  timeout: float = None,
+                  conditional: bool = False):
+        """
+        Process a GET request
+        :return: JSON data in response
+        """
+        return await self.request(method='GET',
+                                  url=url,
+                                  headers=headers,
+                                  timeout=timeout,
+                                  conditional=conditional)
+
+    async def post(self, url: str, headers: dict = None, data: dict = None):
+        """
+        Process a POST request
+        :return: JSON data in response
+        """
+        return await self.request(method='POST',
+                                  url=url,
+                                  headers=headers,
+                                  data=data)
+
+    async def close(self) -> None:
+        """
+        Close every kept-alive connection
+
+        :return: None
+        """
+        await self.session.close()
@@ -0,0 +1,75 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import asyncio
+import typing
+
+
+class AsyncRecurringJob(object):
+    """
+    Enqueue recurring coroutines every `interval` seconds using the running
+    event loop
+    """
+    def __init__(self):
+        """
+        Setup the jobs list
+        """
+        self.jobs = []
+
+    def add_job(self,
+                delay: int,
+                action: typing.Callable[..., typing.Awaitable],
+                *args: typing.Any,
+                **kwargs: typing.Any) -> None:
+        """
+        Add an `action` coroutine execution after a `delay`.
+        The `action` will be repeated if it returns a value or it will be
+        canceled in the case it returned a False value.
+
+        :param delay: delay in seconds between the execution
+        :param action: coroutine function to execute (return True to repeat
+                       it again)
+        :param args: arguments list to pass to the action
+        :param kwargs: keyword arguments list to pass to the action
+        :return: None
+        """
+        self.jobs.append((delay, action, args, kwargs))
+
+    async def run(self) -> None:
+        """
+        Execute the recurring actions concurrently
+
+        :return: None
+        """
+        async def queue_job(delay: int,
+                            action: typing.Callable[..., typing.Awaitable],
+                            arguments: tuple,
+                            kwarguments: dict) -> None:
+            """
+            Await the delay and execute the job until it returns False
+
+            :return: None
+            """
+            while True:
+                await asyncio.sleep(delay)
+                if not await action(*arguments, **kwarguments):
+                    break
+
+        await asyncio.gather(*(queue_job(*job) for job in self.jobs))
@@ -0,0 +1,659 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import typing
+import urllib.parse
+
+from encryption.fernet_encrypt import FernetEncrypt
+
+from project import PRODUCT_NAME, VERSION
+
+from remotes.client.actions import (ACTION_COMMAND_GET,
+                                    ACTION_COMMANDS_BATCH,
+                                    ACTION_COMMANDS_LIST,
+                                    ACTION_COMMANDS_MONITOR,
+                                    ACTION_COMMANDS_POST_BATCH,
+                                    ACTION_COMMANDS_PROCESS,
+                                    ACTION_COMMANDS_WAIT,
+                                    ACTION_HOST_SESSION)
+from remotes.client.async_api import AsyncApi, aiohttp
+from remotes.client.async_recurring_job import AsyncRecurringJob
+from remotes.client.result_channel import CHANNEL_TIMEOUT
+from remotes.client.settings import (OPTION_TOKEN,
+                                     SECTION_ENDPOINTS,
+                                     SECTION_HOST)
+from remotes.constants import (COMMANDS_RESULTS_FIELD,
+                               COMPRESSION_HEADER,
+                               EXCLUDE_FIELD,
+                               METHOD_GET,
+                               METHOD_POST,
+                               RESULTS_FIELD,
+                               SESSION_HEADER,
+                               TIMEOUT_FIELD)
+
+from utility.misc.compression import get_compressions
+
+if typing.TYPE_CHECKING:
+    from remotes.client.client import Client
+
+
+class AsyncRuntime(object):
+    def __init__(self, client: 'Client'):
+        """
+        Process the commands actions of a client using an event loop, so the
+        requests, the commands executions and the uploads can overlap in a
+        single thread
+
+        The client settings, keys, session and helpers are shared with the
+        synchronous runtime.
+
+        :param client: Client object with the loaded settings
+        """
+        self.client = client
+        self.options = client.options
+        self.api = None
+        self.session_lock = None
+        # Limit the concurrent commands executions
+        self.executions = None
+        # Commands being processed by the running monitoring iterations
+        self.commands = set()
+        self.commands_lock = None
+        self.tasks = set()
+
+    def process(self) -> tuple[int, dict]:
+        """
+        Process the command line action in a new event loop
+
+        :return: tuple containing status code and dictionary with results
+        """
+        if sys.platform != 'win32' and sys.version_info < (3, 12):
+            # Watch the child processes from the event loop instead of using
+            # a thread for each process (the default since Python 3.12)
+            try:
+                os.close(os.pidfd_open(os.getpid()))
+                asyncio.set_child_watcher(asyncio.PidfdChildWatcher())
+            except (AttributeError, OSError):
+                # Process file descriptors not supported
+                pass
+        return asyncio.run(self.main())
+
+    async def main(self) -> tuple[int, dict]:
+        """
+        Process the command line action
+
+        :return: tuple containing status code and dictionary with results
+        """
+        # Initialize the API transport shared by every request
+        self.api = AsyncApi(pool_size=max(self.options.pool_size,
+                                          self.options.workers),
+                            retries=self.options.retries,
+                            backoff=self.options.backoff,
+                            timeout=self.options.timeout)
+        self.session_lock = asyncio.Lock()
+        self.commands_lock = asyncio.Lock()
+        self.executions = asyncio.Semaphore(max(self.options.workers, 1))
+        try:
+            if self.options.action == ACTION_COMMAND_GET:
+                # Execute command
+                status, results = await self.do_get_command(
+                    command_id=self.options.command)
+            elif self.options.action == ACTION_COMMANDS_MONITOR:
+                # Monitor for commands to execute
+                status, results = await self.do_monitor_commands(
+                    interval=self.options.interval)
+            elif self.options.action == ACTION_COMMANDS_PROCESS:
+                # Process every command
+                status, results = await self.do_process_commands()
+            else:
+                # Unexpected action
+                status = -1
+                results = None
+        finally:
+            await self.api.close()
+        return status, results
+
+    async def do_api_request(self,
+                             method: str,
+                             url: str,
+                             headers: dict = None,
+                             data: dict = None,
+                             timeout: float = None,
+                             conditional: bool = False) -> dict:
+        """
+        Execute an API request for the selected URL
+
+        :param method: REST method to execute
+        :param url: URL to process
+        :param headers: dictionary with headers to pass
+        :param data: dictionary with data to pass
+        :param timeout: timeout in seconds to use instead of the default
+        :param conditional: reuse the previous response if not modified
+        :return: resulting data response
+        """
+        if headers is None:
+            headers = {}
+        # Add client headers
+        headers['CLIENT-AGENT'] = PRODUCT_NAME
+        headers['CLIENT-VERSION'] = VERSION
+        if method == METHOD_GET:
+            results = await self.api.get(url=url,
+                                         headers=headers,
+                                         timeout=timeout,
+                                         conditional=conditional)
+        elif method == METHOD_POST:
+            results = await self.api.post(url=url,
+                                          headers=headers,
+                                          data=data)
+        else:
+            results = None
+        return results
+
+    def get_headers(self, compression: bool = False) -> dict:
+        """
+        Get the headers with the authorization token
+
+        :param compression: add the accepted compression algorithms
+        :return: dictionary with the headers
+        """
+        token = self.client.decrypt_option(section=SECTION_HOST,
+                                           option=OPTION_TOKEN)
+        headers = {'Authorization': f'Token {token}'}
+        if compression:
+            headers[COMPRESSION_HEADER] = ','.join(get_compressions())
+        return headers
+
+    async def get_session(self, headers: dict) -> typing.Optional[dict]:
+        """
+        Get the current session, creating a new session when needed, and
+        add the session header to the request headers
+
+        :param headers: headers with the authorization token
+        :return: dictionary with the session data or None
+        """
+        if not self.client.is_session_available():
+            return None
+        async with self.session_lock:
+            session = self.client.session
+            if self.client.is_session_expired(session=session):
+                url = self.client.build_url(section=SECTION_ENDPOINTS,
+                                            option=ACTION_HOST_SESSION)
+                results = await self.do_api_request(method=METHOD_POST,
+                                                    url=url,
+                                                    headers=headers,
+                                                    data=None)
+                self.client.load_session(results=results)
+                session = self.client.session
+            if session:
+                headers[SESSION_HEADER] = session['id']
+        return session
+
+    async def do_list_commands(self) -> tuple[int, dict]:
+        """
+        List commands
+
+        The previous list is reused if the server reports it's unchanged.
+
+        :return: tuple with the status and the resulting data
+        """
+        url = self.client.build_url(section=SECTION_ENDPOINTS,
+                                    option=ACTION_COMMANDS_LIST)
+        results = await self.do_api_request(method=METHOD_GET,
+                                            url=url,
+                                            headers=self.get_headers(),
+                                            data=None,
+                                            conditional=True)
+        return 0, results
+
+    async def do_wait_commands(
+            self,
+            timeout: int,
+            exclude: typing.Iterable[int]) -> tuple[int, dict]:
+        """
+        Await a pending command from the server, up to `timeout` seconds,
+        and list the pending commands
+
+        :param timeout: maximum seconds to await the pending commands
+        :param exclude: command IDs to ignore while awaiting
+        :return: tuple with the status and the resulting data
+        """
+        query = urllib.parse.urlencode(
+            {TIMEOUT_FIELD: timeout,
+             EXCLUDE_FIELD: ','.join(map(str, sorted(exclude)))})
+        url = self.client.build_url(section=SECTION_ENDPOINTS,
+                                    option=ACTION_COMMANDS_WAIT,
+                                    extra=f'?{query}')
+        results = await self.do_api_request(
+            method=METHOD_GET,
+            url=url,
+            headers=self.get_headers(),
+            data=None,
+            timeout=self.options.timeout + timeout)
+        return 0, results
+
+    async def do_get_command(self, command_id: int) -> tuple[int, dict]:
+        """
+        Execute command
+
+        :param command_id: command ID to execute
+        :return: tuple with the status and the resulting data
+        """
+        url = self.client.build_url(section=SECTION_ENDPOINTS,
+                                    option=ACTION_COMMAND_GET,
+                                    extra=f'{command_id}/')
+        headers = self.get_headers(compression=True)
+        session = await self.get_session(headers=headers)
+        results = await self.do_api_request(method=METHOD_GET,
+                                            url=url,
+                                            headers=headers,
+                                            data=None)
+        # Check if there's a valid command in the command
+        if self.client.is_valid_command(results=results,
+                                        command_id=command_id):
+            # Get the symmetric key used to decrypt the command to process
+            decryptor = self.client.get_decryptor(results=results,
+                                                  session=session)
+            status, results = await self.do_execute_command(
+                command=results,
+                decryptor=decryptor)
+        else:
+            # Invalid command
+            status = 1
+        return status, results
+
+    async def do_get_commands_batch(
+            self) -> tuple[int, dict, typing.Optional[dict]]:
+        """
+        Get every pending command in a single request
+
+        :return: tuple with the status, the resulting data and the session
+                 used in the request
+        """
+        url = self.client.build_url(section=SECTION_ENDPOINTS,
+                                    option=ACTION_COMMANDS_BATCH)
+        headers = self.get_headers(compression=True)
+        session = await self.get_session(headers=headers)
+        results = await self.do_api_request(method=METHOD_GET,
+                                            url=url,
+                                            headers=headers,
+                                            data=None)
+        return 0, results, session
+
+    async def do_execute_command(self,
+                                 command: dict,
+                                 decryptor: FernetEncrypt,
+                                 variables: dict = None,
+                                 upload: bool = True) -> tuple[int, dict]:
+        """
+        Execute a command received from the server and transmit its results
+
+        :param command: encrypted command data
+        :param decryptor: FernetEncrypt object to decrypt the command
+        :param variables: dictionary with the variables values saved by the
+                          previous commands, updated with the command results
+        :param upload: transmit the command results to the server
+        :return: tuple with the status and the resulting data
+        """
+        results = command
+        command_id = results['id']
+        timeout = results['timeout']
+        source, settings, items = self.client.prepare_command(
+            command=results,
+            decryptor=decryptor,
+            variables=variables)
+        # Execute the source code, saving its output in a temporary file
+        # instead of keeping it in memory
+        with tempfile.TemporaryFile() as stdout_file:
+            try:
+                async with self.executions:
+                    if self.client.worker_pool:
+                        # Execute the command in a persistent worker process
+                        # awaiting it from a thread
+                        status, result, stderr = await asyncio.to_thread(
+                            self.client.worker_pool.execute,
+                            source=source,
+                            settings=settings,
+                            variables=items,
+                            timeout=timeout,
+                            output=stdout_file)
+                    else:
+                        status, result, stderr = await self.do_execute_process(
+                            source=source,
+                            settings=settings,
+                            variables=items,
+                            timeout=timeout,
+                            output=stdout_file)
+                result, stdout = self.client.get_command_output(
+                    file=stdout_file,
+                    result=result)
+                if stdout is None:
+                    # Transmit the large output in chunks
+                    results['output'] = await self.do_post_command_chunks(
+                        command_id=command_id,
+                        file=stdout_file,
+                        result=result,
+                        stderr=stderr,
+                        exit_status=status)
+            except subprocess.TimeoutExpired:
+                status = self.client.save_command_timeout(results=results)
+                stdout = None
+                result = None
+                stderr = None
+        # Transmit command results (the chunked outputs were already sent)
+        if result is not None:
+            if upload and stdout is not None:
+                url, data = self.client.get_command_post_request(
+                    command_id=command_id,
+                    data={'output': stdout,
+                          'result': result,
+                          'diagnostics': stderr},
+                    exit_status=status)
+                results['output'] = await self.do_api_request(
+                    method=METHOD_POST,
+                    url=url,
+                    headers=self.get_headers(),
+                    data=data)
+            self.client.save_command_results(results=results,
+                                             stdout=stdout,
+                                             stderr=stderr,
+                                             result=result,
+                                             exit_status=status,
+                                             variables=variables)
+        return status, results
+
+    async def do_execute_process(
+            self,
+            source: str,
+            settings: dict,
+            variables: dict,
+            timeout: typing.Optional[float],
+            output: typing.BinaryIO) -> tuple[int, str, str]:
+        """
+        Execute a command source code in a new Python process
+
+        :param source: command source code
+        :param settings: command settings for __SETTINGS__
+        :param variables: command variables for __VARIABLES__
+        :param timeout: timeout in seconds for the command
+        :param output: file object to write the command output
+        :return: tuple with the exit status, the command result and the
+                 command standard error
+        :raise subprocess.TimeoutExpired: if the command times out
+        """
+        channel, program = self.client.prepare_process(source=source,
+                                                       settings=settings,
+                                                       variables=variables)
+        with tempfile.TemporaryFile() as stderr_file:
+            args, arguments = self.client.get_process_arguments(
+                channel=channel,
+                output=output,
+                stderr=stderr_file)
+            try:
+                process = await asyncio.create_subprocess_exec(*args,
+                                                               **arguments)
+            except Exception:
+                # The process was not started, the channel is not used
+                channel.close()
+                raise
+            receiving = asyncio.ensure_future(channel.read_async())
+            try:
+                await asyncio.wait_for(
+                    process.communicate(input=program),
+                    timeout=timeout)
+            except asyncio.TimeoutError:
+                # Terminate the process to close the channel
+                process.kill()
+                await process.wait()
+                raise subprocess.TimeoutExpired(cmd='python',
+                                                timeout=timeout)
+            finally:
+                try:
+                    result = await asyncio.wait_for(receiving,
+                                                    timeout=CHANNEL_TIMEOUT)
+                except asyncio.TimeoutError:
+                    # The pipe is still open, get the data received
+                    result = channel.get_result()
+            stderr = self.client.get_process_stderr(file=stderr_file)
+        return process.returncode, result, stderr
+
+    async def do_post_command_chunks(self,
+                                     command_id: int,
+                                     file: typing.BinaryIO,
+                                     result: str,
+                                     stderr: str,
+                                     exit_status: int) -> dict:
+        """
+        Transmit a large command output in chunks and then its result
+
+        :param command_id: executed command ID
+        :param file: file object with the command output
+        :param result: command result
+        :param stderr: command standard error
+        :param exit_status: command exit status
+        :return: resulting data response
+        """
+        headers = self.get_headers()
+        chunks = self.client.get_command_chunks_requests(
+            command_id=command_id,
+            file=file,
+            result=result,
+            stderr=stderr,
+            exit_status=exit_status)
+        try:
+            url, data = next(chunks)
+            while True:
+                url, data = chunks.send(await self.do_api_request(
+                    method=METHOD_POST,
+                    url=url,
+                    headers=headers,
+                    data=data))
+        except StopIteration as stop:
+            return stop.value
+
+    async def do_post_commands_batch(
+            self,
+            commands: list[dict]) -> tuple[int, dict]:
+        """
+        Transmit the results of every executed command in a single request
+
+        :param commands: list of executed commands with their results
+        :return: tuple with the status and the resulting data
+        """
+        url = self.client.build_url(section=SECTION_ENDPOINTS,
+                                    option=ACTION_COMMANDS_POST_BATCH)
+        results = await self.do_api_request(
+            method=METHOD_POST,
+            url=url,
+            headers=self.get_headers(),
+            data=self.client.get_commands_batch_data(commands=commands))
+        self.client.save_commands_batch_results(commands=commands,
+                                                results=results)
+        return 0, results
+
+    async def do_process_commands(self) -> tuple[int, dict]:
+        """
+        Execute every command in list
+
+        The commands in the sequential groups are executed in order while the
+        other commands are executed concurrently, up to `workers` commands at
+        the same time.
+        The commands still processed by a previous monitoring iteration are
+        skipped.
+
+        :return: tuple with the status and the resulting data
+        """
+        async def process_queue(commands: list[dict]) -> None:
+            """
+            Execute the commands in the queue one after another
+
+            :param commands: list of commands to execute
+            :return: None
+            """
+            for command in commands:
+                start_time = time.monotonic()
+                command_id = self.client.get_command_id(command=command,
+                                                        batch=bool(decryptor))
+                if decryptor:
+                    # The command was already received from the batch
+                    _, commands_results[command_id] = (
+                        await self.do_execute_command(
+                            command=command,
+                            decryptor=decryptor,
+                            variables=variables,
+                            upload=not upload_batch))
+                else:
+                    _, commands_results[command_id] = (
+                        await self.do_get_command(command_id=command_id))
+                self.client.save_command_elapsed(
+                    results=commands_results[command_id],
+                    start_time=start_time)
+
+        decryptor = None
+        upload_batch = False
+        # Variables values saved by the commands received from the batch
+        variables = {}
+        # The running iterations cannot release their commands while the
+        # pending commands are requested, so a command transmitted during
+        # the request will not be processed again
+        async with self.commands_lock:
+            if self.client.settings.get_value(section=SECTION_ENDPOINTS,
+                                              option=ACTION_COMMANDS_BATCH):
+                status, results, session = await self.do_get_commands_batch()
+                # Get the symmetric key used to decrypt every command
+                decryptor, upload_batch = self.client.get_batch_decryptor(
+                    results=results,
+                    session=session)
+            else:
+                status, results = await self.do_list_commands()
+            commands = [command
+                        for command in results[RESULTS_FIELD]
+                        if self.client.get_command_id(
+                            command=command,
+                            batch=bool(decryptor)) not in self.commands]
+            processing = {self.client.get_command_id(command=command,
+                                                     batch=bool(decryptor))
+                          for command in commands}
+            self.commands.update(processing)
+        commands_results = {}
+        results[COMMANDS_RESULTS_FIELD] = commands_results
+        try:
+            await asyncio.gather(*(
+                process_queue(commands=queue)
+                for queue in self.client.get_commands_queues(
+                    commands=commands)))
+            if upload_batch:
+                # Transmit the results of the executed commands
+                commands = self.client.get_commands_to_upload(
+                    commands_results=commands_results)
+                if commands:
+                    await self.do_post_commands_batch(commands=commands)
+        finally:
+            async with self.commands_lock:
+                self.commands.difference_update(processing)
+        return status, results
+
+    async def do_monitor_commands(self, interval: int) -> tuple[int, None]:
+        """
+        Monitor pending commands
+
+        Every iteration is started after the interval, even when the previous
+        iterations are still processing their commands.
+        When the server offers the commands wait endpoint the client awaits
+        the new commands from the server, up to `interval` seconds, and
+        starts a new iteration as soon as they are available.
+
+        :param interval: interval in seconds to watch for commands to process
+        :return: None
+        """
+        async def process_commands() -> None:
+            """
+            Process commands ignoring the connection errors
+
+            :return: None
+            """
+            try:
+                await self.do_process_commands()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                # Ignore connection errors during monitoring
+                pass
+
+        async def monitor_process_commands() -> bool:
+            """
+            Start processing the commands and always return True in order to
+            continue with monitoring for new commands
+
+            :return: True
+            """
+            task = asyncio.create_task(process_commands())
+            # Keep a reference to the running task until its completion
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+            return True
+
+        async def wait_process_commands() -> bool:
+            """
+            Await new commands and start processing them, always returning
+            True in order to continue with monitoring for new commands
+
+            :return: True
+            """
+            nonlocal processed
+            start_time = time.monotonic()
+            try:
+                # The commands being processed are ignored and the commands
+                # processed before and still pending are processed again
+                # only after the interval
+                _, results = await self.do_wait_commands(
+                    timeout=interval,
+                    exclude=processed | self.commands)
+                commands = self.client.get_waited_commands(results=results)
+                if not commands - processed - self.commands:
+                    # No new commands (the server could not hold the
+                    # request), await the interval before processing again
+                    await asyncio.sleep(self.client.get_remaining_interval(
+                        start_time=start_time,
+                        interval=interval))
+                if commands:
+                    await monitor_process_commands()
+                processed = commands
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                # Ignore connection errors during monitoring
+                await asyncio.sleep(self.client.get_remaining_interval(
+                    start_time=start_time,
+                    interval=interval))
+            return True
+
+        # Pending commands returned by the last wait
+        processed = set()
+        recurring = AsyncRecurringJob()
+        if self.client.settings.get_value(section=SECTION_ENDPOINTS,
+                                          option=ACTION_COMMANDS_WAIT):
+            recurring.add_job(delay=0,
+                              action=wait_process_commands)
+        else:
+            recurring.add_job(delay=interval,
+                              action=monitor_process_commands)
+        await recurring.run()
+        return 0, None
@@ -19,10 +19,16 @@
 ##
 
 import argparse
+import concurrent.futures
+import io
+import json
 import os
 import pathlib
 import subprocess
 import tempfile
+import threading
+import time
+import typing
 import urllib.parse
 import uuid
 
@@ -36,51 +42,96 @@ from project import PRODUCT_NAME, VERSION
 import remotes
 from remotes.client.actions import (ACTION_COMMAND_GET,
                                     ACTION_COMMAND_POST,
+                                    ACTION_COMMAND_POST_CHUNK,
+                                    ACTION_COMMANDS_BATCH,
                                     ACTION_COMMANDS_LIST,
                                     ACTION_COMMANDS_MONITOR,
+                                    ACTION_COMMANDS_POST_BATCH,
                                     ACTION_COMMANDS_PROCESS,
+                                    ACTION_COMMANDS_WAIT,
                                     ACTION_DISCOVER,
                                     ACTION_GENERATE_KEYS,
                                     ACTION_HOST_REGISTER,
+                                    ACTION_HOST_SESSION,
                                     ACTION_HOST_STATUS,
                                     ACTION_HOST_VERIFY,
                                     ACTION_NEW_HOST,
                                     ACTION_STATUS,
                                     ACTIONS)
 from remotes.client.api import Api
+from remotes.client.async_api import aiohttp
+from remotes.client.async_runtime import AsyncRuntime
 from remotes.client.recurring_job import RecurringJob
+from remotes.client.result_channel import ResultChannel
 from remotes.client.settings import (Settings,
+                                     OPTION_COMPRESSION,
                                      OPTION_PRIVATE_KEY,
                                      OPTION_PUBLIC_KEY,
                                      OPTION_TOKEN,
                                      SECTION_ENDPOINTS,
                                      SECTION_HOST,
                                      SECTION_SERVER)
+from remotes.client.worker_pool import WorkerPool
 from remotes.constants import (COMMAND_FIELD,
                                COMMANDS_RESULTS_FIELD,
+                               COMPRESSED_FIELD,
+                               COMPRESSION_FIELD,
+                               COMPRESSION_HEADER,
+                               ELAPSED_FIELD,
                                ENCRYPTED_FIELD,
                                ENCRYPTION_KEY_FIELD,
+                               EXCLUDE_FIELD,
+                               EXIT_STATUS_FIELD,
                                ENDPOINTS_FIELD,
                                MESSAGE_FIELD,
+                               OUTPUT_VARIABLES_FIELD,
                                METHOD_GET,
                                METHOD_POST,
                                PUBLIC_KEY_FIELD,
+                               GROUP_FIELD,
+                               ID_FIELD,
+                               LIFETIME_FIELD,
+                               MAX_MESSAGES_FIELD,
                                RESULTS_FIELD,
+                               SEQUENTIAL_FIELD,
                                SERVER_URL,
+                               SESSION_FIELD,
+                               SESSION_HEADER,
                                STATUS_FIELD,
                                STATUS_ERROR,
                                STATUS_OK,
+                               TIMEOUT_FIELD,
+                               UPLOAD_FIELD,
                                UUID_FIELD)
 
+from utility.misc.compression import (COMPRESSION_MIN_SIZE,
+                                      compress,
+                                      decompress,
+                                      get_compressions)
 from utility.misc.python_version_action import PythonVersionAction
 
 
+EXECUTOR_POOL = 'pool'
+EXECUTOR_PROCESS = 'process'
+RUNTIME_ASYNCIO = 'asyncio'
+RUNTIME_SYNC = 'sync'
+
+
 class Client(object):
     def __init__(self):
         self.options = None
         self.settings = None
         self.key = None
         self.encryptor = None
+        self.api = None
+        # Symmetric key session shared with the server
+        self.session = None
+        self.sessions_enabled = True
+        self.session_lock = threading.Lock()
+        # Decrypted settings options
+        self.decrypted_options = {}
+        # Persistent processes to execute the commands
+        self.worker_pool = None
 
     def get_command_line(self) -> None:
         """
@@ -137,6 +188,59 @@ class Client(object):
                            type=int,
                            required=False,
                            help='interval in seconds for commands monitoring')
+        group.add_argument('--workers',
+                           type=int,
+                           required=False,
+                           default=1,
+                           help='number of commands to process concurrently')
+        group.add_argument('--chunk_size',
+                           type=int,
+                           required=False,
+                           default=1048576,
+                           help='transmit the larger outputs in chunks of '
+                                'this size (0 to disable)')
+        group.add_argument('--executor',
+                           type=str,
+                           required=False,
+                           choices=(EXECUTOR_PROCESS, EXECUTOR_POOL),
+                           default=EXECUTOR_PROCESS,
+                           help='execute each command in a new process or '
+                                'in a pool of persistent processes')
+        group.add_argument('--executor_max_jobs',
+                           type=int,
+                           required=False,
+                           default=100,
+                           help='number of commands executed by each '
+                                'persistent process before replacing it')
+        group.add_argument('--runtime',
+                           type=str,
+                           required=False,
+                           choices=(RUNTIME_SYNC, RUNTIME_ASYNCIO),
+                           default=RUNTIME_SYNC,
+                           help='process the commands using threads or '
+                                'using an asyncio event loop')
+        # Connection arguments
+        group = parser.add_argument_group('Connection arguments')
+        group.add_argument('--timeout',
+                           type=float,
+                           required=False,
+                           default=30,
+                           help='timeout in seconds for each request')
+        group.add_argument('--retries',
+                           type=int,
+                           required=False,
+                           default=3,
+                           help='number of retries for failed requests')
+        group.add_argument('--backoff',
+                           type=float,
+                           required=False,
+                           default=0.5,
+                           help='backoff factor in seconds between retries')
+        group.add_argument('--pool_size',
+                           type=int,
+                           required=False,
+                           default=10,
+                           help='number of kept-alive connections')
         # Process options
         options = parser.parse_args()
         self.options = options
@@ -170,6 +274,8 @@ class Client(object):
         elif options.action == ACTION_COMMANDS_MONITOR:
             if not options.interval:
                 parser.error('missing monitoring interval')
+        if options.runtime == RUNTIME_ASYNCIO and not aiohttp:
+            parser.error('the asyncio runtime requires the aiohttp module')
 
     def process(self) -> tuple[int, dict]:
         """
@@ -177,7 +283,13 @@ class Client(object):
         :return: tuple containing status code and dictionary with results
         """
         # actions map with (method, {kwargs for method})
-        if self.options.action == ACTION_STATUS:
+        if (self.options.runtime == RUNTIME_ASYNCIO and
+                self.options.action in (ACTION_COMMAND_GET,
+                                        ACTION_COMMANDS_MONITOR,
+                                        ACTION_COMMANDS_PROCESS)):
+            # Process the commands using the asyncio runtime
+            status, results = AsyncRuntime(client=self).process()
+        elif self.options.action == ACTION_STATUS:
             # Get status
             status, results = self.do_get_status(url=self.options.url)
         elif self.options.action == ACTION_DISCOVER:
@@ -234,12 +346,13 @@ class Client(object):
             results = None
         return status, results
 
-    # noinspection PyMethodMayBeStatic
     def do_api_request(self,
                        method: str,
                        url: str,
                        headers: dict = None,
-                       data: dict = None) -> dict:
+                       data: dict = None,
+                       timeout: float = None,
+                       conditional: bool = False) -> dict:
         """
         Execute an API request for the selected URL
 
@@ -247,6 +360,8 @@ class Client(object):
         :param url: URL to process
         :param headers: dictionary with headers to pass
         :param data: dictionary with data to pass
+        :param timeout: timeout in seconds to use instead of the default
+        :param conditional: reuse the previous response if not modified
         :return: resulting data response
         """
         if headers is None:
@@ -254,12 +369,15 @@ class Client(object):
         # Add client headers
         headers['CLIENT-AGENT'] = PRODUCT_NAME
         headers['CLIENT-VERSION'] = VERSION
-        api = Api(url=url)
         if method == METHOD_GET:
-            results = api.get(headers=headers)
+            results = self.api.get(url=url,
+                                   headers=headers,
+                                   timeout=timeout,
+                                   conditional=conditional)
         elif method == METHOD_POST:
-            results = api.post(headers=headers,
-                               data=data)
+            results = self.api.post(url=url,
+                                    headers=headers,
+                                    data=data)
         else:
             results = None
         return results
@@ -301,6 +419,11 @@ class Client(object):
                 section=SECTION_ENDPOINTS,
                 option=endpoint,
                 value=results[ENDPOINTS_FIELD][endpoint])
+        # Save the compression algorithms supported by the server
+        self.settings.set_value(
+            section=SECTION_SERVER,
+            option=OPTION_COMPRESSION,
+            value=','.join(results.get(COMPRESSION_FIELD, [])))
         return 0, results
 
     def do_generate_keys(self,
@@ -413,6 +536,8 @@ class Client(object):
         """
         List commands
 
+        The previous list is reused if the server reports it's unchanged.
+
         :return: tuple with the status and the resulting data
         """
         url = self.build_url(section=SECTION_ENDPOINTS,
@@ -423,7 +548,8 @@ class Client(object):
         results = self.do_api_request(method=METHOD_GET,
                                       url=url,
                                       headers=headers,
-                                      data=None)
+                                      data=None,
+                                      conditional=True)
         return 0, results
 
     def do_get_command(self, command_id: int) -> tuple[int, dict]:
@@ -438,116 +564,930 @@ class Client(object):
                              extra=f'{command_id}/')
         token = self.decrypt_option(section=SECTION_HOST,
                                     option=OPTION_TOKEN)
-        headers = {'Authorization': f'Token {token}'}
+        headers = {'Authorization': f'Token {token}',
+                   COMPRESSION_HEADER: ','.join(get_compressions())}
+        session = self.get_session(headers=headers)
         results = self.do_api_request(method=METHOD_GET,
                                       url=url,
                                       headers=headers,
                                       data=None)
         # Check if there's a valid command in the command
-        if 'id' in results and results['id'] == command_id:
-            timeout = results['timeout']
+        if self.is_valid_command(results=results,
+                                 command_id=command_id):
             # Get the symmetric key used to decrypt the command to process
+            decryptor = self.get_decryptor(results=results,
+                                           session=session)
+            status, results = self.do_execute_command(command=results,
+                                                      decryptor=decryptor)
+        else:
+            # Invalid command
+            status = 1
+        return status, results
+
+    # noinspection PyMethodMayBeStatic
+    def is_valid_command(self, results: dict, command_id: int) -> bool:
+        """
+        Check if the received data contains the requested command
+
+        :param results: received data
+        :param command_id: requested command ID
+        :return: True if the command was received
+        """
+        return 'id' in results and results['id'] == command_id
+
+    def do_get_commands_batch(self) -> tuple[int, dict]:
+        """
+        Get every pending command in a single request
+
+        :return: tuple with the status and the resulting data
+        """
+        url = self.build_url(section=SECTION_ENDPOINTS,
+                             option=ACTION_COMMANDS_BATCH)
+        token = self.decrypt_option(section=SECTION_HOST,
+                                    option=OPTION_TOKEN)
+        headers = {'Authorization': f'Token {token}',
+                   COMPRESSION_HEADER: ','.join(get_compressions())}
+        self.get_session(headers=headers)
+        results = self.do_api_request(method=METHOD_GET,
+                                      url=url,
+                                      headers=headers,
+                                      data=None)
+        return 0, results
+
+    def do_wait_commands(self,
+                         timeout: int,
+                         exclude: typing.Iterable[int]) -> tuple[int, dict]:
+        """
+        Await a pending command from the server, up to `timeout` seconds,
+        and list the pending commands
+
+        :param timeout: maximum seconds to await the pending commands
+        :param exclude: command IDs to ignore while awaiting
+        :return: tuple with the status and the resulting data
+        """
+        query = urllib.parse.urlencode(
+            {TIMEOUT_FIELD: timeout,
+             EXCLUDE_FIELD: ','.join(map(str, sorted(exclude)))})
+        url = self.build_url(section=SECTION_ENDPOINTS,
+                             option=ACTION_COMMANDS_WAIT,
+                             extra=f'?{query}')
+        token = self.decrypt_option(section=SECTION_HOST,
+                                    option=OPTION_TOKEN)
+        headers = {'Authorization': f'Token {token}'}
+        results = self.do_api_request(method=METHOD_GET,
+                                      url=url,
+                                      headers=headers,
+                                      data=None,
+                                      timeout=self.options.timeout + timeout)
+        return 0, results
+
+    def do_host_session(self, headers: dict) -> tuple[int, dict]:
+        """
+        Create a new session with a symmetric key shared with the server
+
+        :param headers: headers with the authorization token
+        :return: tuple with the status and the resulting data
+        """
+        url = self.build_url(section=SECTION_ENDPOINTS,
+                             option=ACTION_HOST_SESSION)
+        results = self.do_api_request(method=METHOD_POST,
+                                      url=url,
+                                      headers=headers,
+                                      data=None)
+        return self.load_session(results=results), results
+
+    def load_session(self, results: dict) -> int:
+        """
+        Load the session received from the server
+
+        :param results: received data
+        :return: 0 if the session was created else 1
+        """
+        if results.get(STATUS_FIELD) == STATUS_OK:
             decryptor = FernetEncrypt()
             decryptor.load_key(key=self.key.decrypt(
                 text=results[ENCRYPTION_KEY_FIELD],
                 use_base64=True))
-            # Create a new temporary file with the decrypted command
-            temp_file_fd, temp_file_source = tempfile.mkstemp(
-                prefix=f'{PRODUCT_NAME.lower().replace(" ", "_")}-',
-                text=True)
-            with os.fdopen(temp_file_fd, 'w') as file:
-                # Initialize modules path
-                remotes_path = pathlib.Path(remotes.__path__[0])
-                file.write('import sys\n'
-                           f'sys.path.append(r"{remotes_path.parent}")\n')
-                # Initialize __RESULT__ variable
-                file.write('__RESULT__ = ""\n')
-                # Save settings
-                items = {key: decryptor.decrypt(text=value)
-                         for key, value in results['settings'].items()}
-                file.write(f'__SETTINGS__ = {items}\n')
-                # Save variables
-                items = {key: decryptor.decrypt(text=value) if value
-                         else None
-                         for key, value in results['variables'].items()}
-                file.write(f'__VARIABLES__ = {items}\n')
-                file.write('\n')
-                # Write command
-                file.write(decryptor.decrypt(text=results['command']))
-                # Convert __RESULT__ in list if it's not a list and
-                # write __RESULT__ in JSON format in stderr
-                file.write('\n'
-                           '\n'
-                           'import json\n'
-                           'import sys\n'
-                           'if not isinstance(__RESULT__, list):\n'
-                           '    __RESULT__ = [__RESULT__]\n'
-                           'sys.stderr.write(json.dumps(obj=__RESULT__,\n'
-                           '                            indent=2))\n')
-            # Execute the source code in a Python process
-            process = subprocess.Popen(args=['python', temp_file_source],
-                                       stdout=subprocess.PIPE,
-                                       stderr=subprocess.PIPE)
+            # Renew the session a bit before its expiration
+            self.session = {
+                'id': results[SESSION_FIELD],
+                'decryptor': decryptor,
+                'expiration': (time.monotonic() +
+                               results[LIFETIME_FIELD] * 0.9),
+                'max_messages': results[MAX_MESSAGES_FIELD],
+                'messages': 0}
+            status = 0
+        else:
+            # Sessions not available, don't try again
+            self.session = None
+            self.sessions_enabled = False
+            status = 1
+        return status
+
+    def is_session_available(self) -> bool:
+        """
+        Check if the server offers the sessions
+
+        :return: True if the sessions can be used
+        """
+        return bool(self.sessions_enabled and self.settings.get_value(
+            section=SECTION_ENDPOINTS,
+            option=ACTION_HOST_SESSION))
+
+    # noinspection PyMethodMayBeStatic
+    def is_session_expired(self, session: typing.Optional[dict]) -> bool:
+        """
+        Check if a session must be created or renewed
+
+        :param session: dictionary with the session data or None
+        :return: True if a new session is needed
+        """
+        return (session is None or
+                time.monotonic() > session['expiration'] or
+                0 < session['max_messages'] <= session['messages'])
+
+    def get_session(self, headers: dict) -> typing.Optional[dict]:
+        """
+        Get the current session, creating a new session when needed, and
+        add the session header to the request headers
+
+        :param headers: headers with the authorization token
+        :return: dictionary with the session data or None
+        """
+        if not self.is_session_available():
+            return None
+        with self.session_lock:
+            session = self.session
+            if self.is_session_expired(session=session):
+                self.do_host_session(headers=headers)
+                session = self.session
+            if session:
+                headers[SESSION_HEADER] = session['id']
+        return session
+
+    def get_decryptor(self,
+                      results: dict,
+                      session: typing.Optional[dict]) -> FernetEncrypt:
+        """
+        Get the FernetEncrypt object to decrypt the received data, using the
+        session key or decrypting the received key with the private key
+
+        :param results: received data
+        :param session: dictionary with the session data used in the request
+        :return: FernetEncrypt object
+        """
+        if session and results.get(SESSION_FIELD) == session['id']:
+            with self.session_lock:
+                session['messages'] += 1
+            return session['decryptor']
+        if session:
+            # The session was refused, a new session will be created
+            with self.session_lock:
+                if self.session is session:
+                    self.session = None
+        decryptor = FernetEncrypt()
+        decryptor.load_key(key=self.key.decrypt(
+            text=results[ENCRYPTION_KEY_FIELD],
+            use_base64=True))
+        return decryptor
+
+    def do_execute_command(self,
+                           command: dict,
+                           decryptor: FernetEncrypt,
+                           variables: dict = None,
+                           upload: bool = True) -> tuple[int, dict]:
+        """
+        Execute a command received from the server and transmit its results
+
+        :param command: encrypted command data
+        :param decryptor: FernetEncrypt object to decrypt the command
+        :param variables: dictionary with the variables values saved by the
+                          previous commands, updated with the command results
+        :param upload: transmit the command results to the server
+        :return: tuple with the status and the resulting data
+        """
+        results = command
+        command_id = results['id']
+        timeout = results['timeout']
+        source, settings, items = self.prepare_command(command=results,
+                                                       decryptor=decryptor,
+                                                       variables=variables)
+        # Execute the source code, saving its output in a temporary file
+        # instead of keeping it in memory
+        with tempfile.TemporaryFile() as stdout_file:
             try:
-                stdout, stderr = [stream.decode('utf-8')
-                                  for stream
-                                  in process.communicate(timeout=timeout)]
-                status = process.returncode
+                if self.worker_pool:
+                    # Execute the command in a persistent worker process
+                    status, result, stderr = self.worker_pool.execute(
+                        source=source,
+                        settings=settings,
+                        variables=items,
+                        timeout=timeout,
+                        output=stdout_file)
+                else:
+                    status, result, stderr = self.do_execute_process(
+                        source=source,
+                        settings=settings,
+                        variables=items,
+                        timeout=timeout,
+                        output=stdout_file)
+                result, stdout = self.get_command_output(file=stdout_file,
+                                                         result=result)
+                if stdout is None:
+                    # Transmit the large output in chunks
+                    results['output'] = self.do_post_command_chunks(
+                        command_id=command_id,
+                        file=stdout_file,
+                        result=result,
+                        stderr=stderr,
+                        exit_status=status)
             except subprocess.TimeoutExpired:
-                status = -1
+                status = self.save_command_timeout(results=results)
                 stdout = None
+                result = None
                 stderr = None
-                results['output'] = {STATUS_FIELD: STATUS_ERROR,
-                                     MESSAGE_FIELD: 'timeout'}
-            # Remove the temporary file
-            try:
-                os.remove(path=temp_file_source)
-            except FileNotFoundError:
-                # File was already removed
-                pass
-            # Transmit command results
-            if stdout is not None:
-                url = self.build_url(section=SECTION_ENDPOINTS,
-                                     option=ACTION_COMMAND_POST,
-                                     extra=f'{command_id}/')
-                data = {'output': self.encryptor.encrypt(text=stdout),
-                        'result': self.encryptor.encrypt(text=stderr)}
-                post_results = self.do_api_request(method=METHOD_POST,
-                                                   url=url,
-                                                   headers=headers,
-                                                   data=data)
-                # Save results
-                results['stdout'] = stdout
-                results['stderr'] = stderr
-                results['output'] = post_results
-        else:
-            # Invalid command
-            status = 1
+        # Transmit command results (the chunked outputs were already sent)
+        if result is not None:
+            if upload and stdout is not None:
+                url, data = self.get_command_post_request(
+                    command_id=command_id,
+                    data={'output': stdout,
+                          'result': result,
+                          'diagnostics': stderr},
+                    exit_status=status)
+                token = self.decrypt_option(section=SECTION_HOST,
+                                            option=OPTION_TOKEN)
+                headers = {'Authorization': f'Token {token}'}
+                results['output'] = self.do_api_request(method=METHOD_POST,
+                                                        url=url,
+                                                        headers=headers,
+                                                        data=data)
+            self.save_command_results(results=results,
+                                      stdout=stdout,
+                                      stderr=stderr,
+                                      result=result,
+                                      exit_status=status,
+                                      variables=variables)
         return status, results
 
+    def prepare_command(self,
+                        command: dict,
+                        decryptor: FernetEncrypt,
+                        variables: dict = None) -> tuple[str, dict, dict]:
+        """
+        Decrypt a received command and its settings and variables
+
+        :param command: encrypted command data
+        :param decryptor: FernetEncrypt object to decrypt the command
+        :param variables: dictionary with the variables values saved by the
+                          previous commands
+        :return: tuple with the command source code, settings and variables
+        """
+        settings = decryptor.decrypt_many(items=command['settings'])
+        items = decryptor.decrypt_many(items=command['variables'])
+        if variables:
+            # Replace the values saved by the previous commands
+            items.update({key: variables[key]
+                          for key in items
+                          if key in variables})
+        source = self.decrypt_field(results=command,
+                                    field='command',
+                                    decryptor=decryptor)
+        return source, settings, items
+
+    def is_output_chunked(self, file: typing.BinaryIO) -> bool:
+        """
+        Check if a command output must be transmitted in chunks
+
+        :param file: file object with the command output
+        :return: True if the output is larger than the chunks size and the
+                 server accepts the chunks
+        """
+        return bool(0 < self.options.chunk_size <
+                    os.fstat(file.fileno()).st_size and
+                    self.settings.get_value(
+                        section=SECTION_ENDPOINTS,
+                        option=ACTION_COMMAND_POST_CHUNK))
+
+    def get_command_output(
+            self,
+            file: typing.BinaryIO,
+            result: str) -> tuple[str, typing.Optional[str]]:
+        """
+        Get the result and the output of an executed command
+
+        :param file: file object with the command output
+        :param result: command result transmitted by the command
+        :return: tuple with the command result and the command output or None
+                 if the output must be transmitted in chunks
+        """
+        # The commands terminated before transmitting __RESULT__ have no
+        # results
+        result = result or '[]'
+        file.seek(0)
+        if self.is_output_chunked(file=file):
+            return result, None
+        return result, file.read().decode('utf-8')
+
+    # noinspection PyMethodMayBeStatic
+    def save_command_timeout(self, results: dict) -> int:
+        """
+        Save the error for a command terminated after its timeout
+
+        :param results: command data to update with the error
+        :return: command exit status
+        """
+        results['output'] = {STATUS_FIELD: STATUS_ERROR,
+                             MESSAGE_FIELD: 'timeout'}
+        return -1
+
+    def get_command_post_request(
+            self,
+            command_id: int,
+            data: dict[str, str],
+            exit_status: int,
+            upload: typing.Optional[str] = None) -> tuple[str, dict]:
+        """
+        Get the URL and the encrypted data to transmit a command result
+
+        :param command_id: executed command ID
+        :param data: dictionary with the fields to encrypt
+        :param exit_status: command exit status
+        :param upload: upload ID of the output transmitted in chunks
+        :return: tuple with the URL and the data to transmit
+        """
+        url = self.build_url(section=SECTION_ENDPOINTS,
+                             option=ACTION_COMMAND_POST,
+                             extra=f'{command_id}/')
+        data = self.encrypt_output(data=data)
+        data[EXIT_STATUS_FIELD] = exit_status
+        if upload:
+            data[UPLOAD_FIELD] = upload
+        return url, data
+
+    # noinspection PyMethodMayBeStatic
+    def save_command_results(self,
+                             results: dict,
+                             stdout: typing.Optional[str],
+                             stderr: str,
+                             result: str,
+                             exit_status: int,
+                             variables: typing.Optional[dict]) -> None:
+        """
+        Save the results of an executed command
+
+        :param results: command data to update with the results
+        :param stdout: command output or None if it was transmitted in chunks
+        :param stderr: command standard error
+        :param result: command result
+        :param exit_status: command exit status
+        :param variables: dictionary with the variables values to update for
+                          the next commands
+        :return: None
+        """
+        results['stdout'] = stdout
+        results['stderr'] = stderr
+        results['result'] = result
+        results[EXIT_STATUS_FIELD] = exit_status
+        if variables is not None:
+            # Save the results in the variables for the next commands
+            try:
+                command_result = json.loads(s=result)
+            except ValueError:
+                command_result = []
+            for key, order in results.get(OUTPUT_VARIABLES_FIELD,
+                                          {}).items():
+                variables[key] = (str(command_result[order])
+                                  if len(command_result) > order
+                                  else '')
+
+    # noinspection PyMethodMayBeStatic
+    def do_execute_process(self,
+                           source: str,
+                           settings: dict,
+                           variables: dict,
+                           timeout: typing.Optional[float],
+                           output: typing.BinaryIO) -> tuple[int, str, str]:
+        """
+        Execute a command source code in a new Python process
+
+        :param source: command source code
+        :param settings: command settings for __SETTINGS__
+        :param variables: command variables for __VARIABLES__
+        :param timeout: timeout in seconds for the command
+        :param output: file object to write the command output
+        :return: tuple with the exit status, the command result and the
+                 command standard error
+        :raise subprocess.TimeoutExpired: if the command times out
+        """
+        channel, program = self.prepare_process(source=source,
+                                                settings=settings,
+                                                variables=variables)
+        with tempfile.TemporaryFile() as stderr_file:
+            args, arguments = self.get_process_arguments(channel=channel,
+                                                         output=output,
+                                                         stderr=stderr_file)
+            try:
+                process = subprocess.Popen(args=args,
+                                           **arguments)
+            except Exception:
+                # The process was not started, the channel is not used
+                channel.close()
+                raise
+            channel.start()
+            try:
+                process.communicate(input=program,
+                                    timeout=timeout)
+            except subprocess.TimeoutExpired:
+                # Terminate the process to close the channel
+                process.kill()
+                process.wait()
+                raise
+            finally:
+                result = channel.read()
+            stderr = self.get_process_stderr(file=stderr_file)
+        return process.returncode, result, stderr
+
+    def prepare_process(self,
+                        source: str,
+                        settings: dict,
+                        variables: dict) -> tuple[ResultChannel, bytes]:
+        """
+        Open the channel to receive the result and get the program to
+        execute a command source code in a new Python process
+
+        :param source: command source code
+        :param settings: command settings for __SETTINGS__
+        :param variables: command variables for __VARIABLES__
+        :return: tuple with the ResultChannel object and the program to
+                 pass from the standard input
+        """
+        channel = ResultChannel()
+        program = self.get_program(source=source,
+                                   settings=settings,
+                                   variables=variables,
+                                   channel=channel)
+        return channel, program.encode('utf-8')
+
+    # noinspection PyMethodMayBeStatic
+    def get_process_arguments(
+            self,
+            channel: ResultChannel,
+            output: typing.BinaryIO,
+            stderr: typing.BinaryIO) -> tuple[list[str], dict]:
+        """
+        Get the arguments to start the Python process
+
+        The source code is passed from the standard input to avoid saving the
+        decrypted command in a file or showing it in the command line.
+        The standard error is saved in a file, as any background process
+        started by the command would keep a pipe open.
+
+        :param channel: ResultChannel object to transmit the result
+        :param output: file object to write the command output
+        :param stderr: file object to write the command standard error
+        :return: tuple with the command line and the process arguments
+        """
+        return ['python', '-'], {'stdin': subprocess.PIPE,
+                                 'stdout': output,
+                                 'stderr': stderr,
+                                 **channel.get_popen_arguments()}
+
+    # noinspection PyMethodMayBeStatic
+    def get_process_stderr(self, file: typing.BinaryIO) -> str:
+        """
+        Get the standard error saved by the process
+
+        :param file: file object with the command standard error
+        :return: command standard error
+        """
+        file.seek(0)
+        return file.read().decode('utf-8')
+
+    # noinspection PyMethodMayBeStatic
+    def get_program(self,
+                    source: str,
+                    settings: dict,
+                    variables: dict,
+                    channel: ResultChannel) -> str:
+        """
+        Get the program to execute a command source code in a new Python
+        process
+
+        :param source: command source code
+        :param settings: command settings for __SETTINGS__
+        :param variables: command variables for __VARIABLES__
+        :param channel: ResultChannel object to transmit the result
+        :return: Python source code
+        """
+        # Initialize modules path
+        remotes_path = pathlib.Path(remotes.__path__[0])
+        return ('import sys\n'
+                f'sys.path.append(r"{remotes_path.parent}")\n'
+                # Keep the channel in this process only
+                f'{channel.get_setup_source()}'
+                # Initialize __RESULT__ variable
+                '__RESULT__ = ""\n'
+                # Save settings
+                f'__SETTINGS__ = {settings}\n'
+                # Save variables
+                f'__VARIABLES__ = {variables}\n'
+                '\n'
+                # Write command
+                f'{source}'
+                # Transmit __RESULT__ in JSON format using the channel
+                '\n'
+                '\n'
+                f'{channel.get_source()}')
+
+    # noinspection PyMethodMayBeStatic
+    def decrypt_field(self,
+                      results: dict,
+                      field: str,
+                      decryptor: FernetEncrypt) -> str:
+        """
+        Decrypt a received field, decompressing it if the server compressed
+        it before the encryption
+
+        :param results: received data
+        :param field: field name to decrypt
+        :param decryptor: FernetEncrypt object to decrypt the field
+        :return: decrypted field value
+        """
+        if field in results.get(COMPRESSED_FIELD, []):
+            return decompress(
+                data=decryptor.decrypt_bytes(text=results[field]),
+                compression=results[COMPRESSION_FIELD]).decode('utf-8')
+        return decryptor.decrypt(text=results[field])
+
+    def encrypt_output(self, data: dict[str, str]) -> dict:
+        """
+        Encrypt the command output and result to transmit them, compressing
+        them before the encryption if they are large and the server supports
+        a compression algorithm
+
+        :param data: dictionary with the fields to encrypt
+        :return: dictionary with the data to transmit
+        """
+        compression = None
+        if sum(map(len, data.values())) >= COMPRESSION_MIN_SIZE:
+            # Find the first compression supported by the server
+            compressions = (self.settings.get_value(
+                section=SECTION_SERVER,
+                option=OPTION_COMPRESSION) or '').split(',')
+            compression = next((item
+                                for item in get_compressions()
+                                if item in compressions), None)
+        if compression:
+            results = {key: self.encryptor.encrypt_bytes(
+                           data=compress(data=value.encode('utf-8'),
+                                         compression=compression))
+                       for key, value in data.items()}
+            results[COMPRESSION_FIELD] = compression
+            return results
+        return {key: self.encryptor.encrypt(text=value)
+                for key, value in data.items()}
+
+    def do_post_command_chunks(self,
+                               command_id: int,
+                               file: typing.BinaryIO,
+                               result: str,
+                               stderr: str,
+                               exit_status: int) -> dict:
+        """
+        Transmit a large command output in chunks and then its result
+
+        :param command_id: executed command ID
+        :param file: file object with the command output
+        :param result: command result
+        :param stderr: command standard error
+        :param exit_status: command exit status
+        :return: resulting data response
+        """
+        token = self.decrypt_option(section=SECTION_HOST,
+                                    option=OPTION_TOKEN)
+        headers = {'Authorization': f'Token {token}'}
+        chunks = self.get_command_chunks_requests(command_id=command_id,
+                                                  file=file,
+                                                  result=result,
+                                                  stderr=stderr,
+                                                  exit_status=exit_status)
+        try:
+            url, data = next(chunks)
+            while True:
+                url, data = chunks.send(self.do_api_request(method=METHOD_POST,
+                                                            url=url,
+                                                            headers=headers,
+                                                            data=data))
+        except StopIteration as stop:
+            return stop.value
+
+    def get_command_chunks_requests(
+            self,
+            command_id: int,
+            file: typing.BinaryIO,
+            result: str,
+            stderr: str,
+            exit_status: int
+    ) -> typing.Generator[tuple[str, dict], dict, dict]:
+        """
+        Get the requests to transmit a large command output in chunks and
+        then its result
+
+        Each request is a tuple with the URL and the data to transmit, whose
+        response must be sent back to the generator.
+
+        :param command_id: executed command ID
+        :param file: file object with the command output
+        :param result: command result
+        :param stderr: command standard error
+        :param exit_status: command exit status
+        :return: generator of the requests returning the last response
+        """
+        url = self.build_url(section=SECTION_ENDPOINTS,
+                             option=ACTION_COMMAND_POST_CHUNK,
+                             extra=f'{command_id}/')
+        results = {}
+        upload = None
+        # Read the output as text, without splitting any character
+        reader = io.TextIOWrapper(file, encoding='utf-8')
+        while chunk := reader.read(self.options.chunk_size):
+            data = self.encrypt_output(data={'output': chunk})
+            if upload:
+                data[UPLOAD_FIELD] = upload
+            results = yield url, data
+            upload = results.get(RESULTS_FIELD, {}).get(UPLOAD_FIELD, upload)
+            if results.get(STATUS_FIELD) != STATUS_OK:
+                # The server refused the chunk, the output will be truncated
+                break
+        if not upload:
+            # The upload was never started
+            return results
+        # Complete the upload transmitting the command result
+        return (yield self.get_command_post_request(
+            command_id=command_id,
+            data={'result': result,
+                  'diagnostics': stderr},
+            exit_status=exit_status,
+            upload=upload))
+
+    def do_post_commands_batch(self,
+                               commands: list[dict]) -> tuple[int, dict]:
+        """
+        Transmit the results of every executed command in a single request
+
+        :param commands: list of executed commands with their results
+        :return: tuple with the status and the resulting data
+        """
+        url = self.build_url(section=SECTION_ENDPOINTS,
+                             option=ACTION_COMMANDS_POST_BATCH)
+        token = self.decrypt_option(section=SECTION_HOST,
+                                    option=OPTION_TOKEN)
+        headers = {'Authorization': f'Token {token}'}
+        results = self.do_api_request(
+            method=METHOD_POST,
+            url=url,
+            headers=headers,
+            data=self.get_commands_batch_data(commands=commands))
+        self.save_commands_batch_results(commands=commands,
+                                         results=results)
+        return 0, results
+
+    def get_commands_batch_data(self, commands: list[dict]) -> dict:
+        """
+        Encrypt the results of every executed command to transmit them in a
+        single request
+
+        :param commands: list of executed commands with their results
+        :return: dictionary with the data to transmit
+        """
+        return {RESULTS_FIELD: [
+            {ID_FIELD: command['id'],
+             EXIT_STATUS_FIELD: command[EXIT_STATUS_FIELD],
+             **self.encrypt_output(data={'output': command['stdout'],
+                                         'result': command['result'],
+                                         'diagnostics': command['stderr']})}
+            for command in commands]}
+
+    # noinspection PyMethodMayBeStatic
+    def save_commands_batch_results(self,
+                                    commands: list[dict],
+                                    results: dict) -> None:
+        """
+        Save the results for each command like a single command upload
+
+        :param commands: list of executed commands with their results
+        :param results: resulting data response for the whole batch
+        :return: None
+        """
+        if results.get(STATUS_FIELD) != STATUS_OK:
+            # The whole batch was refused
+            for command in commands:
+                command['output'] = results
+            return
+        # Each item reports its own status (older servers report the ID only)
+        for command, item in zip(commands, results.get(RESULTS_FIELD, [])):
+            command['output'] = (
+                {STATUS_FIELD: STATUS_OK,
+                 RESULTS_FIELD: {ID_FIELD: command['id']}}
+                if item.get(STATUS_FIELD, STATUS_OK) == STATUS_OK
+                else {STATUS_FIELD: item[STATUS_FIELD],
+                      MESSAGE_FIELD: item.get(MESSAGE_FIELD)})
+
+    def get_batch_decryptor(
+            self,
+            results: dict,
+            session: typing.Optional[dict]
+    ) -> tuple[typing.Optional[FernetEncrypt], bool]:
+        """
+        Get the FernetEncrypt object to decrypt every command received from
+        the batch and check if their results are transmitted in a single
+        request
+
+        :param results: received data
+        :param session: dictionary with the session data used in the request
+        :return: tuple with the FernetEncrypt object or None if the commands
+                 must be requested individually and True if the results are
+                 transmitted in a single request
+        """
+        if not (results.get(ENCRYPTION_KEY_FIELD) or
+                results.get(SESSION_FIELD)):
+            # The server listed the commands only
+            return None, False
+        # Transmit every result in a single request if available
+        return (self.get_decryptor(results=results,
+                                   session=session),
+                bool(self.settings.get_value(
+                    section=SECTION_ENDPOINTS,
+                    option=ACTION_COMMANDS_POST_BATCH)))
+
+    # noinspection PyMethodMayBeStatic
+    def get_command_id(self, command: dict, batch: bool) -> int:
+        """
+        Get the ID of a command to process
+
+        :param command: command data from the list or from the batch
+        :param batch: True if the command was received from the batch
+        :return: command ID
+        """
+        return command[ID_FIELD if batch else COMMAND_FIELD]
+
+    # noinspection PyMethodMayBeStatic
+    def save_command_elapsed(self, results: dict, start_time: float) -> None:
+        """
+        Save the elapsed time to process a command
+
+        :param results: command data to update with the elapsed time
+        :param start_time: monotonic time when the command processing started
+        :return: None
+        """
+        results[ELAPSED_FIELD] = round(time.monotonic() - start_time, 3)
+
+    # noinspection PyMethodMayBeStatic
+    def get_commands_to_upload(self, commands_results: dict) -> list[dict]:
+        """
+        Get the executed commands whose results must be transmitted in a
+        single request
+
+        :param commands_results: dictionary with the results of each command
+        :return: list of executed commands with their results
+        """
+        return [command
+                for command in commands_results.values()
+                if command.get('stdout') is not None]
+
     def do_process_commands(self) -> tuple[int, dict]:
         """
         Execute every command in list
 
+        The commands in the sequential groups are executed in order while the
+        other commands are executed concurrently, using up to `workers`
+        threads.
+        If the server supports the commands batch every command is received
+        in a single request, else each command is requested individually.
+
         :return: tuple with the status and the resulting data
         """
-        status, results = self.do_list_commands()
+        def process_queue(commands: list[dict]) -> None:
+            """
+            Execute the commands in the queue one after another
+
+            :param commands: list of commands to execute
+            :return: None
+            """
+            for command in commands:
+                start_time = time.monotonic()
+                command_id = self.get_command_id(command=command,
+                                                 batch=bool(decryptor))
+                if decryptor:
+                    # The command was already received from the batch
+                    _, commands_results[command_id] = self.do_execute_command(
+                        command=command,
+                        decryptor=decryptor,
+                        variables=variables,
+                        upload=not upload_batch)
+                else:
+                    _, commands_results[command_id] = self.do_get_command(
+                        command_id=command_id)
+                self.save_command_elapsed(results=commands_results[command_id],
+                                          start_time=start_time)
+
+        decryptor = None
+        upload_batch = False
+        # Variables values saved by the commands received from the batch
+        variables = {}
+        if self.settings.get_value(section=SECTION_ENDPOINTS,
+                                   option=ACTION_COMMANDS_BATCH):
+            status, results = self.do_get_commands_batch()
+            # Get the symmetric key used to decrypt every command
+            decryptor, upload_batch = self.get_batch_decryptor(
+                results=results,
+                session=self.session)
+        else:
+            status, results = self.do_list_commands()
         commands_results = {}
         results[COMMANDS_RESULTS_FIELD] = commands_results
-        for command in results[RESULTS_FIELD]:
-            # Process each command
-            command_id = command[COMMAND_FIELD]
-            _, commands_results[command_id] = self.do_get_command(
-                command_id=command_id)
+        queues = self.get_commands_queues(commands=results[RESULTS_FIELD])
+        if self.options.workers > 1:
+            # Process each queue concurrently
+            with concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.options.workers) as executor:
+                # Consume the results to raise any exception
+                list(executor.map(process_queue, queues))
+        else:
+            for queue in queues:
+                process_queue(commands=queue)
+        if upload_batch:
+            # Transmit the results of the executed commands
+            commands = self.get_commands_to_upload(
+                commands_results=commands_results)
+            if commands:
+                self.do_post_commands_batch(commands=commands)
         return status, results
 
+    # noinspection PyMethodMayBeStatic
+    def get_commands_queues(self, commands: list[dict]) -> list[list[dict]]:
+        """
+        Split the commands in queues, the commands in the sequential groups
+        share the same queue (older servers have sequential groups only)
+
+        :param commands: list of commands to process
+        :return: list of queues with the commands to execute in order
+        """
+        queues = []
+        groups_queues = {}
+        for command in commands:
+            if command.get(SEQUENTIAL_FIELD, True):
+                if command[GROUP_FIELD] not in groups_queues:
+                    groups_queues[command[GROUP_FIELD]] = []
+                    queues.append(groups_queues[command[GROUP_FIELD]])
+                groups_queues[command[GROUP_FIELD]].append(command)
+            else:
+                queues.append([command])
+        return queues
+
     def do_monitor_commands(self, interval: int) -> tuple[int, None]:
         """
         Monitor pending commands
 
+        When the server offers the commands wait endpoint the client awaits
+        the new commands from the server, up to `interval` seconds, instead
+        of polling the server every `interval` seconds.
+
         :param interval: interval in seconds to watch for commands to process
         :return: None
         """
+        def wait_process_commands() -> bool:
+            """
+            Await new commands and process them, always returning True in
+            order to continue with monitoring for new commands
+
+            :return: True
+            """
+            nonlocal processed
+            start_time = time.monotonic()
+            try:
+                # The commands processed before and still pending are
+                # processed again only after the interval
+                _, results = self.do_wait_commands(timeout=interval,
+                                                   exclude=processed)
+                commands = self.get_waited_commands(results=results)
+                if not commands - processed:
+                    # No new commands (the server could not hold the
+                    # request), await the interval before processing again
+                    time.sleep(self.get_remaining_interval(
+                        start_time=start_time,
+                        interval=interval))
+                if commands:
+                    self.do_process_commands()
+                processed = commands
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout):
+                # Ignore connection errors during monitoring
+                time.sleep(self.get_remaining_interval(start_time=start_time,
+                                                       interval=interval))
+            return True
+
         def monitor_process_commands() -> bool:
             """
             Process commands and always return True in order to continue with
@@ -557,23 +1497,69 @@ class Client(object):
             """
             try:
                 self.do_process_commands()
-            except requests.exceptions.ConnectionError:
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout):
                 # Ignore connection errors during monitoring
                 pass
             return True
 
+        # Pending commands returned by the last wait
+        processed = set()
         recurring = RecurringJob()
-        recurring.add_job(delay=interval,
-                          action=monitor_process_commands)
+        if self.settings.get_value(section=SECTION_ENDPOINTS,
+                                   option=ACTION_COMMANDS_WAIT):
+            recurring.add_job(delay=0,
+                              action=wait_process_commands)
+        else:
+            recurring.add_job(delay=interval,
+                              action=monitor_process_commands)
         recurring.run()
         return 0, None
 
+    # noinspection PyMethodMayBeStatic
+    def get_waited_commands(self, results: dict) -> set[int]:
+        """
+        Get the pending commands IDs returned by the commands wait
+
+        :param results: received data
+        :return: set with the pending commands IDs
+        """
+        return {command[COMMAND_FIELD]
+                for command in results[RESULTS_FIELD]}
+
+    # noinspection PyMethodMayBeStatic
+    def get_remaining_interval(self,
+                               start_time: float,
+                               interval: int) -> float:
+        """
+        Get the seconds to await before the next monitoring iteration
+
+        :param start_time: monotonic time when the iteration started
+        :param interval: interval in seconds between the iterations
+        :return: remaining seconds of the interval
+        """
+        return max(start_time + interval - time.monotonic(), 0)
+
     def load(self) -> None:
         """
         Load settings
 
         :return: None
         """
+        # Initialize the API transport shared by every request
+        self.api = Api(pool_size=max(self.options.pool_size,
+                                     self.options.workers),
+                       retries=self.options.retries,
+                       backoff=self.options.backoff,
+                       timeout=self.options.timeout)
+        if (self.options.executor == EXECUTOR_POOL and
+                self.options.action in (ACTION_COMMAND_GET,
+                                        ACTION_COMMANDS_MONITOR,
+                                        ACTION_COMMANDS_PROCESS)):
+            # Start the persistent processes to execute the commands
+            self.worker_pool = WorkerPool(
+                size=max(self.options.workers, 1),
+                max_jobs=self.options.executor_max_jobs)
         self.settings = Settings()
         if self.options.settings:
             self.settings.load(self.options.settings)
@@ -604,6 +1590,12 @@ class Client(object):
         """
         if self.options.settings:
             self.settings.save(self.options.settings)
+        # Close the API connections
+        if self.api:
+            self.api.close()
+        # Stop the persistent processes
+        if self.worker_pool:
+            self.worker_pool.close()
 
     def build_url(self, section: str, option: str, extra: str = None) -> str:
         """
@@ -629,12 +1621,16 @@ class Client(object):
         """
         if encrypted_data := self.settings.get_value(section=section,
                                                      option=option):
-            try:
-                results = self.key.decrypt(text=encrypted_data,
-                                           use_base64=True)
-            except ValueError:
-                # Invalid encrypted data
-                results = None
+            # Decrypt each value only once using the private key
+            if encrypted_data not in self.decrypted_options:
+                try:
+                    self.decrypted_options[encrypted_data] = self.key.decrypt(
+                        text=encrypted_data,
+                        use_base64=True)
+                except ValueError:
+                    # Invalid encrypted data
+                    self.decrypted_options[encrypted_data] = None
+            results = self.decrypted_options[encrypted_data]
         else:
             results = None
         return results
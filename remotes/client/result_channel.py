@@ -0,0 +1,193 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import asyncio
+import os
+import struct
+import subprocess
+import sys
+import threading
+
+
+# Header with the size of each message
+HEADER = struct.Struct('>Q')
+# Seconds to await the pipe closing after the child process exited, as any
+# background process started by the command may still keep it open
+CHANNEL_TIMEOUT = 5
+
+
+class ResultChannel(object):
+    def __init__(self):
+        """
+        Pipe used by a child process to transmit the command result,
+        separated from its standard output and error
+
+        Every message is a JSON value prefixed by its size
+        """
+        self.reader, self.writer = os.pipe()
+        if sys.platform == 'win32':
+            import msvcrt
+            # Allow the child process to inherit the pipe handle
+            self.handle = msvcrt.get_osfhandle(self.writer)
+            os.set_handle_inheritable(self.handle, True)
+        else:
+            self.handle = self.writer
+        self.data = []
+        self.thread = threading.Thread(target=self.receive,
+                                       daemon=True)
+
+    def get_popen_arguments(self) -> dict:
+        """
+        Get the arguments for subprocess.Popen to pass the pipe to the child
+        process
+
+        :return: dictionary with the Popen arguments
+        """
+        if sys.platform == 'win32':
+            return {'startupinfo': subprocess.STARTUPINFO(
+                        lpAttributeList={'handle_list': [self.handle]}),
+                    'close_fds': True}
+        return {'pass_fds': (self.writer, )}
+
+    def get_setup_source(self) -> str:
+        """
+        Get the source code to prevent the processes started by the child
+        process from inheriting the pipe
+
+        :return: Python source code
+        """
+        if sys.platform == 'win32':
+            return ('import os\n'
+                    f'os.set_handle_inheritable({self.handle}, False)\n')
+        return ('import os\n'
+                f'os.set_inheritable({self.handle}, False)\n')
+
+    def get_source(self) -> str:
+        """
+        Get the source code to transmit __RESULT__ from the child process
+
+        :return: Python source code
+        """
+        return ('import json\n'
+                'import os\n'
+                'import struct\n'
+                'import sys\n'
+                'if not isinstance(__RESULT__, list):\n'
+                '    __RESULT__ = [__RESULT__]\n'
+                f'__CHANNEL__ = {self.handle}\n'
+                'if sys.platform == "win32":\n'
+                '    import msvcrt\n'
+                '    __CHANNEL__ = msvcrt.open_osfhandle(__CHANNEL__,\n'
+                '                                        os.O_WRONLY)\n'
+                'with os.fdopen(__CHANNEL__, "wb") as __CHANNEL__:\n'
+                '    __DATA__ = json.dumps(obj=__RESULT__,\n'
+                '                          separators=(",", ":"))\n'
+                '    __DATA__ = __DATA__.encode("utf-8")\n'
+                f'    __CHANNEL__.write(struct.pack("{HEADER.format}",\n'
+                '                                  len(__DATA__)))\n'
+                '    __CHANNEL__.write(__DATA__)\n')
+
+    def start(self) -> None:
+        """
+        Start receiving the data after the child process was started
+
+        :return: None
+        """
+        # Only the child process must keep the pipe open for writing
+        os.close(self.writer)
+        self.thread.start()
+
+    def close(self) -> None:
+        """
+        Close both the pipe ends if the child process could not be started
+
+        :return: None
+        """
+        os.close(self.reader)
+        os.close(self.writer)
+
+    def receive(self) -> None:
+        """
+        Receive every data until the pipe is closed
+
+        :return: None
+        """
+        with os.fdopen(self.reader, 'rb') as file:
+            while data := file.read1(65536):
+                self.data.append(data)
+
+    def read(self, timeout: float = CHANNEL_TIMEOUT) -> str:
+        """
+        Await the pipe to be closed after the child process exited and get
+        the transmitted result
+
+        :param timeout: maximum seconds to await the pipe closing
+        :return: the last JSON message or an empty string if the child
+                 process transmitted no messages
+        """
+        self.thread.join(timeout=timeout)
+        return self.get_result()
+
+    async def read_async(self) -> str:
+        """
+        Receive every data until the pipe is closed from the running event
+        loop and get the transmitted result
+
+        :return: the last JSON message or an empty string if the child
+                 process transmitted no messages
+        """
+        # Only the child process must keep the pipe open for writing
+        os.close(self.writer)
+        if sys.platform == 'win32':
+            # The event loop cannot read the anonymous pipes on Windows
+            await asyncio.to_thread(self.receive)
+            return self.get_result()
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        transport, _ = await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader),
+            os.fdopen(self.reader, 'rb'))
+        try:
+            # Keep the received data if the reading is cancelled
+            while data := await reader.read(65536):
+                self.data.append(data)
+        finally:
+            transport.close()
+        return self.get_result()
+
+    def get_result(self) -> str:
+        """
+        Get the last message from the received data
+
+        :return: the last JSON message or an empty string if the child
+                 process transmitted no messages
+        """
+        data = b''.join(self.data)
+        result = b''
+        offset = 0
+        while offset + HEADER.size <= len(data):
+            size = HEADER.unpack_from(data, offset)[0]
+            offset += HEADER.size
+            if offset + size > len(data):
+                # Incomplete message
+                break
+            result = data[offset:offset + size]
+            offset += size
+        return result.decode('utf-8')
@@ -28,6 +28,7 @@ SECTION_ENDPOINTS = 'endpoints'
 SECTION_HOST = 'host'
 SECTION_SERVER = 'server'
 
+OPTION_COMPRESSION = 'compression'
 OPTION_PRIVATE_KEY = 'private_key'
 OPTION_PUBLIC_KEY = 'public_key'
 OPTION_TOKEN = 'token'
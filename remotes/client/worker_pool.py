@@ -0,0 +1,246 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import atexit
+import builtins
+import json
+import linecache
+import multiprocessing
+import multiprocessing.connection
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import traceback
+import typing
+
+
+# Size of each output chunk sent from the workers
+OUTPUT_CHUNK_SIZE = 1048576
+# File name used for the commands in the tracebacks
+SOURCE_FILENAME = '<command>'
+
+
+def execute_job(connection: multiprocessing.connection.Connection,
+                source: str,
+                settings: dict,
+                variables: dict) -> None:
+    """
+    Execute a command source code inside the worker process, sending its
+    output, its exit status, its result and its standard error to the
+    connection
+
+    :param connection: connection to the pool
+    :param source: command source code
+    :param settings: command settings for __SETTINGS__
+    :param variables: command variables for __VARIABLES__
+    :return: None
+    """
+    with tempfile.TemporaryFile() as stdout_file, \
+            tempfile.TemporaryFile() as stderr_file:
+        # Redirect the standard output and error file descriptors, to also
+        # capture the output of any child process
+        sys.stdout.flush()
+        sys.stderr.flush()
+        saved_fds = os.dup(1), os.dup(2)
+        os.dup2(stdout_file.fileno(), 1)
+        os.dup2(stderr_file.fileno(), 2)
+        namespace = {'__name__': '__main__',
+                     '__builtins__': builtins,
+                     '__RESULT__': '',
+                     '__SETTINGS__': settings,
+                     '__VARIABLES__': variables}
+        # Show the command source lines in the tracebacks
+        linecache.cache[SOURCE_FILENAME] = (len(source),
+                                            None,
+                                            source.splitlines(True),
+                                            SOURCE_FILENAME)
+        result = ''
+        try:
+            exec(compile(source, SOURCE_FILENAME, 'exec'), namespace)
+            # Convert __RESULT__ in list if it's not a list
+            if not isinstance(namespace['__RESULT__'], list):
+                namespace['__RESULT__'] = [namespace['__RESULT__']]
+            result = json.dumps(obj=namespace['__RESULT__'],
+                                separators=(',', ':'))
+            status = 0
+        except SystemExit as error:
+            # Emulate the exit status of the Python interpreter
+            if error.code is None or isinstance(error.code, int):
+                status = error.code or 0
+            else:
+                print(error.code, file=sys.stderr)
+                status = 1
+        except BaseException as error:
+            # Skip the worker frame from the traceback
+            traceback.print_exception(type(error),
+                                      error,
+                                      error.__traceback__.tb_next)
+            status = 1
+        finally:
+            # Restore the standard output and error file descriptors
+            sys.stdout.flush()
+            sys.stderr.flush()
+            for fd, saved_fd in enumerate(saved_fds, start=1):
+                os.dup2(saved_fd, fd)
+                os.close(saved_fd)
+        # Send the output in chunks
+        stdout_file.seek(0)
+        while chunk := stdout_file.read(OUTPUT_CHUNK_SIZE):
+            connection.send(chunk)
+        stderr_file.seek(0)
+        connection.send((status,
+                         result,
+                         stderr_file.read().decode('utf-8', 'replace')))
+
+
+def worker_main(connection: multiprocessing.connection.Connection,
+                paths: list[str]) -> None:
+    """
+    Execute every job received from the connection until the pool stops
+    the worker or the connection is closed
+
+    :param connection: connection to the pool
+    :param paths: modules paths to add
+    :return: None
+    """
+    sys.path.extend(paths)
+    while True:
+        try:
+            job = connection.recv()
+        except EOFError:
+            # The pool was closed
+            break
+        if job is None:
+            # The worker was stopped
+            break
+        execute_job(connection, *job)
+
+
+class Worker(object):
+    def __init__(self, context: multiprocessing.context.BaseContext):
+        """
+        Python process executing the commands
+
+        :param context: multiprocessing context to start the process
+        """
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(target=worker_main,
+                                       args=(child_connection,
+                                             sys.path[:]))
+        self.process.start()
+        child_connection.close()
+        self.jobs = 0
+
+    def stop(self, kill: bool = False) -> None:
+        """
+        Stop the worker process
+
+        :param kill: kill the process instead of stopping it gracefully
+        :return: None
+        """
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.connection.send(None)
+            except OSError:
+                # The process was already terminated
+                pass
+        self.process.join()
+        self.connection.close()
+
+
+class WorkerPool(object):
+    def __init__(self, size: int, max_jobs: int):
+        """
+        Persistent Python processes to execute the commands, avoiding the
+        interpreter startup for each command
+
+        :param size: number of processes to start
+        :param max_jobs: number of commands executed by each process before
+                         replacing it with a new process
+        """
+        self.context = multiprocessing.get_context('spawn')
+        self.max_jobs = max_jobs
+        self.lock = threading.Lock()
+        self.workers = [Worker(context=self.context) for _ in range(size)]
+        # Stop the workers before multiprocessing awaits them at exit
+        atexit.register(self.close)
+
+    def execute(self,
+                source: str,
+                settings: dict,
+                variables: dict,
+                timeout: typing.Optional[float],
+                output: typing.BinaryIO) -> tuple[int, str, str]:
+        """
+        Execute a command source code in a worker process
+
+        :param source: command source code
+        :param settings: command settings for __SETTINGS__
+        :param variables: command variables for __VARIABLES__
+        :param timeout: timeout in seconds for the command
+        :param output: file object to write the command output
+        :return: tuple with the exit status, the command result and the
+                 command standard error
+        :raise subprocess.TimeoutExpired: if the command times out
+        """
+        with self.lock:
+            worker = self.workers.pop() if self.workers else None
+        if worker is None:
+            worker = Worker(context=self.context)
+        worker.jobs += 1
+        worker.connection.send((source, settings, variables))
+        try:
+            if not worker.connection.poll(timeout):
+                # Kill the worker and replace it with a new one
+                worker.stop(kill=True)
+                worker = Worker(context=self.context)
+                raise subprocess.TimeoutExpired(cmd='worker',
+                                                timeout=timeout)
+            while isinstance(message := worker.connection.recv(), bytes):
+                output.write(message)
+            status, result, stderr = message
+        except EOFError:
+            # The worker process was terminated by the command
+            worker.stop(kill=True)
+            status, result, stderr = worker.process.exitcode, '', ''
+            worker = Worker(context=self.context)
+        finally:
+            if worker.jobs >= self.max_jobs:
+                # Replace the worker with a new one
+                worker.stop()
+                worker = Worker(context=self.context)
+            with self.lock:
+                self.workers.append(worker)
+        return status, result, stderr
+
+    def close(self) -> None:
+        """
+        Stop every worker process
+
+        :return: None
+        """
+        with self.lock:
+            workers, self.workers = self.workers, []
+        for worker in workers:
+            worker.stop()
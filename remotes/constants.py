@@ -26,6 +26,7 @@ MESSAGE_FIELD = 'message'
 STATUS_FIELD = 'status'
 STATUS_OK = 'OK'
 STATUS_ERROR = 'ERROR'
+STATUS_UNKNOWN = 'UNKNOWN'
 
 ENCRYPTED_FIELD = 'encrypted'
 ENDPOINTS_FIELD = 'endpoints'
@@ -46,6 +47,9 @@ USER_NAME_FIELD = 'user_name'
 HOSTS_GROUPS = 'hosts_groups'
 GROUP_FIELD = 'group'
 COMMAND_FIELD = 'command'
+SEQUENTIAL_FIELD = 'sequential'
+OUTPUT_VARIABLES_FIELD = 'output_variables'
+ELAPSED_FIELD = 'elapsed'
 COMMANDS_RESULTS_FIELD = 'commands_results'
 
 METHOD_GET = 'get'
@@ -54,6 +58,32 @@ METHOD_POST = 'post'
 APILOG_ENABLE_LOGGING = 'apilog_enable_logging'
 APILOG_FILTER_USERS = 'apilog_filter_users'
 APILOG_INCLUDE_ARGS = 'apilog_include_arguments'
+APILOG_RETENTION_DAYS = 'apilog_retention_days'
+
+HOST_SESSION_LIFETIME = 'host_session_lifetime'
+HOST_SESSION_MAX_MESSAGES = 'host_session_max_messages'
+SESSION_FIELD = 'session'
+LIFETIME_FIELD = 'lifetime'
+MAX_MESSAGES_FIELD = 'max_messages'
+SESSION_HEADER = 'X-Remotes-Session'
+COMPRESSION_FIELD = 'compression'
+COMPRESSED_FIELD = 'compressed'
+COMPRESSION_HEADER = 'X-Remotes-Compression'
+COMMANDS_OUTPUT_MAX_SIZE = 'commands_output_max_size'
+UPLOAD_FIELD = 'upload'
+SIZE_FIELD = 'size'
+EXIT_STATUS_FIELD = 'exit_status'
+COMMANDS_WAIT_TIMEOUT = 'commands_wait_timeout'
+TIMEOUT_FIELD = 'timeout'
+EXCLUDE_FIELD = 'exclude'
+
+API_LOG_WRITER = 'api_log_writer'
+SETTINGS_CACHE = 'settings_cache'
+TOKENS_CACHE = 'tokens_cache'
+PUBLIC_KEYS_CACHE = 'public_keys_cache'
+SESSIONS_CACHE = 'sessions_cache'
+COMMANDS_NOTIFIER = 'commands_notifier'
+COMMANDS_CACHE = 'commands_cache'
 
 ADMIN_SITE_HEADER = 'Django Remotes Server Administration'
 ADMIN_SITE_TITLE = ADMIN_SITE_HEADER
@@ -0,0 +1,71 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from utility.misc.create_benchmark_groups import create_benchmark_groups
+from utility.misc.get_pending_commands import get_pending_commands
+
+
+class Command(BaseCommand):
+    help = ('Measure the queries and the latency to resolve the pending '
+            'commands for a host with many commands groups')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--groups',
+                            type=int,
+                            nargs='+',
+                            default=[10, 100, 1000],
+                            help='Numbers of commands groups to measure')
+        parser.add_argument('--commands',
+                            type=int,
+                            default=2,
+                            help='Number of commands in each commands group')
+        parser.add_argument('--repeat',
+                            type=int,
+                            default=10,
+                            help='Number of measures for each groups number')
+
+    def handle(self, *args, **options) -> None:
+        """
+        Measure the pending commands resolution, the benchmark data are
+        always discarded at the end
+        """
+        for groups in options['groups']:
+            with transaction.atomic():
+                host = create_benchmark_groups(groups=groups,
+                                               commands=options['commands'])
+                timings = []
+                for _ in range(options['repeat']):
+                    with CaptureQueriesContext(connection) as queries:
+                        start_time = time.perf_counter()
+                        results = list(get_pending_commands(hosts=[host]))
+                        timings.append(time.perf_counter() - start_time)
+                print(f'{groups} groups: '
+                      f'{len(results)} pending commands, '
+                      f'{len(queries)} queries, '
+                      f'{statistics.median(timings) * 1000:.1f} ms')
+                # Discard the benchmark data
+                transaction.set_rollback(True)
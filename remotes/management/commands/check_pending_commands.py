@@ -0,0 +1,47 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import sys
+
+from django.core.management.base import BaseCommand
+
+from utility.misc.check_pending_commands import check_pending_commands
+
+
+class Command(BaseCommand):
+    help = 'Check the pending commands consistency'
+
+    def handle(self, *args, **options) -> None:
+        """
+        Check the pending commands consistency
+        """
+        missing, unexpected = check_pending_commands()
+        for item in sorted(missing):
+            print(f'Missing pending command: host {item[0]}, '
+                  f'command {item[1]}')
+        for item in sorted(unexpected):
+            print(f'Unexpected pending command: host {item[0]}, '
+                  f'command {item[1]}')
+        if missing or unexpected:
+            # Inconsistent pending commands
+            print('Pending commands are not consistent, use the '
+                  'rebuild_pending_commands command to rebuild them')
+            sys.exit(1)
+        print('Pending commands are consistent')
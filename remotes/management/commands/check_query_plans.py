@@ -0,0 +1,54 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import sys
+
+from django.core.management.base import BaseCommand
+
+from utility.misc.check_query_plans import check_query_plans
+
+
+class Command(BaseCommand):
+    help = 'Check the query plans for the hot queries'
+
+    def handle(self, *args, **options) -> None:
+        """
+        Check the query plans for the hot queries
+        """
+        failures = 0
+        for name, results in check_query_plans().items():
+            if results is None:
+                print(f'Query plan not checked: {name}, '
+                      f'only SQLite databases are supported')
+                continue
+            plan, scans = results
+            if options['verbosity'] > 1:
+                print(f'Query plan for {name}:')
+                for detail in plan:
+                    print(f'  {detail}')
+            for table in scans:
+                print(f'Full table scan: {name}, table {table}')
+            failures += len(scans)
+        if failures:
+            # Some queries read the whole tables
+            print('Query plans are not using the indexes, check the models '
+                  'indexes and their migrations')
+            sys.exit(1)
+        print('Query plans are using the indexes')
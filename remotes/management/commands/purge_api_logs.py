@@ -0,0 +1,103 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from remotes.constants import APILOG_RETENTION_DAYS
+
+from utility.misc.api_logs_archive import ApiLogsArchive
+from utility.misc.api_logs_databases import (API_LOGS_DATABASE,
+                                             api_logs_databases)
+from utility.misc.get_setting_value import get_setting_value
+from utility.misc.purge_api_logs import purge_api_logs
+
+
+class Command(BaseCommand):
+    help = 'Delete the Api logs older than the retention days'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days',
+                            type=int,
+                            help='Number of days to keep (default from the '
+                                 f'{APILOG_RETENTION_DAYS} setting)')
+        parser.add_argument('--chunk-size',
+                            type=int,
+                            default=1000,
+                            help='Number of Api logs deleted in each '
+                                 'transaction')
+        parser.add_argument('--pause',
+                            type=float,
+                            default=0,
+                            help='Seconds to wait between the chunks')
+        parser.add_argument('--archive',
+                            type=str,
+                            help='Directory to save the deleted Api logs as '
+                                 'compressed JSON Lines files')
+
+    def handle(self, *args, **options) -> None:
+        """
+        Delete the Api logs older than the retention days
+        """
+        days = options['days']
+        if days is None:
+            days = int(get_setting_value(name=APILOG_RETENTION_DAYS,
+                                         default_value='0'))
+        if days <= 0:
+            print('Api logs retention is disabled')
+            return
+        before = datetime.date.today() - datetime.timedelta(days=days)
+        archive = (ApiLogsArchive(directory=options['archive'])
+                   if options['archive']
+                   else None)
+        try:
+            results = purge_api_logs(database=API_LOGS_DATABASE,
+                                     before=before,
+                                     chunk_size=options['chunk_size'],
+                                     archive=archive,
+                                     pause=options['pause'])
+            # Check the rotated database files
+            for period, (first, last) in sorted(
+                    api_logs_databases.get_periods().items()):
+                alias = api_logs_databases.add_database(period=period)
+                if last <= before:
+                    # Delete the whole database file for an expired period
+                    if archive:
+                        results += purge_api_logs(
+                            database=alias,
+                            before=last,
+                            chunk_size=options['chunk_size'],
+                            archive=archive)
+                    connections[alias].close()
+                    api_logs_databases.get_filename(period=period).unlink()
+                    print(f'Deleted Api logs database for {period}')
+                else:
+                    results += purge_api_logs(
+                        database=alias,
+                        before=before,
+                        chunk_size=options['chunk_size'],
+                        archive=archive,
+                        pause=options['pause'])
+        finally:
+            if archive:
+                archive.close()
+        print(f'Deleted {results} Api logs older than {before}')
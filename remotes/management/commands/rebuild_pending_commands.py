@@ -0,0 +1,34 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+from django.core.management.base import BaseCommand
+
+from utility.misc.rebuild_pending_commands import rebuild_pending_commands
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the pending commands for every host'
+
+    def handle(self, *args, **options) -> None:
+        """
+        Rebuild the pending commands for every host
+        """
+        count = rebuild_pending_commands()
+        print(f'Pending commands rebuilt: {count}')
@@ -0,0 +1,72 @@
+# Generated by Django 4.0.3 on 2026-10-17 22:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def insert_values(apps, schema_editor):
+    """
+    Fill the pending commands for every host
+    """
+    # Don't import the models directly as they may be a newer
+    # version than this migration expects.
+    Command = apps.get_model('remotes', 'Command')
+    CommandsOutput = apps.get_model('remotes', 'CommandsOutput')
+    PendingCommand = apps.get_model('remotes', 'PendingCommand')
+    executed = CommandsOutput.objects.filter(
+        host_id=models.OuterRef('host_id'),
+        command_id=models.OuterRef('command_id'))
+    items = (Command.objects
+             .filter(is_active=True,
+                     group__is_active=True,
+                     group__hosts__is_active=True,
+                     group__hosts__hosts__isnull=False)
+             .annotate(host_id=models.F('group__hosts__hosts'),
+                       command_id=models.F('pk'),
+                       group_order=models.F('group__order'),
+                       command_order=models.F('order'),
+                       after=models.F('group__after'),
+                       before=models.F('group__before'))
+             .filter(~models.Exists(executed))
+             .values('host_id', 'command_id', 'group_id', 'group_order',
+                     'command_order', 'after', 'before'))
+    PendingCommand.objects.bulk_create([PendingCommand(**item)
+                                        for item in items])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('remotes', '0067_alter_command_variables'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingCommand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('group_order', models.PositiveIntegerField(verbose_name='group order')),
+                ('command_order', models.PositiveIntegerField(verbose_name='command order')),
+                ('after', models.DateTimeField(verbose_name='after')),
+                ('before', models.DateTimeField(verbose_name='before')),
+                ('command', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='remotes.command', verbose_name='command')),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='remotes.commandsgroup', verbose_name='group')),
+                ('host', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='remotes.host', verbose_name='host')),
+            ],
+            options={
+                'verbose_name': 'Pending command',
+                'verbose_name_plural': 'Pending commands',
+                'ordering': ['host', 'group_order', 'command_order'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='pendingcommand',
+            index=models.Index(fields=['host', 'group_order', 'command_order'], name='pending_command_host_order'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='pendingcommand',
+            unique_together={('host', 'command')},
+        ),
+        migrations.RunPython(code=insert_values,
+                             reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.0.3 on 2026-10-17 22:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('remotes', '0068_pending_command'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='commandsgroup',
+            name='is_sequential',
+            field=models.BooleanField(default=True, verbose_name='sequential'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.0.3 on 2026-10-17 22:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('remotes', '0069_commands_group_is_sequential'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HostSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uuid', models.UUIDField(unique=True, verbose_name='uuid')),
+                ('key', models.CharField(max_length=255, verbose_name='key')),
+                ('creation', models.DateTimeField(auto_now_add=True, verbose_name='creation')),
+                ('expiration', models.DateTimeField(verbose_name='expiration')),
+                ('host', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='remotes.host', verbose_name='host')),
+            ],
+            options={
+                'verbose_name': 'Host session',
+                'verbose_name_plural': 'Host sessions',
+                'ordering': ['host', '-creation'],
+            },
+        ),
+    ]
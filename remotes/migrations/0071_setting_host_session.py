@@ -0,0 +1,46 @@
+from django.db import migrations
+
+from remotes.constants import HOST_SESSION_LIFETIME, HOST_SESSION_MAX_MESSAGES
+
+
+def insert_values(apps, schema_editor):
+    """
+    Insert some default settings
+    """
+    # Don't import the Configuration model directly as it may be a newer
+    # version than this migration expects.
+    Setting = apps.get_model('remotes', 'Setting')
+    Setting.objects.create(name=HOST_SESSION_LIFETIME,
+                           description='Host session lifetime in seconds '
+                                       '(0 to disable the sessions)',
+                           value='3600',
+                           is_active=True)
+    Setting.objects.create(name=HOST_SESSION_MAX_MESSAGES,
+                           description='Maximum number of messages '
+                                       'encrypted with each host session',
+                           value='1000',
+                           is_active=True)
+
+
+def delete_values(apps, schema_editor):
+    """
+    Delete some default settings
+    """
+    # Don't import the Configuration model directly as it may be a newer
+    # version than this migration expects.
+    Setting = apps.get_model('remotes', 'Setting')
+    queryset = Setting.objects.filter(name__in=(HOST_SESSION_LIFETIME,
+                                                HOST_SESSION_MAX_MESSAGES))
+    queryset.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('remotes', '0070_host_session'),
+    ]
+
+    operations = [
+        migrations.RunPython(code=insert_values,
+                             reverse_code=delete_values)
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.0.3 on 2026-10-17 22:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('remotes', '0071_setting_host_session'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommandsOutputUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uuid', models.UUIDField(unique=True, verbose_name='uuid')),
+                ('output', models.TextField(blank=True, default='', verbose_name='output')),
+                ('size', models.PositiveBigIntegerField(default=0, verbose_name='size')),
+                ('creation', models.DateTimeField(auto_now_add=True, verbose_name='creation')),
+                ('command', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='remotes.command', verbose_name='command')),
+                ('host', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='remotes.host', verbose_name='host')),
+            ],
+            options={
+                'verbose_name': 'Commands output upload',
+                'verbose_name_plural': 'Commands outputs uploads',
+                'ordering': ['host', '-creation'],
+            },
+        ),
+    ]
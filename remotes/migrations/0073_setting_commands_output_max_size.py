@@ -0,0 +1,40 @@
+from django.db import migrations
+
+from remotes.constants import COMMANDS_OUTPUT_MAX_SIZE
+
+
+def insert_values(apps, schema_editor):
+    """
+    Insert some default settings
+    """
+    # Don't import the Configuration model directly as it may be a newer
+    # version than this migration expects.
+    Setting = apps.get_model('remotes', 'Setting')
+    Setting.objects.create(name=COMMANDS_OUTPUT_MAX_SIZE,
+                           description='Maximum size of each command output '
+                                       '(0 for unlimited size)',
+                           value='104857600',
+                           is_active=True)
+
+
+def delete_values(apps, schema_editor):
+    """
+    Delete some default settings
+    """
+    # Don't import the Configuration model directly as it may be a newer
+    # version than this migration expects.
+    Setting = apps.get_model('remotes', 'Setting')
+    queryset = Setting.objects.filter(name=COMMANDS_OUTPUT_MAX_SIZE)
+    queryset.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('remotes', '0072_commands_output_upload'),
+    ]
+
+    operations = [
+        migrations.RunPython(code=insert_values,
+                             reverse_code=delete_values)
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.0.3 on 2026-10-17 22:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('remotes', '0073_setting_commands_output_max_size'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='commandsoutput',
+            name='diagnostics',
+            field=models.TextField(blank=True, null=True, verbose_name='diagnostics'),
+        ),
+    ]
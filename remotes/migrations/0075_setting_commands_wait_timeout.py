@@ -0,0 +1,40 @@
+from django.db import migrations
+
+from remotes.constants import COMMANDS_WAIT_TIMEOUT
+
+
+def insert_values(apps, schema_editor):
+    """
+    Insert some default settings
+    """
+    # Don't import the Configuration model directly as it may be a newer
+    # version than this migration expects.
+    Setting = apps.get_model('remotes', 'Setting')
+    Setting.objects.create(name=COMMANDS_WAIT_TIMEOUT,
+                           description='Maximum seconds to hold the requests '
+                                       'awaiting new commands (0 to disable)',
+                           value='60',
+                           is_active=True)
+
+
+def delete_values(apps, schema_editor):
+    """
+    Delete some default settings
+    """
+    # Don't import the Configuration model directly as it may be a newer
+    # version than this migration expects.
+    Setting = apps.get_model('remotes', 'Setting')
+    queryset = Setting.objects.filter(name=COMMANDS_WAIT_TIMEOUT)
+    queryset.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('remotes', '0074_commands_output_diagnostics'),
+    ]
+
+    operations = [
+        migrations.RunPython(code=insert_values,
+                             reverse_code=delete_values)
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.0.3 on 2026-10-17 23:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('remotes', '0075_setting_commands_wait_timeout'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='host',
+            name='commands_version',
+            field=models.PositiveBigIntegerField(default=0, editable=False, verbose_name='commands version'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.0.3 on 2026-10-17 23:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('remotes', '0076_host_commands_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='command',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, verbose_name='modified'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.0.3 on 2026-10-17 23:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('remotes', '0077_command_modified'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='apilog',
+            index=models.Index(fields=['date', 'time'], name='api_log_date_time'),
+        ),
+        migrations.AddIndex(
+            model_name='command',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['group', 'order'], name='command_group_active_order'),
+        ),
+        migrations.AddIndex(
+            model_name='commandsgroup',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'after', 'before'], name='commands_group_active_order'),
+        ),
+        migrations.AddIndex(
+            model_name='commandsoutput',
+            index=models.Index(fields=['host', 'command'], name='commands_output_host_command'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.0.3 on 2026-10-17 23:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('remotes', '0078_hot_queries_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LastExecution',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timestamp', models.DateTimeField(null=True, verbose_name='timestamp')),
+                ('status', models.CharField(choices=[('OK', 'OK'), ('ERROR', 'ERROR')], max_length=16, verbose_name='status')),
+                ('command', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='remotes.command', verbose_name='command')),
+                ('host', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='remotes.host', verbose_name='host')),
+                ('output', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='remotes.commandsoutput', verbose_name='output')),
+            ],
+            options={
+                'verbose_name': 'Last execution',
+                'verbose_name_plural': 'Last executions',
+                'ordering': ['host', 'command'],
+                'unique_together': {('host', 'command')},
+            },
+        ),
+    ]
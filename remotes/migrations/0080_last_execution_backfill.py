@@ -0,0 +1,50 @@
+from django.db import migrations
+
+from remotes.constants import STATUS_ERROR, STATUS_OK
+
+
+def insert_values(apps, schema_editor):
+    """
+    Fill the last executions using the latest output for each host and
+    command
+    """
+    # Don't import the Configuration model directly as it may be a newer
+    # version than this migration expects.
+    CommandsOutput = apps.get_model('remotes', 'CommandsOutput')
+    LastExecution = apps.get_model('remotes', 'LastExecution')
+    executions = {}
+    for host_id, command_id, output_id, timestamp, diagnostics in (
+            CommandsOutput.objects.order_by('pk').values_list(
+                'host_id', 'command_id', 'pk', 'timestamp',
+                'diagnostics').iterator()):
+        # The later outputs replace the previous ones for the same command
+        executions[(host_id, command_id)] = LastExecution(
+            host_id=host_id,
+            command_id=command_id,
+            output_id=output_id,
+            timestamp=timestamp,
+            status=STATUS_ERROR if diagnostics else STATUS_OK)
+    LastExecution.objects.bulk_create(executions.values(),
+                                      batch_size=1000)
+
+
+def delete_values(apps, schema_editor):
+    """
+    Delete the last executions
+    """
+    # Don't import the Configuration model directly as it may be a newer
+    # version than this migration expects.
+    LastExecution = apps.get_model('remotes', 'LastExecution')
+    LastExecution.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('remotes', '0079_last_execution'),
+    ]
+
+    operations = [
+        migrations.RunPython(code=insert_values,
+                             reverse_code=delete_values)
+    ]
@@ -0,0 +1,41 @@
+from django.db import migrations
+
+from remotes.constants import APILOG_RETENTION_DAYS
+
+
+def insert_values(apps, schema_editor):
+    """
+    Insert some default settings
+    """
+    # Don't import the Configuration model directly as it may be a newer
+    # version than this migration expects.
+    Setting = apps.get_model('remotes', 'Setting')
+    Setting.objects.create(name=APILOG_RETENTION_DAYS,
+                           description='Number of days to keep the Api logs '
+                                       'before purging them (0 to keep them '
+                                       'forever)',
+                           value='0',
+                           is_active=True)
+
+
+def delete_values(apps, schema_editor):
+    """
+    Delete some default settings
+    """
+    # Don't import the Configuration model directly as it may be a newer
+    # version than this migration expects.
+    Setting = apps.get_model('remotes', 'Setting')
+    queryset = Setting.objects.filter(name=APILOG_RETENTION_DAYS)
+    queryset.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('remotes', '0080_last_execution_backfill'),
+    ]
+
+    operations = [
+        migrations.RunPython(code=insert_values,
+                             reverse_code=delete_values)
+    ]
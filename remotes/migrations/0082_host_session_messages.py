@@ -0,0 +1,18 @@
+# Generated by Django 4.0.3 on 2026-10-17 23:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('remotes', '0081_setting_apilog_retention_days'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hostsession',
+            name='messages',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='messages'),
+        ),
+    ]
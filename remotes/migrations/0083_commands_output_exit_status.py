@@ -0,0 +1,23 @@
+# Generated by Django 4.0.3 on 2026-10-17 23:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('remotes', '0082_host_session_messages'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='commandsoutput',
+            name='exit_status',
+            field=models.IntegerField(blank=True, null=True, verbose_name='exit status'),
+        ),
+        migrations.AlterField(
+            model_name='lastexecution',
+            name='status',
+            field=models.CharField(choices=[('OK', 'OK'), ('ERROR', 'ERROR'), ('UNKNOWN', 'UNKNOWN')], max_length=16, verbose_name='status'),
+        ),
+    ]
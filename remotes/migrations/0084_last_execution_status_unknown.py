@@ -0,0 +1,39 @@
+from django.db import migrations
+
+from remotes.constants import STATUS_ERROR, STATUS_OK, STATUS_UNKNOWN
+
+
+def update_values(apps, schema_editor):
+    """
+    Set the unknown status for the existing last executions, as their
+    outputs have no exit status
+    """
+    # Don't import the Configuration model directly as it may be a newer
+    # version than this migration expects.
+    LastExecution = apps.get_model('remotes', 'LastExecution')
+    LastExecution.objects.update(status=STATUS_UNKNOWN)
+
+
+def restore_values(apps, schema_editor):
+    """
+    Restore the status from the outputs diagnostics
+    """
+    # Don't import the Configuration model directly as it may be a newer
+    # version than this migration expects.
+    LastExecution = apps.get_model('remotes', 'LastExecution')
+    LastExecution.objects.filter(output__diagnostics__gt='').update(
+        status=STATUS_ERROR)
+    LastExecution.objects.exclude(status=STATUS_ERROR).update(
+        status=STATUS_OK)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('remotes', '0083_commands_output_exit_status'),
+    ]
+
+    operations = [
+        migrations.RunPython(code=update_values,
+                             reverse_code=restore_values)
+    ]
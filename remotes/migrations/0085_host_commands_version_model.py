@@ -0,0 +1,60 @@
+# Generated by Django 4.0.3 on 2026-10-17 23:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def copy_versions(apps, schema_editor):
+    """
+    Copy the commands version of every host
+    """
+    # Don't import the models directly as they may be a newer
+    # version than this migration expects.
+    Host = apps.get_model('remotes', 'Host')
+    HostCommandsVersion = apps.get_model('remotes', 'HostCommandsVersion')
+    HostCommandsVersion.objects.bulk_create(
+        [HostCommandsVersion(host_id=host_id,
+                             version=version)
+         for host_id, version in Host.objects.values_list(
+             'pk', 'commands_version')])
+
+
+def restore_versions(apps, schema_editor):
+    """
+    Restore the commands version of every host
+    """
+    # Don't import the models directly as they may be a newer
+    # version than this migration expects.
+    Host = apps.get_model('remotes', 'Host')
+    HostCommandsVersion = apps.get_model('remotes', 'HostCommandsVersion')
+    for host_id, version in HostCommandsVersion.objects.values_list(
+            'host_id', 'version'):
+        Host.objects.filter(pk=host_id).update(commands_version=version)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('remotes', '0084_last_execution_status_unknown'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HostCommandsVersion',
+            fields=[
+                ('host', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='remotes.host', verbose_name='host')),
+                ('version', models.PositiveBigIntegerField(default=0, verbose_name='version')),
+            ],
+            options={
+                'verbose_name': 'Host commands version',
+                'verbose_name_plural': 'Host commands versions',
+                'ordering': ['host'],
+            },
+        ),
+        migrations.RunPython(code=copy_versions,
+                             reverse_code=restore_versions),
+        migrations.RemoveField(
+            model_name='host',
+            name='commands_version',
+        ),
+    ]
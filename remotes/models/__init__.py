@@ -24,8 +24,17 @@ from .command_variable import (CommandVariable,                    # noqa: F401
                                CommandVariableAdmin)               # noqa: F401
 from .commands_group import CommandsGroup, CommandsGroupAdmin      # noqa: F401
 from .commands_output import CommandsOutput, CommandsOutputAdmin   # noqa: F401
+from .commands_output_upload import (CommandsOutputUpload,         # noqa: F401
+                                     CommandsOutputUploadAdmin)    # noqa: F401
 from .host import Host, HostAdmin                                  # noqa: F401
+from .host_commands_version import (HostCommandsVersion,           # noqa: F401
+                                    HostCommandsVersionAdmin)      # noqa: F401
+from .host_session import HostSession, HostSessionAdmin            # noqa: F401
 from .hostsgroup import HostsGroup, HostsGroupAdmin                # noqa: F401
+from .last_execution import (LastExecution,                        # noqa: F401
+                             LastExecutionAdmin)                   # noqa: F401
+from .pending_command import (PendingCommand,                      # noqa: F401
+                              PendingCommandAdmin)                 # noqa: F401
 from .setting import Setting, SettingAdmin                         # noqa: F401
 from .variable import Variable, VariableAdmin                      # noqa: F401
 from .variable_value import VariableValue, VariableValueAdmin      # noqa: F401
@@ -19,12 +19,15 @@
 ##
 
 import datetime
+import urllib.parse
 
+from django.contrib import admin
 from django.db import models
 from django.utils.translation import pgettext_lazy
 
 from django_admin_listfilter_dropdown.filters import DropdownFilter
 
+from utility.misc.api_logs_databases import api_logs_databases
 from utility.models import BaseModel, BaseModelAdmin
 
 
@@ -92,6 +95,8 @@ class ApiLog(BaseModel):
         # Define the database table
         db_table = 'api_log'
         ordering = ['-date', '-time', '-id']
+        indexes = [models.Index(fields=['date', 'time'],
+                                name='api_log_date_time')]
         verbose_name = pgettext_lazy('ApiLog', 'Api log')
         verbose_name_plural = pgettext_lazy('ApiLog',
                                             'Api logs')
@@ -100,6 +105,29 @@ class ApiLog(BaseModel):
         return str(self.pk)
 
 
+class ApiLogPeriodFilter(admin.SimpleListFilter):
+    """
+    Choose the rotated database to show, the current period is shown by
+    default
+    """
+    title = pgettext_lazy('ApiLog', 'period')
+    parameter_name = 'period'
+
+    def lookups(self, request, model_admin) -> list[tuple[str, str]]:
+        return [(period, period)
+                for period in sorted(api_logs_databases.get_periods(),
+                                     reverse=True)]
+
+    def queryset(self, request, queryset) -> models.QuerySet:
+        # The database is chosen by ApiLogAdmin.get_queryset
+        return queryset
+
+    def choices(self, changelist):
+        choices = list(super().choices(changelist))
+        choices[0]['display'] = pgettext_lazy('ApiLog', 'Current')
+        return choices
+
+
 class ApiLogAdmin(BaseModelAdmin):
     list_display = ('id', 'timestamp', 'username', 'remote_addr', 'method',
                     'path')
@@ -111,5 +139,31 @@ class ApiLogAdmin(BaseModelAdmin):
                    'client_version')
     ordering = ['date', 'time', 'id']
 
+    def get_list_filter(self, request) -> tuple:
+        if api_logs_databases.rotation:
+            # Allow to choose the rotated database
+            return (ApiLogPeriodFilter, *self.list_filter)
+        return self.list_filter
+
+    def get_queryset(self, request) -> models.QuerySet:
+        """
+        Get the Api logs from the database for the chosen period, also
+        when they are opened from the changelist
+
+        :param request: current request
+        :return: Api logs queryset
+        """
+        queryset = super().get_queryset(request)
+        if api_logs_databases.rotation:
+            period = request.GET.get(
+                ApiLogPeriodFilter.parameter_name,
+                urllib.parse.parse_qs(request.GET.get(
+                    '_changelist_filters', '')).get(
+                        ApiLogPeriodFilter.parameter_name, [None])[0])
+            if period in api_logs_databases.get_periods():
+                queryset = queryset.using(
+                    api_logs_databases.add_database(period=period))
+        return queryset
+
     def timestamp(self, instance):
         return datetime.datetime.combine(instance.date, instance.time)
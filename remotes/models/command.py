@@ -84,6 +84,10 @@ class Command(BaseModel):
                                     verbose_name=pgettext_lazy(
                                         'Command',
                                         'active'))
+    modified = models.DateTimeField(auto_now=True,
+                                    verbose_name=pgettext_lazy(
+                                        'Command',
+                                        'modified'))
 
     # Set the managers for the model
     objects = models.Manager()
@@ -94,6 +98,9 @@ class Command(BaseModel):
         # Define the database table
         ordering = ['group', 'order', '-is_active']
         unique_together = (('name', 'group'))
+        indexes = [models.Index(fields=['group', 'order'],
+                                condition=models.Q(is_active=True),
+                                name='command_group_active_order')]
         verbose_name = pgettext_lazy('Command',
                                      'Command')
         verbose_name_plural = pgettext_lazy('Command',
@@ -60,6 +60,10 @@ class CommandsGroup(BaseModel):
                                   verbose_name=pgettext_lazy(
                                       'CommandsGroup',
                                       'before'))
+    is_sequential = models.BooleanField(default=True,
+                                        verbose_name=pgettext_lazy(
+                                            'CommandsGroup',
+                                            'sequential'))
     is_active = models.BooleanField(default=True,
                                     verbose_name=pgettext_lazy(
                                         'CommandsGroup',
@@ -73,6 +77,9 @@ class CommandsGroup(BaseModel):
     class Meta:
         # Define the database table
         ordering = ['order', 'hosts', 'name', '-is_active']
+        indexes = [models.Index(fields=['order', 'after', 'before'],
+                                condition=models.Q(is_active=True),
+                                name='commands_group_active_order')]
         verbose_name = pgettext_lazy('CommandsGroup',
                                      'Commands group')
         verbose_name_plural = pgettext_lazy('CommandsGroup',
@@ -90,5 +97,6 @@ class CommandsGroupAdmin(BaseModelAdmin,
     actions = ['order_decrease', 'order_increase',
                'set_active', 'set_inactive']
     inlines = [CommandInline]
-    list_display = ('order', 'hosts', 'name', 'after', 'before', 'is_active')
-    list_filter = ('hosts', 'is_active')
+    list_display = ('order', 'hosts', 'name', 'after', 'before',
+                    'is_sequential', 'is_active')
+    list_filter = ('hosts', 'is_sequential', 'is_active')
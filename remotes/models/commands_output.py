@@ -51,6 +51,16 @@ class CommandsOutput(BaseModel):
                               verbose_name=pgettext_lazy(
                                   'CommandsOutput',
                                   'result'))
+    diagnostics = models.TextField(blank=True,
+                                   null=True,
+                                   verbose_name=pgettext_lazy(
+                                       'CommandsOutput',
+                                       'diagnostics'))
+    exit_status = models.IntegerField(blank=True,
+                                      null=True,
+                                      verbose_name=pgettext_lazy(
+                                          'CommandsOutput',
+                                          'exit status'))
     timestamp = models.DateTimeField(blank=True,
                                      null=True,
                                      auto_now_add=True,
@@ -66,6 +76,8 @@ class CommandsOutput(BaseModel):
     class Meta:
         # Define the database table
         ordering = ['timestamp', 'command_id']
+        indexes = [models.Index(fields=['host', 'command'],
+                                name='commands_output_host_command')]
         verbose_name = pgettext_lazy('CommandsOutput',
                                      'Commands output')
         verbose_name_plural = pgettext_lazy('CommandsOutput',
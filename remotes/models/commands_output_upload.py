@@ -0,0 +1,77 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+from django.db import models
+from django.utils.translation import pgettext_lazy
+
+from django_admin_listfilter_dropdown.filters import RelatedDropdownFilter
+
+from utility.models import BaseModel, BaseModelAdmin
+
+
+class CommandsOutputUpload(BaseModel):
+    """
+    Command output received in chunks, before saving it in a CommandsOutput
+    """
+    command = models.ForeignKey(to='remotes.Command',
+                                on_delete=models.CASCADE,
+                                verbose_name=pgettext_lazy(
+                                    'CommandsOutputUpload',
+                                    'command'))
+    host = models.ForeignKey(to='remotes.Host',
+                             on_delete=models.CASCADE,
+                             verbose_name=pgettext_lazy(
+                                 'CommandsOutputUpload',
+                                 'host'))
+    uuid = models.UUIDField(unique=True,
+                            verbose_name=pgettext_lazy(
+                                'CommandsOutputUpload',
+                                'uuid'))
+    output = models.TextField(blank=True,
+                              default='',
+                              verbose_name=pgettext_lazy(
+                                  'CommandsOutputUpload',
+                                  'output'))
+    size = models.PositiveBigIntegerField(default=0,
+                                          verbose_name=pgettext_lazy(
+                                              'CommandsOutputUpload',
+                                              'size'))
+    creation = models.DateTimeField(auto_now_add=True,
+                                    verbose_name=pgettext_lazy(
+                                        'CommandsOutputUpload',
+                                        'creation'))
+
+    class Meta:
+        # Define the database table
+        ordering = ['host', '-creation']
+        verbose_name = pgettext_lazy('CommandsOutputUpload',
+                                     'Commands output upload')
+        verbose_name_plural = pgettext_lazy('CommandsOutputUpload',
+                                            'Commands outputs uploads')
+
+    def __str__(self):
+        return f'{self.host} - {self.uuid}'
+
+
+class CommandsOutputUploadAdmin(BaseModelAdmin):
+    list_display = ('host', 'command', 'uuid', 'size', 'creation')
+    list_filter = (('host', RelatedDropdownFilter), )
+    exclude = ('output', )
+    readonly_fields = ('host', 'command', 'uuid', 'size', 'creation')
@@ -18,16 +18,24 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 ##
 
+import typing
+
 from django.contrib.auth import get_user_model
 from django.db import models
 from django.utils.translation import pgettext_lazy
 
 from encryption.fernet_encrypt import FernetEncrypt
-from encryption.rsa_key import RsaKey
 
-from remotes.constants import ENCRYPTED_FIELD, ENCRYPTION_KEY_FIELD
+from remotes.constants import (COMPRESSED_FIELD,
+                               COMPRESSION_FIELD,
+                               ENCRYPTED_FIELD,
+                               ENCRYPTION_KEY_FIELD,
+                               SESSION_FIELD)
+from remotes.models.host_session import HostSession
 
 from utility.actions import ActionSetActive, ActionSetInactive
+from utility.misc.compression import COMPRESSION_MIN_SIZE, compress
+from utility.misc.public_keys_cache import public_keys_cache
 from utility.models import (BaseModel, BaseModelAdmin,
                             ManagerEnabled, ManagerDisabled)
 
@@ -79,45 +87,129 @@ class Host(BaseModel):
         # noinspection PyUnresolvedReferences
         return self.user.username if self.user else str(self.uuid)
 
-    def encrypt_data(self, data: dict, fields: list) -> None:
+    def encrypt_data(self,
+                     data: dict,
+                     fields: list,
+                     session: HostSession = None,
+                     compression: typing.Optional[str] = None) -> None:
         """
         Encrypt some fields in the `data` dictionary using a new symmetric key
         The new key will be saved in a field called `ENCRYPTION_KEY_FIELD`
+        If a session is used its key will be used instead and its UUID will
+        be saved in a field called `SESSION_FIELD`
 
         :param data: initial data to encrypt
         :param fields: fields list to encrypt
+        :param session: HostSession object with the symmetric key to use
+        :param compression: compression algorithm to use for large fields
         :return: None
         """
+        if session:
+            # Use the session symmetric key already known by the host
+            self.encrypt_fields(encryptor=session.get_encryptor(),
+                                data=data,
+                                fields=fields,
+                                compression=compression)
+            data[SESSION_FIELD] = str(session.uuid)
+            return
         # Create a new symmetric key to encrypt the data
         encryptor = FernetEncrypt()
         encryptor.create_new_key()
+        self.encrypt_fields(encryptor=encryptor,
+                            data=data,
+                            fields=fields,
+                            compression=compression)
+        # Encrypt the symmetric key using the asymmetric key
+        if data[ENCRYPTED_FIELD]:
+            data[ENCRYPTION_KEY_FIELD] = self.encrypt_key(encryptor=encryptor)
+
+    def encrypt_data_list(self,
+                          items: list[dict],
+                          fields: list,
+                          session: HostSession = None,
+                          compression: typing.Optional[str] = None) -> dict:
+        """
+        Encrypt some fields in each dictionary of the `items` list using a
+        single new symmetric key or the session symmetric key
+
+        :param items: list of dictionaries to encrypt
+        :param fields: fields list to encrypt
+        :param session: HostSession object with the symmetric key to use
+        :param compression: compression algorithm to use for large fields
+        :return: dictionary with the symmetric key encrypted using the host
+                 public key in `ENCRYPTION_KEY_FIELD` or with the session
+                 UUID in `SESSION_FIELD`
+        """
+        if session:
+            # Use the session symmetric key already known by the host
+            encryptor = session.get_encryptor()
+        else:
+            # Create a new symmetric key to encrypt the data
+            encryptor = FernetEncrypt()
+            encryptor.create_new_key()
+        for data in items:
+            self.encrypt_fields(encryptor=encryptor,
+                                data=data,
+                                fields=fields,
+                                compression=compression)
+        if session:
+            return {SESSION_FIELD: str(session.uuid)}
+        # Encrypt the symmetric key using the asymmetric key
+        return {ENCRYPTION_KEY_FIELD: self.encrypt_key(encryptor=encryptor)}
+
+    # noinspection PyMethodMayBeStatic
+    def encrypt_fields(self,
+                       encryptor: FernetEncrypt,
+                       data: dict,
+                       fields: list,
+                       compression: typing.Optional[str] = None) -> None:
+        """
+        Encrypt some fields in the `data` dictionary using a symmetric key
+        The encrypted fields will be listed in a field called `ENCRYPTED_FIELD`
+        If a compression algorithm is used the large text fields will be
+        compressed before the encryption and they will be listed in a field
+        called `COMPRESSED_FIELD`
+
+        :param encryptor: FernetEncrypt object with the symmetric key
+        :param data: initial data to encrypt
+        :param fields: fields list to encrypt
+        :param compression: compression algorithm to use for large fields
+        :return: None
+        """
         # Encrypt any field listed in encrypted_fields
         if fields:
             data[ENCRYPTED_FIELD] = []
         for field in fields:
             if field in data:
-                if isinstance(data[field], list):
-                    # Encrypt each value in list
-                    for index, value in enumerate(data[field]):
-                        if data[field][index] is not None:
-                            data[field][index] = encryptor.encrypt(text=value)
-                elif isinstance(data[field], dict):
-                    # Encrypt each value in dict
-                    for key, value in data[field].items():
-                        if data[field][key] is not None:
-                            data[field][key] = encryptor.encrypt(text=value)
+                if isinstance(data[field], (list, dict)):
+                    # Encrypt each value in list or dict
+                    data[field] = encryptor.encrypt_many(items=data[field])
                 elif data[field] is not None:
-                    # Encrypt other types field
-                    data[field] = encryptor.encrypt(text=str(data[field]))
+                    value = str(data[field])
+                    if compression and len(value) >= COMPRESSION_MIN_SIZE:
+                        # Compress and then encrypt large text fields
+                        data[field] = encryptor.encrypt_bytes(
+                            data=compress(data=value.encode('utf-8'),
+                                          compression=compression))
+                        data.setdefault(COMPRESSED_FIELD, []).append(field)
+                        data[COMPRESSION_FIELD] = compression
+                    else:
+                        # Encrypt other types field
+                        data[field] = encryptor.encrypt(text=value)
                 data[ENCRYPTED_FIELD].append(field)
-        # Encrypt the symmetric key using the asymmetric key
-        if data[ENCRYPTED_FIELD]:
-            # Obtain the host public key to encrypt the symmetric key
-            key = RsaKey()
-            key.load_public_key(data=self.pubkey)
-            data[ENCRYPTION_KEY_FIELD] = key.encrypt(
-                text=encryptor.get_key().decode('utf-8'),
-                use_base64=True)
+
+    def encrypt_key(self, encryptor: FernetEncrypt) -> str:
+        """
+        Encrypt the symmetric key using the host public key
+
+        :param encryptor: FernetEncrypt object with the symmetric key
+        :return: the encrypted symmetric key
+        """
+        # Obtain the host public key to encrypt the symmetric key
+        key = public_keys_cache.get(host_id=self.pk,
+                                    pubkey=self.pubkey)
+        return key.encrypt(text=encryptor.get_key().decode('utf-8'),
+                           use_base64=True)
 
 
 class HostAdmin(BaseModelAdmin,
@@ -0,0 +1,60 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+from django.db import models
+from django.utils.translation import pgettext_lazy
+
+from utility.models import BaseModel, BaseModelAdmin
+
+
+class HostCommandsVersion(BaseModel):
+    """
+    Commands version for each host, increased on every change to its
+    pending commands to invalidate the ETag of its commands list
+
+    The version is kept apart from the Host, so saving any Host object
+    never overwrites it.
+    """
+    host = models.OneToOneField(to='remotes.Host',
+                                on_delete=models.CASCADE,
+                                primary_key=True,
+                                verbose_name=pgettext_lazy(
+                                    'HostCommandsVersion',
+                                    'host'))
+    version = models.PositiveBigIntegerField(default=0,
+                                             verbose_name=pgettext_lazy(
+                                                 'HostCommandsVersion',
+                                                 'version'))
+
+    class Meta:
+        # Define the database table
+        ordering = ['host']
+        verbose_name = pgettext_lazy('HostCommandsVersion',
+                                     'Host commands version')
+        verbose_name_plural = pgettext_lazy('HostCommandsVersion',
+                                            'Host commands versions')
+
+    def __str__(self):
+        return f'{self.host} - {self.version}'
+
+
+class HostCommandsVersionAdmin(BaseModelAdmin):
+    list_display = ('host', 'version')
+    readonly_fields = ('host', 'version')
@@ -0,0 +1,90 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+from django.db import models
+from django.utils.translation import pgettext_lazy
+
+from django_admin_listfilter_dropdown.filters import RelatedDropdownFilter
+
+from encryption.fernet_encrypt import FernetEncrypt
+
+from utility.models import BaseModel, BaseModelAdmin
+
+
+class HostSession(BaseModel):
+    """
+    Short-lived symmetric key shared with a host to encrypt its data
+    """
+    host = models.ForeignKey(to='remotes.Host',
+                             on_delete=models.CASCADE,
+                             verbose_name=pgettext_lazy(
+                                 'HostSession',
+                                 'host'))
+    uuid = models.UUIDField(unique=True,
+                            verbose_name=pgettext_lazy(
+                                'HostSession',
+                                'uuid'))
+    key = models.CharField(max_length=255,
+                           verbose_name=pgettext_lazy(
+                               'HostSession',
+                               'key'))
+    creation = models.DateTimeField(auto_now_add=True,
+                                    verbose_name=pgettext_lazy(
+                                        'HostSession',
+                                        'creation'))
+    expiration = models.DateTimeField(verbose_name=pgettext_lazy(
+                                          'HostSession',
+                                          'expiration'))
+    messages = models.PositiveIntegerField(default=0,
+                                           editable=False,
+                                           verbose_name=pgettext_lazy(
+                                               'HostSession',
+                                               'messages'))
+
+    class Meta:
+        # Define the database table
+        ordering = ['host', '-creation']
+        verbose_name = pgettext_lazy('HostSession',
+                                     'Host session')
+        verbose_name_plural = pgettext_lazy('HostSession',
+                                            'Host sessions')
+
+    def __str__(self):
+        return f'{self.host} - {self.uuid}'
+
+    def get_encryptor(self) -> FernetEncrypt:
+        """
+        Get the FernetEncrypt object with the session key, created once for
+        each HostSession object
+
+        :return: FernetEncrypt object
+        """
+        if (encryptor := getattr(self, '_encryptor', None)) is None:
+            encryptor = FernetEncrypt()
+            encryptor.load_key(key=self.key.encode('utf-8'))
+            self._encryptor = encryptor
+        return encryptor
+
+
+class HostSessionAdmin(BaseModelAdmin):
+    list_display = ('host', 'uuid', 'creation', 'expiration', 'messages')
+    list_filter = (('host', RelatedDropdownFilter), )
+    exclude = ('key', )
+    readonly_fields = ('host', 'uuid', 'creation', 'expiration', 'messages')
@@ -0,0 +1,108 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import typing
+
+from django.db import models
+from django.utils.translation import pgettext_lazy
+
+from django_admin_listfilter_dropdown.filters import RelatedDropdownFilter
+
+from remotes.constants import STATUS_ERROR, STATUS_OK, STATUS_UNKNOWN
+
+from utility.models import BaseModel, BaseModelAdmin
+
+
+class LastExecution(BaseModel):
+    """
+    Last output for each host and command, kept updated on each new output
+    """
+    host = models.ForeignKey(to='remotes.Host',
+                             on_delete=models.CASCADE,
+                             verbose_name=pgettext_lazy(
+                                 'LastExecution',
+                                 'host'))
+    command = models.ForeignKey(to='remotes.Command',
+                                on_delete=models.CASCADE,
+                                verbose_name=pgettext_lazy(
+                                    'LastExecution',
+                                    'command'))
+    output = models.ForeignKey(to='remotes.CommandsOutput',
+                               on_delete=models.CASCADE,
+                               verbose_name=pgettext_lazy(
+                                   'LastExecution',
+                                   'output'))
+    timestamp = models.DateTimeField(null=True,
+                                     verbose_name=pgettext_lazy(
+                                         'LastExecution',
+                                         'timestamp'))
+    status = models.CharField(max_length=16,
+                              choices=((STATUS_OK, STATUS_OK),
+                                       (STATUS_ERROR, STATUS_ERROR),
+                                       (STATUS_UNKNOWN, STATUS_UNKNOWN)),
+                              verbose_name=pgettext_lazy(
+                                  'LastExecution',
+                                  'status'))
+
+    class Meta:
+        # Define the database table
+        ordering = ['host', 'command']
+        unique_together = [('host', 'command')]
+        verbose_name = pgettext_lazy('LastExecution',
+                                     'Last execution')
+        verbose_name_plural = pgettext_lazy('LastExecution',
+                                            'Last executions')
+
+    def __str__(self):
+        return f'{self.host} - {self.command}'
+
+    @staticmethod
+    def get_status(exit_status: typing.Optional[int]) -> str:
+        """
+        Get the execution status for the command exit status
+
+        :param exit_status: command exit status or None if the client didn't
+                            transmit it
+        :return: STATUS_OK if the command exited with 0, STATUS_ERROR for
+                 any other exit status else STATUS_UNKNOWN
+        """
+        if exit_status is None:
+            return STATUS_UNKNOWN
+        return STATUS_ERROR if exit_status else STATUS_OK
+
+
+class LastExecutionAdmin(BaseModelAdmin):
+    list_display = ('host', 'group', 'command', 'timestamp', 'status')
+    list_filter = (('host', RelatedDropdownFilter),
+                   ('command__group', RelatedDropdownFilter),
+                   ('command', RelatedDropdownFilter),
+                   'status')
+    list_select_related = ('host__user', 'command__group')
+    readonly_fields = ('host', 'command', 'output', 'timestamp', 'status')
+
+    # noinspection PyMethodMayBeStatic
+    def group(self, instance) -> 'models.CommandsGroup':
+        """
+        Return the associated command group
+
+        :param instance: LastExecution instance
+        :return: CommandsGroup object
+        """
+        return instance.command.group
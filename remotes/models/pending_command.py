@@ -0,0 +1,85 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+from django.db import models
+from django.utils.translation import pgettext_lazy
+
+from django_admin_listfilter_dropdown.filters import RelatedDropdownFilter
+
+from utility.models import BaseModel, BaseModelAdmin
+
+
+class PendingCommand(BaseModel):
+    """
+    Commands queue for each host, kept updated by the model signals
+    """
+    host = models.ForeignKey(to='remotes.Host',
+                             on_delete=models.CASCADE,
+                             verbose_name=pgettext_lazy(
+                                 'PendingCommand',
+                                 'host'))
+    command = models.ForeignKey(to='remotes.Command',
+                                on_delete=models.CASCADE,
+                                verbose_name=pgettext_lazy(
+                                    'PendingCommand',
+                                    'command'))
+    group = models.ForeignKey(to='remotes.CommandsGroup',
+                              on_delete=models.CASCADE,
+                              verbose_name=pgettext_lazy(
+                                  'PendingCommand',
+                                  'group'))
+    group_order = models.PositiveIntegerField(verbose_name=pgettext_lazy(
+                                                  'PendingCommand',
+                                                  'group order'))
+    command_order = models.PositiveIntegerField(verbose_name=pgettext_lazy(
+                                                    'PendingCommand',
+                                                    'command order'))
+    after = models.DateTimeField(verbose_name=pgettext_lazy(
+                                     'PendingCommand',
+                                     'after'))
+    before = models.DateTimeField(verbose_name=pgettext_lazy(
+                                      'PendingCommand',
+                                      'before'))
+
+    class Meta:
+        # Define the database table
+        ordering = ['host', 'group_order', 'command_order']
+        unique_together = [('host', 'command')]
+        indexes = [models.Index(fields=['host',
+                                        'group_order',
+                                        'command_order'],
+                                name='pending_command_host_order')]
+        verbose_name = pgettext_lazy('PendingCommand',
+                                     'Pending command')
+        verbose_name_plural = pgettext_lazy('PendingCommand',
+                                            'Pending commands')
+
+    def __str__(self):
+        return f'{self.host} - {self.command}'
+
+
+class PendingCommandAdmin(BaseModelAdmin):
+    list_display = ('host', 'group', 'command', 'group_order',
+                    'command_order', 'after', 'before')
+    list_filter = (('host', RelatedDropdownFilter),
+                   ('group', RelatedDropdownFilter),
+                   ('command', RelatedDropdownFilter))
+    readonly_fields = ('host', 'command', 'group', 'group_order',
+                       'command_order', 'after', 'before')
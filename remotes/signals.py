@@ -0,0 +1,245 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db import transaction
+from django.db.models.signals import (m2m_changed,
+                                      post_delete,
+                                      post_save,
+                                      pre_delete)
+from django.dispatch import receiver
+
+from rest_framework.authtoken.models import Token
+
+from remotes.models import (Command,
+                            CommandsGroup,
+                            CommandsOutput,
+                            Host,
+                            HostSession,
+                            HostsGroup,
+                            PendingCommand,
+                            Setting,
+                            Variable)
+
+from utility.misc.commands_cache import commands_cache
+from utility.misc.public_keys_cache import public_keys_cache
+from utility.misc.rebuild_last_executions import rebuild_last_executions
+from utility.misc.rebuild_pending_commands import rebuild_pending_commands
+from utility.misc.remove_pending_commands import remove_pending_commands
+from utility.misc.save_last_executions import save_last_executions
+from utility.misc.sessions_cache import sessions_cache
+from utility.misc.settings_cache import settings_cache
+from utility.misc.tokens_cache import tokens_cache
+from utility.misc.update_commands_modified import update_commands_modified
+from utility.misc.update_commands_version import update_commands_version
+
+
+# noinspection PyUnusedLocal
+@receiver(post_save, sender=Command)
+def command_saved(sender, instance, **kwargs) -> None:
+    """
+    Update the pending commands for the saved command
+    """
+    rebuild_pending_commands(commands=[instance.pk])
+
+
+# noinspection PyUnusedLocal
+@receiver(pre_delete, sender=Command)
+def command_deleting(sender, instance, **kwargs) -> None:
+    """
+    Update the commands version for the hosts with the command pending, as
+    the pending commands will be deleted in cascade
+    """
+    update_commands_version(
+        hosts=PendingCommand.objects.filter(command=instance).values(
+            'host_id'))
+
+
+# noinspection PyUnusedLocal
+@receiver(post_delete, sender=Command)
+def command_deleted(sender, instance, **kwargs) -> None:
+    """
+    Discard the cached data for the deleted command
+    """
+    commands_cache.invalidate(command_id=instance.pk)
+
+
+# noinspection PyUnusedLocal
+@receiver(m2m_changed, sender=Command.settings.through)
+@receiver(m2m_changed, sender=Command.variables.through)
+def command_inputs_changed(sender, instance, action, reverse, pk_set,
+                           **kwargs) -> None:
+    """
+    Update the modification time for the commands with changed settings or
+    variables
+    """
+    if action in ('post_add', 'post_remove'):
+        update_commands_modified(
+            commands=pk_set if reverse else [instance.pk])
+    elif action == 'pre_clear':
+        update_commands_modified(
+            commands=(instance.command_set.values('pk')
+                      if reverse
+                      else [instance.pk]))
+
+
+# noinspection PyUnusedLocal
+@receiver(post_save, sender=Setting)
+@receiver(pre_delete, sender=Setting)
+def command_setting_changed(sender, instance, **kwargs) -> None:
+    """
+    Update the modification time for the commands using the setting
+    """
+    update_commands_modified(commands=instance.command_set.values('pk'))
+
+
+# noinspection PyUnusedLocal
+@receiver(post_save, sender=Variable)
+@receiver(pre_delete, sender=Variable)
+def command_variable_changed(sender, instance, **kwargs) -> None:
+    """
+    Update the modification time for the commands using the variable
+    """
+    update_commands_modified(commands=instance.command_set.values('pk'))
+
+
+# noinspection PyUnusedLocal
+@receiver(post_save, sender=CommandsGroup)
+def commands_group_saved(sender, instance, **kwargs) -> None:
+    """
+    Update the pending commands for the commands in the saved group
+    """
+    rebuild_pending_commands(
+        commands=instance.command_set.values_list('pk', flat=True))
+
+
+# noinspection PyUnusedLocal
+@receiver(post_save, sender=HostsGroup)
+def hosts_group_saved(sender, instance, **kwargs) -> None:
+    """
+    Update the pending commands for the commands assigned to the saved group
+    """
+    rebuild_pending_commands(
+        commands=Command.objects.filter(group__hosts=instance).values_list(
+            'pk', flat=True))
+
+
+# noinspection PyUnusedLocal
+@receiver(m2m_changed, sender=HostsGroup.hosts.through)
+def hosts_group_hosts_changed(sender, instance, action, reverse, pk_set,
+                              **kwargs) -> None:
+    """
+    Update the pending commands after the hosts group membership changes
+    """
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        # The hosts were changed for a hosts group
+        commands = Command.objects.filter(group__hosts=instance)
+        hosts = pk_set if action != 'post_clear' else None
+    else:
+        # The hosts groups were changed for a host
+        commands = (Command.objects.filter(group__hosts__in=pk_set)
+                    if action != 'post_clear'
+                    else None)
+        hosts = [instance.pk]
+    rebuild_pending_commands(
+        hosts=hosts,
+        commands=(commands.values_list('pk', flat=True)
+                  if commands is not None
+                  else None))
+
+
+# noinspection PyUnusedLocal
+@receiver(post_save, sender=CommandsOutput)
+def commands_output_saved(sender, instance, created, **kwargs) -> None:
+    """
+    Save the last execution and remove the executed command from the
+    pending commands
+    """
+    if created:
+        save_last_executions(outputs=[instance])
+        remove_pending_commands(host=instance.host_id,
+                                commands=[instance.command_id])
+
+
+# noinspection PyUnusedLocal
+@receiver(post_delete, sender=CommandsOutput)
+def commands_output_deleted(sender, instance, **kwargs) -> None:
+    """
+    Restore the previous last execution and the pending command if no more
+    outputs are available
+    """
+    def rebuild() -> None:
+        rebuild_last_executions(hosts=[instance.host_id],
+                                commands=[instance.command_id])
+        rebuild_pending_commands(hosts=[instance.host_id],
+                                 commands=[instance.command_id])
+
+    # Wait the end of the transaction as the output could be deleted in
+    # cascade with its host or its command
+    transaction.on_commit(rebuild)
+
+
+# noinspection PyUnusedLocal
+@receiver(post_save, sender=Setting)
+@receiver(post_delete, sender=Setting)
+def setting_changed(sender, instance, **kwargs) -> None:
+    """
+    Discard the cached settings after the transaction commit
+    """
+    transaction.on_commit(settings_cache.invalidate)
+
+
+# noinspection PyUnusedLocal
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+@receiver(post_save, sender=Host)
+@receiver(post_delete, sender=Host)
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+@receiver(m2m_changed, sender=get_user_model().groups.through)
+@receiver(m2m_changed, sender=get_user_model().user_permissions.through)
+@receiver(m2m_changed, sender=Group.permissions.through)
+def token_changed(sender, **kwargs) -> None:
+    """
+    Discard the cached tokens after the transaction commit
+    """
+    transaction.on_commit(tokens_cache.invalidate)
+
+
+# noinspection PyUnusedLocal
+@receiver(post_delete, sender=Host)
+def host_deleted(sender, instance, **kwargs) -> None:
+    """
+    Discard the cached public key for the deleted host
+    """
+    public_keys_cache.invalidate(host_id=instance.pk)
+
+
+# noinspection PyUnusedLocal
+@receiver(post_delete, sender=HostSession)
+def host_session_deleted(sender, instance, **kwargs) -> None:
+    """
+    Discard the cached session after the transaction commit
+    """
+    transaction.on_commit(lambda: sessions_cache.invalidate(
+        session=instance.uuid))
@@ -0,0 +1,94 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from remotes.models import Host, HostCommandsVersion, PendingCommand
+
+from utility.misc.create_benchmark_groups import create_benchmark_groups
+from utility.misc.rebuild_pending_commands import rebuild_pending_commands
+from utility.misc.remove_pending_commands import remove_pending_commands
+
+
+class CommandsVersionTestCase(TestCase):
+    def setUp(self):
+        self.host = create_benchmark_groups(groups=2,
+                                            commands=2)
+        rebuild_pending_commands(hosts=[self.host.pk])
+        token = Token.objects.create(user=self.host.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def get_commands_list(self, etag: str = None):
+        """
+        List the pending commands using the API
+
+        :param etag: ETag for the If-None-Match header
+        :return: response object
+        """
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return self.client.get(reverse('api.v1.commands.list'),
+                               **headers)
+
+    def test_not_modified(self):
+        """
+        The unchanged commands list is not listed again
+        """
+        response = self.get_commands_list()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 4)
+        response = self.get_commands_list(etag=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_modified(self):
+        """
+        The commands list is listed again after any pending command change
+        """
+        etag = self.get_commands_list()['ETag']
+        command_id = PendingCommand.objects.filter(
+            host=self.host).values_list('command_id', flat=True).first()
+        remove_pending_commands(host=self.host,
+                                commands=[command_id])
+        response = self.get_commands_list(etag=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 3)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_stale_host_save(self):
+        """
+        Saving a stale Host object doesn't restore the previous version
+        """
+        etag = self.get_commands_list()['ETag']
+        host = Host.objects.get(pk=self.host.pk)
+        command_id = PendingCommand.objects.filter(
+            host=self.host).values_list('command_id', flat=True).first()
+        remove_pending_commands(host=self.host,
+                                commands=[command_id])
+        version = HostCommandsVersion.objects.get(host=self.host).version
+        host.description = 'stale'
+        host.save()
+        self.assertEqual(
+            HostCommandsVersion.objects.get(host=self.host).version,
+            version)
+        self.assertEqual(self.get_commands_list(etag=etag).status_code, 200)
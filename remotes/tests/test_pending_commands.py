@@ -0,0 +1,75 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+from django.test import TestCase
+
+from remotes.constants import STATUS_OK
+from remotes.models import CommandsGroup, CommandsOutput, LastExecution
+
+from utility.misc.create_benchmark_groups import create_benchmark_groups
+from utility.misc.get_pending_commands import get_pending_commands
+
+
+class PendingCommandsTestCase(TestCase):
+    def test_constant_queries(self):
+        """
+        The pending commands are resolved in a single query regardless of
+        the commands groups number
+        """
+        for groups in (10, 100):
+            host = create_benchmark_groups(groups=groups,
+                                           commands=2)
+            with self.assertNumQueries(1):
+                results = list(get_pending_commands(hosts=[host]))
+            self.assertEqual(len(results), groups * 2)
+
+    def test_exclude_executed(self):
+        """
+        The already executed commands are not pending
+        """
+        host = create_benchmark_groups(groups=2,
+                                       commands=2)
+        results = list(get_pending_commands(hosts=[host]))
+        output = CommandsOutput.objects.create(
+            command_id=results[0]['command_id'],
+            host=host)
+        LastExecution.objects.update_or_create(
+            host=host,
+            command_id=results[0]['command_id'],
+            defaults={'output': output,
+                      'status': STATUS_OK})
+        pending = [item['command_id']
+                   for item in get_pending_commands(hosts=[host])]
+        self.assertEqual(len(pending), 3)
+        self.assertNotIn(results[0]['command_id'], pending)
+
+    def test_exclude_inactive_groups(self):
+        """
+        The commands in the inactive commands groups are not pending
+        """
+        host = create_benchmark_groups(groups=2,
+                                       commands=2)
+        group = CommandsGroup.objects.filter(hosts__hosts=host).first()
+        group.is_active = False
+        group.save()
+        results = list(get_pending_commands(hosts=[host]))
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(item['group_id'] != group.pk
+                            for item in results))
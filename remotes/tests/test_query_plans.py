@@ -0,0 +1,75 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+from django.test import TestCase
+
+from utility.misc.check_query_plans import check_query_plans
+
+
+class QueryPlansTestCase(TestCase):
+    databases = {'default', 'api_logs'}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.query_plans = check_query_plans()
+
+    def assertNoFullScan(self, name: str) -> None:
+        """
+        Check that a hot query doesn't read any table using a full scan
+
+        :param name: hot query name
+        :return: None
+        """
+        results = self.query_plans[name]
+        if results is None:
+            self.skipTest('Only SQLite query plans are supported')
+        plan, scans = results
+        self.assertEqual(scans, [], '\n'.join(plan))
+
+    def test_authentication_token(self):
+        self.assertNoFullScan(name='authentication token')
+
+    def test_pending_commands_for_host(self):
+        self.assertNoFullScan(name='pending commands for host')
+
+    def test_pending_commands_for_command(self):
+        self.assertNoFullScan(name='pending commands for command')
+
+    def test_commands_version(self):
+        self.assertNoFullScan(name='commands version')
+
+    def test_commands_list(self):
+        self.assertNoFullScan(name='commands list')
+
+    def test_command_get(self):
+        self.assertNoFullScan(name='command get')
+
+    def test_command_outputs(self):
+        self.assertNoFullScan(name='command outputs')
+
+    def test_active_commands_groups(self):
+        self.assertNoFullScan(name='active commands groups')
+
+    def test_group_commands(self):
+        self.assertNoFullScan(name='group commands')
+
+    def test_api_logs(self):
+        self.assertNoFullScan(name='api logs')
@@ -28,4 +28,7 @@ class ActionSetActive(object):
         :param queryset: data to update
         :return: None
         """
-        queryset.update(is_active=True)
+        # Save each object to notify the models signals
+        for obj in queryset:
+            obj.is_active = True
+            obj.save()
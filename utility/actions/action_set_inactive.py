@@ -28,4 +28,7 @@ class ActionSetInactive(object):
         :param queryset: data to update
         :return: None
         """
-        queryset.update(is_active=False)
+        # Save each object to notify the models signals
+        for obj in queryset:
+            obj.is_active = False
+            obj.save()
@@ -0,0 +1,217 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import atexit
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+from remotes.models import ApiLog
+
+from utility.misc.api_logs_databases import api_logs_databases
+
+POLICY_BLOCK = 'block'
+POLICY_DROP = 'drop'
+
+
+class ApiLogWriter(object):
+    """
+    Buffered ApiLog writer which saves the records in a background thread
+
+    The records are saved using bulk_create every `batch_size` records or
+    after `flush_interval` milliseconds from the first buffered record.
+    When the buffer is full the new records are dropped (`drop` policy) or
+    the caller waits up to `block_timeout` milliseconds before dropping them
+    (`block` policy).
+    """
+    def __init__(self,
+                 batch_size: int,
+                 flush_interval: int,
+                 queue_size: int,
+                 policy: str,
+                 block_timeout: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval / 1000
+        self.queue_size = queue_size
+        self.policy = policy
+        self.block_timeout = block_timeout / 1000
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._thread = None
+        # Statistics counters, updated from the requests and the writer
+        # threads using a distinct lock as stop() holds the writer lock
+        # while waiting for the writer thread
+        self._statistics_lock = threading.Lock()
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.blocked = 0
+        self.failed = 0
+        self.flushes = 0
+
+    def start(self) -> None:
+        """
+        Start the writer thread, also in the case of a forked process
+
+        :return: None
+        """
+        with self._lock:
+            if self._pid != os.getpid() or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._queue = queue.Queue(maxsize=self.queue_size)
+                self._thread = threading.Thread(target=self._run,
+                                                name='ApiLogWriter',
+                                                daemon=True)
+                self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Flush the buffered records and stop the writer thread
+
+        :return: None
+        """
+        with self._lock:
+            if self._pid == os.getpid() and self._thread.is_alive():
+                # Wait for the writer thread to save every record
+                self._queue.put(None)
+                self._thread.join()
+
+    def write(self, record: ApiLog) -> bool:
+        """
+        Enqueue a record to write
+
+        :param record: ApiLog object to save
+        :return: True if the record was enqueued or False if it was dropped
+        """
+        if self._pid != os.getpid() or not self._thread.is_alive():
+            self.start()
+        try:
+            if self.policy == POLICY_BLOCK:
+                if self._queue.full():
+                    self._increment(blocked=1)
+                self._queue.put(record, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(record)
+        except queue.Full:
+            # The buffer is still full
+            self._increment(dropped=1)
+            return False
+        self._increment(enqueued=1)
+        return True
+
+    def get_statistics(self) -> dict:
+        """
+        Return the writer statistics
+
+        :return: dictionary with the statistics counters
+        """
+        with self._statistics_lock:
+            return {'queued': self._queue.qsize() if self._queue else 0,
+                    'queue_size': self.queue_size,
+                    'policy': self.policy,
+                    'enqueued': self.enqueued,
+                    'written': self.written,
+                    'dropped': self.dropped,
+                    'blocked': self.blocked,
+                    'failed': self.failed,
+                    'flushes': self.flushes}
+
+    def _increment(self, **counters: int) -> None:
+        """
+        Increment the statistics counters
+
+        :param counters: values to add to each statistics counter
+        :return: None
+        """
+        with self._statistics_lock:
+            for name, value in counters.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def _run(self) -> None:
+        """
+        Save the records from the queue until the stop request
+
+        :return: None
+        """
+        running = True
+        while running:
+            # Wait for the first record, then collect the records up to the
+            # batch size or to the flush interval
+            records = []
+            record = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while record is not None:
+                records.append(record)
+                remaining = deadline - time.monotonic()
+                if len(records) >= self.batch_size or remaining <= 0:
+                    break
+                try:
+                    record = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if record is None:
+                # Stop request, flush the remaining records
+                running = False
+                while not self._queue.empty():
+                    if record := self._queue.get_nowait():
+                        records.append(record)
+            if records:
+                self._flush(records=records)
+        connections.close_all()
+
+    def _flush(self, records: list[ApiLog]) -> None:
+        """
+        Save the records using a single bulk_create for each database
+
+        :param records: list of ApiLog objects to save
+        :return: None
+        """
+        close_old_connections()
+        # Each record is saved in the database for its own date, as the
+        # rotated databases may change between the request and the flush
+        databases = {}
+        for record in records:
+            databases.setdefault(record.date, []).append(record)
+        for date, items in databases.items():
+            try:
+                ApiLog.objects.using(api_logs_databases.get_database(
+                    model=ApiLog,
+                    date=date)).bulk_create(items,
+                                            batch_size=self.batch_size)
+                self._increment(written=len(items))
+            except Exception:
+                # The records cannot be saved
+                self._increment(failed=len(items))
+        self._increment(flushes=1)
+
+
+api_log_writer = ApiLogWriter(
+    batch_size=getattr(settings, 'API_LOGS_WRITER_BATCH_SIZE', 100),
+    flush_interval=getattr(settings, 'API_LOGS_WRITER_FLUSH_INTERVAL', 500),
+    queue_size=getattr(settings, 'API_LOGS_WRITER_QUEUE_SIZE', 10000),
+    policy=getattr(settings, 'API_LOGS_WRITER_POLICY', POLICY_DROP),
+    block_timeout=getattr(settings, 'API_LOGS_WRITER_BLOCK_TIMEOUT', 100))
+# Flush the buffered records at the process exit
+atexit.register(api_log_writer.stop)
@@ -0,0 +1,74 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import gzip
+import json
+import pathlib
+
+
+class ApiLogsArchive(object):
+    """
+    Compressed JSON Lines files for the purged Api logs, one file for each
+    day
+
+    The records are appended to any existing file for the same day.
+    """
+    def __init__(self, directory: str):
+        self.directory = pathlib.Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._files = {}
+        # Statistics counters
+        self.written = 0
+
+    def write(self, records: list[dict]) -> None:
+        """
+        Write the records to the archive files and flush them
+
+        :param records: list of dictionaries with the ApiLog fields
+        :return: None
+        """
+        for record in records:
+            date = record['date'].isoformat()
+            if not (file := self._files.get(date)):
+                file = gzip.open(self.directory / f'api_logs-{date}.jsonl.gz',
+                                 mode='at',
+                                 encoding='utf-8')
+                self._files[date] = file
+            file.write(json.dumps(record, default=str) + '\n')
+            self.written += 1
+        # Flush the records before their deletion and close the files for
+        # the days already processed
+        oldest = min(record['date'] for record in records).isoformat()
+        for date, file in list(self._files.items()):
+            if date < oldest:
+                file.close()
+                self._files.pop(date)
+            else:
+                file.flush()
+
+    def close(self) -> None:
+        """
+        Close every archive file
+
+        :return: None
+        """
+        for file in self._files.values():
+            file.close()
+        self._files.clear()
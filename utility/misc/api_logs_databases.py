@@ -0,0 +1,142 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import datetime
+import pathlib
+import re
+import threading
+import typing
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+
+API_LOGS_DATABASE = 'api_logs'
+ROTATION_DAY = 'day'
+ROTATION_MONTH = 'month'
+
+
+class ApiLogsDatabases(object):
+    """
+    Databases for the Api logs
+
+    The Api logs are saved in the `api_logs` database or, using a rotation,
+    in a SQLite database file for each day or for each month, created on
+    the first use in the same directory of the `api_logs` database file.
+    """
+    def __init__(self, rotation: typing.Optional[str]):
+        if rotation not in (None, ROTATION_DAY, ROTATION_MONTH):
+            raise ImproperlyConfigured(
+                f'Unsupported Api logs rotation: {rotation}')
+        self.rotation = rotation
+        self._lock = threading.Lock()
+        self._created = set()
+
+    def get_database(self,
+                     model,
+                     date: datetime.date = None) -> str:
+        """
+        Get the database alias for the Api logs of a date
+
+        :param model: ApiLog model to create in the new databases
+        :param date: Api logs date (None for today)
+        :return: database alias
+        """
+        if not self.rotation:
+            return API_LOGS_DATABASE
+        date = date or datetime.date.today()
+        period = (date.isoformat()
+                  if self.rotation == ROTATION_DAY
+                  else date.isoformat()[:7])
+        alias = self.add_database(period=period)
+        if alias not in self._created:
+            with self._lock:
+                if alias not in self._created:
+                    # Create the table for a new database file
+                    connection = connections[alias]
+                    if (model._meta.db_table not in
+                            connection.introspection.table_names()):
+                        with connection.schema_editor() as editor:
+                            editor.create_model(model)
+                    self._created.add(alias)
+        return alias
+
+    def add_database(self, period: str) -> str:
+        """
+        Add the database for a period to the connections
+
+        :param period: period formatted as YYYY-MM-DD or YYYY-MM
+        :return: database alias
+        """
+        alias = f'{API_LOGS_DATABASE}_{period.replace("-", "_")}'
+        if alias not in connections.databases:
+            if (connections.databases[API_LOGS_DATABASE]['ENGINE'] !=
+                    'django.db.backends.sqlite3'):
+                raise ImproperlyConfigured(
+                    'The Api logs rotation requires a SQLite database')
+            connections.databases[alias] = {
+                **connections.databases[API_LOGS_DATABASE],
+                'NAME': self.get_filename(period=period)}
+        return alias
+
+    # noinspection PyMethodMayBeStatic
+    def get_filename(self, period: str) -> pathlib.Path:
+        """
+        Get the database file for a period
+
+        :param period: period formatted as YYYY-MM-DD or YYYY-MM
+        :return: database file path
+        """
+        filename = pathlib.Path(
+            connections.databases[API_LOGS_DATABASE]['NAME'])
+        return filename.with_name(
+            f'{filename.stem}-{period}{filename.suffix}')
+
+    # noinspection PyMethodMayBeStatic
+    def get_periods(self) -> dict[str, tuple[datetime.date, datetime.date]]:
+        """
+        Get the periods for the existing database files
+
+        :return: dictionary with the first day and the day after the last
+                 day for each period
+        """
+        filename = pathlib.Path(
+            connections.databases[API_LOGS_DATABASE]['NAME'])
+        pattern = re.compile(rf'^{re.escape(filename.stem)}-'
+                             rf'(\d{{4}}-\d{{2}}(?:-\d{{2}})?)'
+                             rf'{re.escape(filename.suffix)}$')
+        results = {}
+        for path in filename.parent.glob(
+                f'{filename.stem}-*{filename.suffix}'):
+            if match := pattern.match(path.name):
+                period = match.group(1)
+                if len(period) == 10:
+                    first = datetime.date.fromisoformat(period)
+                    last = first + datetime.timedelta(days=1)
+                else:
+                    first = datetime.date.fromisoformat(f'{period}-01')
+                    last = (first + datetime.timedelta(days=31)).replace(
+                        day=1)
+                results[period] = (first, last)
+        return results
+
+
+api_logs_databases = ApiLogsDatabases(
+    rotation=getattr(settings, 'API_LOGS_ROTATION', None))
@@ -0,0 +1,38 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+from remotes.models import PendingCommand
+
+from utility.misc.get_pending_commands import get_pending_commands
+
+PENDING_COMMAND_FIELDS = ('host_id', 'command_id', 'group_id', 'group_order',
+                          'command_order', 'after', 'before')
+
+
+def check_pending_commands() -> tuple[set, set]:
+    """
+    Compare the PendingCommand rows with the current pending commands
+
+    :return: tuple with the missing rows and the unexpected rows
+    """
+    expected = set(tuple(item[field] for field in PENDING_COMMAND_FIELDS)
+                   for item in get_pending_commands())
+    existing = set(PendingCommand.objects.values_list(*PENDING_COMMAND_FIELDS))
+    return expected - existing, existing - expected
@@ -0,0 +1,98 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import typing
+
+from django.db import connections, router
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from rest_framework.authtoken.models import Token
+
+from remotes.models import (ApiLog,
+                            Command,
+                            CommandsGroup,
+                            CommandsOutput,
+                            HostCommandsVersion,
+                            PendingCommand)
+
+from utility.misc.get_pending_commands import get_pending_commands
+
+
+def get_hot_queries() -> dict[str, QuerySet]:
+    """
+    Get the querysets executed by the most frequent requests
+
+    The querysets are only used to explain their query plans, so any ID
+    can be used in the filters.
+
+    :return: dictionary with the querysets for each name
+    """
+    now = timezone.now()
+    return {
+        'authentication token': Token.objects.select_related(
+            'user__host').filter(key=''),
+        'pending commands for host': get_pending_commands(hosts=[0]),
+        'pending commands for command': get_pending_commands(commands=[0]),
+        # The commands version is read using get_or_create, without ordering
+        'commands version': HostCommandsVersion.objects.filter(
+            host=0).order_by(),
+        'commands list': PendingCommand.objects.filter(
+            host=0,
+            before__gt=now).order_by('group_order', 'command_order'),
+        'command get': Command.objects_enabled.filter(
+            pk=0,
+            group__is_active=True,
+            group__hosts__hosts=0,
+            group__hosts__is_active=True),
+        'command outputs': CommandsOutput.objects.filter(host=0,
+                                                         command=0),
+        'active commands groups': CommandsGroup.objects_enabled.filter(
+            after__lt=now,
+            before__gt=now).order_by('order'),
+        'group commands': Command.objects_enabled.filter(
+            group=0).order_by('order'),
+        'api logs': ApiLog.objects.order_by('-date', '-time', '-id')[:100],
+    }
+
+
+def check_query_plans() -> dict[str,
+                                typing.Optional[tuple[list[str], list[str]]]]:
+    """
+    Explain the query plans for the hot queries using SQLite and find the
+    tables read using a full table scan
+
+    :return: dictionary with the query plan lines and the fully scanned
+             tables for each query name (None for the other databases)
+    """
+    results = {}
+    for name, queryset in get_hot_queries().items():
+        database = router.db_for_read(queryset.model)
+        if connections[database].vendor != 'sqlite':
+            results[name] = None
+            continue
+        # Keep only the details from each line of EXPLAIN QUERY PLAN
+        plan = [line.split(maxsplit=3)[-1]
+                for line in queryset.explain().splitlines()]
+        scans = [detail.split()[-1]
+                 for detail in plan
+                 if detail.startswith('SCAN ') and 'USING ' not in detail]
+        results[name] = (plan, scans)
+    return results
@@ -0,0 +1,115 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import collections
+import datetime
+import threading
+import typing
+
+from django.conf import settings
+
+
+class CommandsCache(object):
+    """
+    Process-local LRU cache for the serialized commands
+
+    The host independent part of each command is serialized once and kept
+    in memory together with the command modification time, so any change
+    to the command (saved in any process) serializes it again. The least
+    recently used commands are discarded to keep at most `size` commands
+    (0 to disable the cache).
+    """
+    def __init__(self, size: int):
+        self.size = size
+        self._lock = threading.Lock()
+        self._commands = collections.OrderedDict()
+        # Statistics counters
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self,
+            command_id: int,
+            modified: datetime.datetime) -> typing.Optional[dict]:
+        """
+        Get the serialized command if not modified
+
+        :param command_id: command ID
+        :param modified: command modification time
+        :return: dictionary with the serialized command or None
+        """
+        with self._lock:
+            cached_modified, data = self._commands.get(command_id,
+                                                       (None, None))
+            if cached_modified == modified:
+                self._commands.move_to_end(command_id)
+                self.hits += 1
+                return data
+            self.misses += 1
+        return None
+
+    def set(self,
+            command_id: int,
+            modified: datetime.datetime,
+            data: dict) -> None:
+        """
+        Save the serialized command
+
+        :param command_id: command ID
+        :param modified: command modification time
+        :param data: dictionary with the serialized command
+        :return: None
+        """
+        if self.size:
+            with self._lock:
+                # Replace any previous data for the same command
+                self._commands[command_id] = (modified, data)
+                self._commands.move_to_end(command_id)
+                while len(self._commands) > self.size:
+                    self._commands.popitem(last=False)
+
+    def invalidate(self, command_id: int) -> None:
+        """
+        Discard the cached data for a command
+
+        :param command_id: command ID
+        :return: None
+        """
+        with self._lock:
+            if self._commands.pop(command_id, None):
+                self.invalidations += 1
+
+    def get_statistics(self) -> dict:
+        """
+        Return the cache statistics
+
+        :return: dictionary with the statistics counters
+        """
+        lookups = self.hits + self.misses
+        return {'items': len(self._commands),
+                'size': self.size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0,
+                'invalidations': self.invalidations}
+
+
+commands_cache = CommandsCache(
+    size=getattr(settings, 'COMMANDS_CACHE_SIZE', 1000))
@@ -0,0 +1,98 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import threading
+import typing
+
+from django.conf import settings
+
+
+class CommandsNotifier(object):
+    """
+    Process-local notifications for the hosts awaiting new pending commands
+
+    The requests awaiting new commands are woken up as soon as new pending
+    commands are created by the same process. The pending commands created
+    by the other processes are found by checking them again every
+    `check_interval` seconds.
+    """
+    def __init__(self, check_interval: float):
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._waiters = {}
+        # Statistics counters
+        self.notifications = 0
+        self.wakeups = 0
+
+    def subscribe(self, host: int) -> threading.Event:
+        """
+        Register a new waiter for the host pending commands
+
+        :param host: Host ID to await
+        :return: Event object set when new commands are available
+        """
+        event = threading.Event()
+        with self._lock:
+            self._waiters.setdefault(host, set()).add(event)
+        return event
+
+    def unsubscribe(self, host: int, event: threading.Event) -> None:
+        """
+        Remove a registered waiter
+
+        :param host: awaited Host ID
+        :param event: Event object returned by subscribe
+        :return: None
+        """
+        with self._lock:
+            if waiters := self._waiters.get(host):
+                waiters.discard(event)
+                if not waiters:
+                    self._waiters.pop(host)
+
+    def notify(self, hosts: typing.Iterable[int]) -> None:
+        """
+        Wake up the waiters for the hosts with new pending commands
+
+        :param hosts: Host IDs with new pending commands
+        :return: None
+        """
+        with self._lock:
+            self.notifications += 1
+            for host in hosts:
+                for event in self._waiters.get(host, ()):
+                    self.wakeups += 1
+                    event.set()
+
+    def get_statistics(self) -> dict:
+        """
+        Return the notifier statistics
+
+        :return: dictionary with the statistics counters
+        """
+        with self._lock:
+            waiting = sum(map(len, self._waiters.values()))
+        return {'waiting': waiting,
+                'notifications': self.notifications,
+                'wakeups': self.wakeups}
+
+
+commands_notifier = CommandsNotifier(
+    check_interval=getattr(settings, 'COMMANDS_NOTIFIER_CHECK_INTERVAL', 5))
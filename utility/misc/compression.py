@@ -0,0 +1,132 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import typing
+import zlib
+
+try:
+    # Try to use the optional zstandard module
+    import zstandard
+except ImportError:
+    # Module not found, the zstd compression won't be available
+    zstandard = None
+
+
+COMPRESSION_ZLIB = 'zlib'
+COMPRESSION_ZSTD = 'zstd'
+# Minimum text size to compress
+COMPRESSION_MIN_SIZE = 1024
+# Maximum decompressed size when no other limit applies
+DECOMPRESSION_MAX_SIZE = 64 * 1024 * 1024
+
+
+class SizeLimitError(ValueError):
+    """
+    Data larger than the maximum allowed size
+    """
+
+
+def get_compressions() -> list[str]:
+    """
+    Get the available compression algorithms, in order of preference
+
+    :return: list of compression algorithms names
+    """
+    results = [COMPRESSION_ZLIB]
+    if zstandard:
+        results.insert(0, COMPRESSION_ZSTD)
+    return results
+
+
+def negotiate_compression(
+        compressions: typing.Optional[str]) -> typing.Optional[str]:
+    """
+    Choose the first available compression algorithm from a comma
+    separated list of requested algorithms
+
+    :param compressions: comma separated compression algorithms names
+    :return: compression algorithm name or None if no algorithm matches
+    """
+    available = get_compressions()
+    for compression in (compressions or '').split(','):
+        if (compression := compression.strip()) in available:
+            return compression
+    return None
+
+
+def compress(data: bytes, compression: str) -> bytes:
+    """
+    Compress data using a compression algorithm
+
+    :param data: data to compress
+    :param compression: compression algorithm name
+    :return: compressed data
+    """
+    if compression == COMPRESSION_ZSTD and zstandard:
+        return zstandard.ZstdCompressor().compress(data)
+    elif compression == COMPRESSION_ZLIB:
+        return zlib.compress(data)
+    raise ValueError(f'Unsupported compression: {compression}')
+
+
+def decompress(data: bytes,
+               compression: str,
+               max_size: int = DECOMPRESSION_MAX_SIZE) -> bytes:
+    """
+    Decompress data using a compression algorithm, refusing the data
+    larger than the maximum size before decompressing it all
+
+    :param data: compressed data
+    :param compression: compression algorithm name
+    :param max_size: maximum decompressed size in bytes
+    :return: decompressed data
+    """
+    try:
+        if compression == COMPRESSION_ZSTD and zstandard:
+            # The size in the frame header cannot be trusted, the data is
+            # read up to the maximum size
+            results = bytearray()
+            with zstandard.ZstdDecompressor().stream_reader(data) as reader:
+                while len(results) <= max_size and (
+                        chunk := reader.read(max_size + 1 - len(results))):
+                    results.extend(chunk)
+            if (len(results) <= max_size and
+                    zstandard.frame_content_size(data) not in (
+                        -1, len(results))):
+                raise ValueError('Invalid compressed data: '
+                                 'incomplete or truncated stream')
+        elif compression == COMPRESSION_ZLIB:
+            decompressor = zlib.decompressobj()
+            results = decompressor.decompress(data, max_size + 1)
+            if len(results) <= max_size and not decompressor.eof:
+                raise ValueError('Invalid compressed data: '
+                                 'incomplete or truncated stream')
+        else:
+            raise ValueError(f'Unsupported compression: {compression}')
+    except zlib.error as error:
+        raise ValueError(f'Invalid compressed data: {error}')
+    except Exception as error:
+        if zstandard and isinstance(error, zstandard.ZstdError):
+            raise ValueError(f'Invalid compressed data: {error}')
+        raise
+    if len(results) > max_size:
+        raise SizeLimitError(f'Decompressed data larger than {max_size} '
+                             'bytes')
+    return bytes(results)
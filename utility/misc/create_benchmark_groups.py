@@ -0,0 +1,71 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import datetime
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db.models import Max
+from django.utils import timezone
+
+from remotes.models import Command, CommandsGroup, Host, HostsGroup
+
+
+def create_benchmark_groups(groups: int,
+                            commands: int) -> Host:
+    """
+    Create a new host with the requested number of active commands groups,
+    each one with the requested number of commands
+
+    The commands groups and the commands are created using bulk_create,
+    without sending any signal.
+
+    :param groups: number of commands groups to create
+    :param commands: number of commands to create in each commands group
+    :return: new Host object assigned to every commands group
+    """
+    name = f'benchmark-{uuid.uuid4().hex[:8]}'
+    user = get_user_model().objects.create(username=name)
+    host = Host.objects.create(uuid=uuid.uuid4(),
+                               user=user)
+    hosts_group = HostsGroup.objects.create(name=name)
+    hosts_group.hosts.add(host)
+    # The commands groups order must be unique
+    order = CommandsGroup.objects.aggregate(order=Max('order'))['order'] or 0
+    now = timezone.now()
+    commands_groups = CommandsGroup.objects.bulk_create(
+        [CommandsGroup(hosts=hosts_group,
+                       name=f'{name}-{index}',
+                       order=order + index + 1,
+                       after=now - datetime.timedelta(days=1),
+                       before=now + datetime.timedelta(days=1))
+         for index in range(groups)])
+    if any(group.pk is None for group in commands_groups):
+        # The database didn't return the IDs for the bulk created groups
+        commands_groups = CommandsGroup.objects.filter(
+            hosts=hosts_group).order_by('order')
+    Command.objects.bulk_create(
+        [Command(group=group,
+                 name=f'{group.name}-{index}',
+                 command=f'__RESULT__ = {index}',
+                 order=index + 1)
+         for group in commands_groups
+         for index in range(commands)])
+    return host
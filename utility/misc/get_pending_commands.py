@@ -0,0 +1,67 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import typing
+
+from django.db.models import Exists, F, OuterRef, QuerySet
+
+from remotes.models import Command, LastExecution
+
+
+def get_pending_commands(hosts: typing.Iterable = None,
+                         commands: typing.Iterable = None) -> QuerySet:
+    """
+    Get the pending commands for the hosts in a single query
+
+    The resulting queryset contains a dictionary for each host and active
+    command in an active commands group, assigned to an active hosts group
+    including the host and not yet executed by the host.
+    The commands groups time window is not checked, the `after` and `before`
+    values are returned instead.
+
+    :param hosts: Host objects or IDs to filter (None for every host)
+    :param commands: Command objects or IDs to filter (None for every command)
+    :return: queryset with the PendingCommand fields values
+    """
+    # Every filter must be applied in a single call to use the same join
+    # for the hosts group hosts
+    filters = {'group__is_active': True,
+               'group__hosts__is_active': True,
+               'group__hosts__hosts__isnull': False}
+    if hosts is not None:
+        filters['group__hosts__hosts__in'] = hosts
+    if commands is not None:
+        filters['pk__in'] = commands
+    # Get all the already executed commands to exclude
+    executed = LastExecution.objects.filter(
+        host_id=OuterRef('host_id'),
+        command_id=OuterRef('command_id'))
+    return (Command.objects_enabled
+            .filter(**filters)
+            .annotate(host_id=F('group__hosts__hosts'),
+                      command_id=F('pk'),
+                      group_order=F('group__order'),
+                      command_order=F('order'),
+                      after=F('group__after'),
+                      before=F('group__before'))
+            .filter(~Exists(executed))
+            .order_by('host_id', 'group_order', 'command_order')
+            .values('host_id', 'command_id', 'group_id', 'group_order',
+                    'command_order', 'after', 'before'))
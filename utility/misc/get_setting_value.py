@@ -18,7 +18,7 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 ##
 
-from remotes.models import Setting
+from utility.misc.settings_cache import settings_cache
 
 
 def get_setting_value(name: str, default_value: str = None) -> str:
@@ -29,5 +29,4 @@ def get_setting_value(name: str, default_value: str = None) -> str:
     :param default_value: default value if no setting is found
     :return:
     """
-    setting = Setting.objects_enabled.filter(name=name).first()
-    return setting.value if setting else default_value
+    return settings_cache.get(name=name, default_value=default_value)
@@ -0,0 +1,103 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import collections
+import hashlib
+import threading
+
+from django.conf import settings
+
+from encryption.rsa_key import RsaKey
+
+
+class PublicKeysCache(object):
+    """
+    Process-local LRU cache for the parsed hosts public keys
+
+    The public key for each host is parsed once and kept in memory until
+    the host public key changes, the host is deleted or the least recently
+    used keys are discarded to keep at most `size` keys (0 to disable the
+    cache).
+    """
+    def __init__(self, size: int):
+        self.size = size
+        self._lock = threading.Lock()
+        self._keys = collections.OrderedDict()
+        # Statistics counters
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, host_id: int, pubkey: str) -> RsaKey:
+        """
+        Get the RsaKey object with the public key loaded
+
+        :param host_id: host ID
+        :param pubkey: host public key content
+        :return: RsaKey object
+        """
+        digest = hashlib.sha256(pubkey.encode('utf-8')).digest()
+        with self._lock:
+            cached_digest, key = self._keys.get(host_id, (None, None))
+            if cached_digest == digest:
+                self._keys.move_to_end(host_id)
+                self.hits += 1
+                return key
+            self.misses += 1
+        # Parse the public key outside the lock
+        key = RsaKey()
+        key.load_public_key(data=pubkey)
+        if self.size:
+            with self._lock:
+                # Replace any previous public key for the same host
+                self._keys[host_id] = (digest, key)
+                self._keys.move_to_end(host_id)
+                while len(self._keys) > self.size:
+                    self._keys.popitem(last=False)
+        return key
+
+    def invalidate(self, host_id: int) -> None:
+        """
+        Discard the cached public key for a host
+
+        :param host_id: host ID
+        :return: None
+        """
+        with self._lock:
+            if self._keys.pop(host_id, None):
+                self.invalidations += 1
+
+    def get_statistics(self) -> dict:
+        """
+        Return the cache statistics
+
+        :return: dictionary with the statistics counters
+        """
+        lookups = self.hits + self.misses
+        return {'items': len(self._keys),
+                'size': self.size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0,
+                'invalidations': self.invalidations}
+
+
+public_keys_cache = PublicKeysCache(
+    size=getattr(settings, 'PUBLIC_KEYS_CACHE_SIZE', 1000))
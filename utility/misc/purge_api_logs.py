@@ -0,0 +1,63 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import datetime
+import time
+
+from remotes.models import ApiLog
+
+from utility.misc.api_logs_archive import ApiLogsArchive
+
+
+def purge_api_logs(database: str,
+                   before: datetime.date,
+                   chunk_size: int,
+                   archive: ApiLogsArchive = None,
+                   pause: float = 0) -> int:
+    """
+    Delete the Api logs older than a date in chunks, so each transaction
+    keeps the database locked only for a short time
+
+    :param database: database alias with the Api logs
+    :param before: date of the first Api logs to keep
+    :param chunk_size: number of Api logs deleted in each transaction
+    :param archive: ApiLogsArchive object to save the Api logs before
+                    their deletion
+    :param pause: seconds to wait between the chunks
+    :return: number of Api logs deleted
+    """
+    queryset = ApiLog.objects.using(database).filter(
+        date__lt=before).order_by('pk')
+    results = 0
+    while True:
+        if archive:
+            records = list(queryset.values()[:chunk_size])
+            if records:
+                archive.write(records=records)
+            ids = [record['id'] for record in records]
+        else:
+            ids = list(queryset.values_list('pk', flat=True)[:chunk_size])
+        if not ids:
+            break
+        ApiLog.objects.using(database).filter(pk__in=ids).delete()
+        results += len(ids)
+        if pause:
+            time.sleep(pause)
+    return results
@@ -0,0 +1,71 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import typing
+
+from django.db import transaction
+from django.db.models import Case, OuterRef, Subquery, Value, When
+
+from remotes.constants import STATUS_ERROR, STATUS_OK, STATUS_UNKNOWN
+from remotes.models import CommandsOutput, LastExecution
+
+
+def rebuild_last_executions(hosts: typing.Iterable = None,
+                            commands: typing.Iterable = None) -> int:
+    """
+    Rebuild the LastExecution rows for the hosts and the commands from
+    their latest CommandsOutput
+
+    :param hosts: Host objects or IDs to rebuild (None for every host)
+    :param commands: Command objects or IDs to rebuild (None for every
+                     command)
+    :return: number of LastExecution rows created
+    """
+    filters = {}
+    if hosts is not None:
+        filters['host__in'] = list(hosts)
+    if commands is not None:
+        filters['command__in'] = list(commands)
+    # Get the latest output for each host and command
+    latest = CommandsOutput.objects.filter(
+        host_id=OuterRef('host_id'),
+        command_id=OuterRef('command_id')).order_by('-pk').values('pk')[:1]
+    outputs = (CommandsOutput.objects
+               .filter(**filters)
+               .filter(pk=Subquery(latest))
+               .annotate(status=Case(When(exit_status=0,
+                                          then=Value(STATUS_OK)),
+                                     When(exit_status__isnull=False,
+                                          then=Value(STATUS_ERROR)),
+                                     default=Value(STATUS_UNKNOWN)))
+               .values_list('host_id', 'command_id', 'pk', 'timestamp',
+                            'status'))
+    with transaction.atomic():
+        # Replace the existing rows with the latest outputs
+        LastExecution.objects.filter(**filters).delete()
+        results = LastExecution.objects.bulk_create(
+            [LastExecution(host_id=host_id,
+                           command_id=command_id,
+                           output_id=output_id,
+                           timestamp=timestamp,
+                           status=status)
+             for host_id, command_id, output_id, timestamp, status
+             in outputs])
+    return len(results)
@@ -0,0 +1,66 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import typing
+
+from django.db import transaction
+
+from remotes.models import PendingCommand
+
+from utility.misc.commands_notifier import commands_notifier
+from utility.misc.get_pending_commands import get_pending_commands
+from utility.misc.update_commands_version import update_commands_version
+
+
+def rebuild_pending_commands(hosts: typing.Iterable = None,
+                             commands: typing.Iterable = None) -> int:
+    """
+    Rebuild the PendingCommand rows for the hosts and the commands
+
+    :param hosts: Host objects or IDs to rebuild (None for every host)
+    :param commands: Command objects or IDs to rebuild (None for every
+                     command)
+    :return: number of PendingCommand rows created
+    """
+    queryset = PendingCommand.objects.all()
+    if hosts is not None:
+        hosts = list(hosts)
+        queryset = queryset.filter(host__in=hosts)
+    if commands is not None:
+        commands = list(commands)
+        queryset = queryset.filter(command__in=commands)
+    with transaction.atomic():
+        # Replace the existing rows with the current pending commands,
+        # updating the commands version for both the previous hosts and
+        # the new hosts
+        update_commands_version(hosts=queryset.values('host_id'))
+        queryset.delete()
+        results = PendingCommand.objects.bulk_create(
+            [PendingCommand(**item)
+             for item in get_pending_commands(hosts=hosts,
+                                              commands=commands)])
+        if results:
+            update_commands_version(hosts=queryset.values('host_id'))
+        # Wake up the hosts awaiting new commands after the commit
+        hosts_ids = {item.host_id for item in results}
+        if hosts_ids:
+            transaction.on_commit(
+                lambda: commands_notifier.notify(hosts=hosts_ids))
+    return len(results)
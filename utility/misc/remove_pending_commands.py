@@ -0,0 +1,42 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import typing
+
+from remotes.models import Host, PendingCommand
+
+from utility.misc.update_commands_version import update_commands_version
+
+
+def remove_pending_commands(host: typing.Union[Host, int],
+                            commands: typing.Iterable) -> int:
+    """
+    Remove the executed commands from the PendingCommand rows of the host
+
+    :param host: Host object or ID which executed the commands
+    :param commands: Command objects or IDs executed
+    :return: number of PendingCommand rows removed
+    """
+    results, _ = PendingCommand.objects.filter(
+        host=host,
+        command__in=list(commands)).delete()
+    if results:
+        update_commands_version(hosts=[getattr(host, 'pk', host)])
+    return results
@@ -0,0 +1,71 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import typing
+
+from remotes.models import CommandsOutput, LastExecution
+
+from utility.misc.rebuild_last_executions import rebuild_last_executions
+
+
+def save_last_executions(outputs: typing.Iterable[CommandsOutput]) -> int:
+    """
+    Save the new outputs as the last executions for their hosts and commands
+
+    :param outputs: new CommandsOutput objects, in their creation order
+    :return: number of LastExecution rows saved
+    """
+    # The later outputs replace the previous ones for the same command
+    outputs = {(output.host_id, output.command_id): output
+               for output in outputs}
+    if not outputs:
+        return 0
+    if any(output.pk is None for output in outputs.values()):
+        # The database didn't return the IDs for the bulk created outputs
+        return rebuild_last_executions(
+            hosts={host_id for host_id, _ in outputs},
+            commands={command_id for _, command_id in outputs})
+    # Update the existing LastExecution objects
+    executions = []
+    for execution in LastExecution.objects.filter(
+            host_id__in={host_id for host_id, _ in outputs},
+            command_id__in={command_id for _, command_id in outputs}):
+        if output := outputs.pop((execution.host_id, execution.command_id),
+                                 None):
+            execution.output_id = output.pk
+            execution.timestamp = output.timestamp
+            execution.status = LastExecution.get_status(
+                exit_status=output.exit_status)
+            executions.append(execution)
+    LastExecution.objects.bulk_update(objs=executions,
+                                      fields=('output', 'timestamp',
+                                              'status'))
+    # Create the missing LastExecution objects, the concurrent outputs for
+    # the same command are ignored
+    LastExecution.objects.bulk_create(
+        [LastExecution(host_id=output.host_id,
+                       command_id=output.command_id,
+                       output_id=output.pk,
+                       timestamp=output.timestamp,
+                       status=LastExecution.get_status(
+                           exit_status=output.exit_status))
+         for output in outputs.values()],
+        ignore_conflicts=True)
+    return len(executions) + len(outputs)
@@ -0,0 +1,120 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import threading
+import typing
+import uuid
+
+from django.db.models import F
+from django.utils import timezone
+
+from remotes.constants import HOST_SESSION_MAX_MESSAGES
+from remotes.models import Host, HostSession
+
+from utility.misc.get_setting_value import get_setting_value
+
+
+class SessionsCache(object):
+    """
+    Process-local cache for the hosts sessions
+
+    Each session is loaded once from the database and kept in memory with
+    its symmetric key until it expires or until it's deleted.
+    The encrypted messages are counted in the database, so the maximum
+    number of messages is shared by every server process.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}
+        # Statistics counters
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+
+    def get(self, host: Host, session: str) -> typing.Optional[HostSession]:
+        """
+        Get a valid session for the host, counting a new encrypted message
+
+        :param host: Host object which owns the session
+        :param session: session UUID received from the host
+        :return: HostSession object or None if the session is not valid
+        """
+        try:
+            session_uuid = uuid.UUID(hex=session)
+        except (TypeError, ValueError):
+            # Missing or invalid session
+            return None
+        now = timezone.now()
+        if item := self._sessions.get(session_uuid):
+            self.hits += 1
+        else:
+            self.misses += 1
+            if host_session := HostSession.objects.filter(
+                    uuid=session_uuid,
+                    expiration__gt=now).first():
+                with self._lock:
+                    # Remove the expired sessions
+                    self._sessions = {key: value
+                                      for key, value
+                                      in self._sessions.items()
+                                      if value.expiration > now}
+                    item = self._sessions.setdefault(session_uuid,
+                                                     host_session)
+        if (not item or
+                item.host_id != host.pk or
+                item.expiration <= now):
+            self.rejected += 1
+            return None
+        max_messages = int(get_setting_value(name=HOST_SESSION_MAX_MESSAGES,
+                                             default_value='0'))
+        if max_messages and not HostSession.objects.filter(
+                pk=item.pk,
+                messages__lt=max_messages).update(
+                    messages=F('messages') + 1):
+            # The session was exhausted by any server process
+            self.rejected += 1
+            return None
+        return item
+
+    def invalidate(self, session: uuid.UUID) -> None:
+        """
+        Discard a cached session
+
+        :param session: session UUID
+        :return: None
+        """
+        with self._lock:
+            self._sessions.pop(session, None)
+
+    def get_statistics(self) -> dict:
+        """
+        Return the cache statistics
+
+        :return: dictionary with the statistics counters
+        """
+        lookups = self.hits + self.misses
+        return {'items': len(self._sessions),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0,
+                'rejected': self.rejected}
+
+
+sessions_cache = SessionsCache()
@@ -0,0 +1,107 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import threading
+import time
+
+from django.conf import settings
+
+from remotes.models import Setting
+
+
+class SettingsCache(object):
+    """
+    Process-local cache for the active Setting values
+
+    Every active setting is loaded at once on the first lookup and kept in
+    memory until it's invalidated by the Setting signals or until the `ttl`
+    seconds are elapsed (0 to never expire).
+    """
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._values = None
+        self._expiration = None
+        # Statistics counters
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, name: str, default_value: str = None) -> str:
+        """
+        Get a value from the cached settings
+
+        :param name: setting name
+        :param default_value: default value if no setting is found
+        :return: setting value
+        """
+        values = self._values
+        if values is None or (self._expiration and
+                              time.monotonic() > self._expiration):
+            values = self.load()
+            self.misses += 1
+        else:
+            self.hits += 1
+        return values.get(name, default_value)
+
+    def load(self) -> dict:
+        """
+        Load every active setting
+
+        :return: dictionary with the settings values
+        """
+        with self._lock:
+            values = dict(Setting.objects_enabled.values_list('name',
+                                                              'value'))
+            self._values = values
+            self._expiration = (time.monotonic() + self.ttl
+                                if self.ttl
+                                else None)
+        return values
+
+    def invalidate(self) -> None:
+        """
+        Discard the cached settings
+
+        :return: None
+        """
+        # Wait for any running load to discard its values too
+        with self._lock:
+            self._values = None
+            self.invalidations += 1
+
+    def get_statistics(self) -> dict:
+        """
+        Return the cache statistics
+
+        :return: dictionary with the statistics counters
+        """
+        lookups = self.hits + self.misses
+        return {'loaded': self._values is not None,
+                'items': len(self._values) if self._values else 0,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0,
+                'invalidations': self.invalidations}
+
+
+settings_cache = SettingsCache(
+    ttl=getattr(settings, 'SETTINGS_CACHE_TTL', 0))
@@ -0,0 +1,98 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import threading
+import time
+
+from django.conf import settings
+
+
+class TokensCache(object):
+    """
+    Process-local cache for the authentication tokens
+
+    Every valid token is kept in memory with its user and host until it's
+    invalidated by the Token, User and Host signals or until the `ttl`
+    seconds are elapsed (0 to disable the cache).
+    """
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._tokens = {}
+        # Statistics counters
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: str):
+        """
+        Get a token from the cache
+
+        :param key: token key
+        :return: Token object or None if not cached or expired
+        """
+        if not self.ttl:
+            return None
+        token, expiration = self._tokens.get(key, (None, None))
+        if token is None or time.monotonic() > expiration:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return token
+
+    def set(self, key: str, token) -> None:
+        """
+        Save a token in the cache
+
+        :param key: token key
+        :param token: Token object with its user and host
+        :return: None
+        """
+        if self.ttl:
+            with self._lock:
+                self._tokens[key] = (token, time.monotonic() + self.ttl)
+
+    def invalidate(self) -> None:
+        """
+        Discard every cached token
+
+        :return: None
+        """
+        with self._lock:
+            self._tokens = {}
+            self.invalidations += 1
+
+    def get_statistics(self) -> dict:
+        """
+        Return the cache statistics
+
+        :return: dictionary with the statistics counters
+        """
+        lookups = self.hits + self.misses
+        return {'items': len(self._tokens),
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0,
+                'invalidations': self.invalidations}
+
+
+tokens_cache = TokensCache(
+    ttl=getattr(settings, 'API_TOKENS_CACHE_TTL', 0))
@@ -0,0 +1,37 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import typing
+
+from django.utils import timezone
+
+from remotes.models import Command
+
+
+def update_commands_modified(commands: typing.Iterable) -> int:
+    """
+    Update the modification time of the commands, invalidating their
+    serialized data in the commands cache
+
+    :param commands: Command IDs or a queryset with the Command IDs
+    :return: number of Command rows updated
+    """
+    return Command.objects.filter(pk__in=commands).update(
+        modified=timezone.now())
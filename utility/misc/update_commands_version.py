@@ -0,0 +1,40 @@
+##
+#     Project: Django Remotes
+# Description: A Django application to execute remote commands
+#      Author: Fabio Castelli (Muflone) <muflone@muflone.com>
+#   Copyright: 2021-2022 Fabio Castelli
+#     License: GPL-3+
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+##
+
+import typing
+
+from django.db.models import F
+
+from remotes.models import HostCommandsVersion
+
+
+def update_commands_version(hosts: typing.Iterable) -> int:
+    """
+    Increase the commands version of the hosts, invalidating the ETag of
+    their commands list
+
+    The hosts without a commands version never received an ETag, their
+    version is created by the next commands list.
+
+    :param hosts: Host IDs or a queryset with the Host IDs
+    :return: number of HostCommandsVersion rows updated
+    """
+    return HostCommandsVersion.objects.filter(host__in=hosts).update(
+        version=F('version') + 1)